@@ -0,0 +1,241 @@
+from typing import Union
+
+import json
+import time
+import queue
+import argparse
+import threading
+
+from api.__scraper__ import MediumScraper
+from parser.utils import Logger
+from parser.state import UrlSet
+from errors.exceptions import InvalidConfigurations
+
+__all__ = ['BatchRunner', 'main']
+
+export_names = ['metadata_json', 'metadata_csv', 'data_json', 'data_csv']
+
+
+class BatchRunner:
+
+    def __init__(self, jobs_filename: str, status_filename: str = None, workers: int = 2, os_type: str = 'linux',
+                 browser: str = 'chrome', cfg_filename: str = None, **kwargs):
+
+        """
+        Parameters
+        ----------
+        jobs_filename: str
+            *.jsonl, one job spec per line, ex:
+                {"job_id": "ai", "topics": ["artificial-intelligence"], "scroll_step": 100, "target_count": 500,
+                 "time_limit": 300, "scrape_content": true, "exports": ["metadata_json", "data_json"],
+                 "output_dir": "out/ai"}
+
+        status_filename: str
+            *.jsonl, one status line is appended per finished job, default: {jobs_filename}.status.jsonl
+
+        workers: int
+            number of concurrent scrapers, each keeps its browser across jobs
+
+        kwargs:
+            shared MediumScraper settings, overridden by the "kwargs" of a job spec
+        """
+
+        self.jobs_filename = jobs_filename
+        self.status_filename = status_filename or jobs_filename + '.status.jsonl'
+
+        self.workers = workers
+
+        self.os_type = os_type
+        self.browser = browser
+        self.cfg_filename = cfg_filename
+
+        self.kwargs = kwargs
+
+        # urls scraped by any job of the batch
+        self.url_cache = UrlSet()
+
+        self.jobs = queue.Queue()
+        self.status_lock = threading.Lock()
+
+    def read_jobs(self):
+
+        jobs = []
+
+        with open(self.jobs_filename, 'r', encoding='utf-8') as buffer:
+
+            for i, line in enumerate(buffer):
+
+                if not line.strip():
+
+                    continue
+
+                job = json.loads(line)
+
+                job.setdefault('job_id', job.get('request_id', f'job-{i + 1}'))
+
+                jobs.append(job)
+
+        return jobs
+
+    def write_status(self, status: dict):
+
+        with self.status_lock:
+
+            with open(self.status_filename, 'a', encoding='utf-8') as buffer_writer:
+
+                buffer_writer.write(json.dumps(status) + '\n')
+
+    def new_scraper(self, index=0):
+
+        scraper = MediumScraper(os_type=self.os_type, browser=self.browser, cfg_filename=self.cfg_filename,
+                                **self.kwargs)
+
+        scraper.url_cache = self.url_cache
+
+        # a browser profile can not be shared by running browsers, see kwargs: profile_dir
+        scraper.profile_name = f'worker-{index}'
+
+        return scraper
+
+    @staticmethod
+    def configure(scraper: MediumScraper, job: dict, kwargs: dict):
+
+        if not job.get('topics'):
+
+            raise InvalidConfigurations('job spec without topics')
+
+        exports = job.get('exports', export_names)
+
+        unknown = [name for name in exports if name not in export_names]
+
+        if len(unknown) > 0:
+
+            raise InvalidConfigurations('unknown exports: ' + ', '.join(unknown))
+
+        # the store, the search index, the watermark, ... of the previous job
+        scraper.reset()
+
+        scraper.topics = job['topics']
+        scraper.scroll_step = job.get('scroll_step')
+        scraper.target_count = job.get('target_count')
+        scraper.time_limit = job.get('time_limit')
+
+        scraper.kwargs = dict(kwargs, **job.get('kwargs', dict()))
+        scraper.kwargs['output_dir'] = job.get('output_dir', job['job_id'])
+
+        scraper.metadata = dict()
+        scraper.posts_content = dict()
+        scraper.skipped_urls = 0
+        scraper.failed_urls = []
+
+        return {'export_' + name: name in exports for name in export_names}
+
+    def run_job(self, scraper: MediumScraper, job: dict):
+
+        status = {'job_id': job['job_id'], 'status': 'done', 'error': None}
+
+        start_time = time.time()
+
+        try:
+
+            exports = BatchRunner.configure(scraper, job, self.kwargs)
+
+            # init_model(...) and run(...) log the errors which stop them, and return False
+            ok = scraper.init_model(set_quit=False) and \
+                scraper.run(scrape_content=job.get('scrape_content', False), export_overwrite=True, set_quit=False,
+                            incremental=job.get('incremental', False), **exports)
+
+            status['posts'] = scraper.get_posts_count()
+            status['content'] = scraper.get_content_count()
+            status['skipped_urls'] = scraper.skipped_urls
+            status['output_dir'] = scraper.kwargs['output_dir']
+
+            if not ok:
+
+                error = scraper.last_error
+
+                status.update(status='failed', error=f'{type(error).__name__}: {error}')
+
+        except InvalidConfigurations as error:
+
+            status.update(status='skipped', error=str(error))
+
+        except Exception as error:
+
+            status.update(status='failed', error=f'{type(error).__name__}: {error}')
+
+        status['elapsed'] = round(time.time() - start_time, 3)
+
+        self.write_status(status)
+
+        Logger.info(f'job : {status["job_id"]}, {status["status"]}')
+
+        return status
+
+    def worker(self, index=0):
+
+        scraper = self.new_scraper(index)
+
+        try:
+
+            while True:
+
+                try:
+
+                    job = self.jobs.get_nowait()
+
+                except queue.Empty:
+
+                    break
+
+                self.run_job(scraper, job)
+
+                self.jobs.task_done()
+
+        finally:
+
+            scraper.quit()
+
+    def run(self):
+
+        jobs = self.read_jobs()
+
+        Logger.info(f'No. of jobs : {len(jobs)}, workers : {self.workers}')
+        Logger.set_line(length=50)
+
+        for job in jobs:
+
+            self.jobs.put(job)
+
+        threads = [threading.Thread(target=self.worker, args=(i,), name=f'batch-worker-{i}', daemon=True)
+                   for i in range(min(self.workers, len(jobs)))]
+
+        for thread in threads:
+
+            thread.start()
+
+        for thread in threads:
+
+            thread.join()
+
+
+def main(args: Union[list, None] = None):
+
+    arg_parser = argparse.ArgumentParser(prog='python -m api.batch',
+                                         description='run the scraping jobs of a jsonl file, as one batch')
+
+    arg_parser.add_argument('jobs_filename', help='*.jsonl, one job spec per line')
+    arg_parser.add_argument('--status', dest='status_filename', default=None,
+                            help='*.jsonl, per-job status lines, default: {jobs_filename}.status.jsonl')
+    arg_parser.add_argument('--workers', type=int, default=2, help='number of concurrent browsers')
+    arg_parser.add_argument('--os-type', default='linux', choices=MediumScraper.os_types)
+    arg_parser.add_argument('--browser', default='chrome', choices=MediumScraper.browsers)
+    arg_parser.add_argument('--cfg', dest='cfg_filename', default=None, help='*.json, scraping settings')
+
+    options = arg_parser.parse_args(args)
+
+    runner = BatchRunner(jobs_filename=options.jobs_filename, status_filename=options.status_filename,
+                         workers=options.workers, os_type=options.os_type, browser=options.browser,
+                         cfg_filename=options.cfg_filename)
+
+    runner.run()
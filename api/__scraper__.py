@@ -1,20 +1,67 @@
 from typing import Union, List
 
+import os
+import time
+from itertools import chain, islice
+
+import pandas as pd
+
 from selenium import webdriver
 from selenium.webdriver.remote.webelement import WebElement
 
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 
-from parser.utils import Logger, OS, Reader, Writer, Requests
+from parser.utils import Logger, OS, Files, Reader, Writer, Requests, Urls
+from parser.state import Watermark, UrlSet, merge_columns
+from parser.cache import TopicsCache
+from parser.budget import TopicsBudget, Allotment
+from parser.spill import SpillStore
+from parser.lifecycle import DriverLifecycle
+from parser.latency import LatencyTracker
+from parser.network import FeedCapture
+from parser.profile import BrowserProfile
+from parser.store import PostsStore
+from parser.metadata import MetadataReader
+from parser.enrich import enrich_metadata
+from parser.crawl import CrawlFrontier, parse_date
+from parser.search import SearchIndex
+from parser.recording import Recorder, Recording
+from parser.writer import BackgroundWriter, snapshot_columns
+from api.__tabs__ import TabPool
+from parser.xpaths import topic_xpath, article_xpath, subtitle_xpath, pub_xpath, datetime_xpath, \
+    text_xpath, figure_xpath
 from errors.exceptions import WebDriverException, ScraperException, TimeoutException
 
 __all__ = ['MediumScraper']
 
 initialization_error_msg = 'Initialization Failed::'
+# messages of a crashed renderer, or of a lost browser session
+crash_indicators = ['tab crashed', 'session deleted', 'invalid session id', 'no such session', 'chrome not reachable',
+                    'disconnected', 'browser has closed', 'target window already closed', 'failed to decode response']
+
 limited_access_indicator = ['You\'ve read all of your free stories this month.', 'To keep reading this story']
+# the indicator of a paywalled post, the other one is about the monthly quota of the account, not about the post
+paywall_indicator = 'To keep reading this story'
+
+# one in-page pass over the document text, instead of a full-document XPath scan per indicator,
+# returns the indicators which are found
+limited_access_script = 'var text = document.body ? document.body.textContent : "";' \
+                        'return arguments[0].filter(function (indicator) { return text.indexOf(indicator) >= 0; });'
 post_image_indicator = 'Image for post'
 
+# [href, text, date] of each link, the date of its card - a <time>, or a 'Sep 14, 2020' text, if any
+links_script = 'var pattern = /(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \\d{1,2}(, \\d{4})?/;' \
+               'return Array.from(document.querySelectorAll("a[href]")).map(function (a) {' \
+               'var card = a.closest("article") || (a.parentElement && a.parentElement.parentElement);' \
+               'var time = card ? card.querySelector("time") : null;' \
+               'var match = !time && card ? (card.textContent || "").slice(0, 1000).match(pattern) : null;' \
+               'return [a.href, (a.textContent || "").slice(0, 200),' \
+               'time ? (time.getAttribute("datetime") || time.textContent) : (match ? match[0] : null)]; });'
+
+# posts of the first feed page are rendered server side, into the apollo state, not fetched as json
+apollo_state_script = 'return window.__APOLLO_STATE__ || null;'
+
 
 class MediumScraper:
 
@@ -24,11 +71,13 @@ class MediumScraper:
     browsers = ['chrome', 'firefox']
 
     main_urls = {'root': {'class': None, 'url': 'https://medium.com./'},
-                 'topics': {'class': None, 'url': 'https://medium.com./topics'}}
+                 'topics': {'class': None, 'url': 'https://medium.com./topics'},
+                 'topic': {'class': None, 'url': 'https://medium.com./topic/'}}
 
     def __init__(self, os_type: str, updatedb: bool = False, browser: str = 'chrome', topics: Union[str, list] = None,
-                 scroll_step: Union[int, list] = 1, time_to_wait: float = 30.0,
-                 reload_page_count: int = 1, ignore_limited_access=True, cfg_filename: str = None, **kwargs):
+                 scroll_step: Union[int, list, dict] = None, time_to_wait: float = 30.0,
+                 reload_page_count: int = 1, ignore_limited_access=True, cfg_filename: str = None,
+                 target_count: Union[int, list, dict] = None, time_limit: Union[float, list, dict] = None, **kwargs):
         """
         Parameters
         ----------
@@ -48,6 +97,8 @@ class MediumScraper:
         scroll_step: Union[int, list]
               int: scroll to - scrollHeight * scroll_step
               list: for each topic (i), scroll to - scrollHeight * scroll_step[i]
+              dict: for each topic name
+              default: 1, or unbounded for the topics with a target_count or a time_limit
 
         time_to_wait: float
             driver.get(url=...), timeout
@@ -59,8 +110,87 @@ class MediumScraper:
         cfg_filename: str
             *.json,  path, which could used to specify scraping settings, ex: to_path/config.json
 
+        target_count: Union[int, list, dict]
+            stop scrolling a topic, once it has (target_count) posts,
+            list: for each topic (i), dict: for each topic name
+
+        time_limit: Union[float, list, dict]
+            wall-clock limit of scrolling a topic in seconds, list: for each topic (i), dict: for each topic name,
+            unused steps and time of topics that stopped early, are spent by the next topics, while still producing
+
         kwargs:
             extra parameters,  settings or the key of *.json file, {cfg_filename}
+
+                topics_cache: str, *.json path of the cached topics urls, default: 'topics_cache.json',
+                    None, disable caching
+                topics_cache_ttl: float, cache time to live in seconds, default: 7 days
+                paywalled_urls: str, *.json path of the known limited access posts urls,
+                    default: 'paywalled_urls.json', None, disable persisting
+                paywall_policy: str, 'skip' known limited access posts, or 'defer' them after all other posts,
+                    default: 'skip'
+                memory_limit: int, approximate size in bytes of the in-memory metadata and posts content,
+                    above which they are spilled to disk segments, default: None, no limit
+                spill_dir: str, directory of the spilled segments, each scraper writes to a subdirectory of its own,
+                    default: 'spill'
+                recycle_pages: int, restart the browser after (recycle_pages) page loads, default: None
+                recycle_rss: float, restart the browser once its resident memory exceeds (recycle_rss) MB,
+                    default: None
+                recycle_failures: int, restart the browser after (recycle_failures) consecutive failed page loads,
+                    default: 3
+                search_index: str, sqlite path of a full-text index, updated by url with each scraped post,
+                    default: None, no index
+                near_duplicates: str, 'flag' near-duplicate posts in posts_content['duplicate_of'],
+                    or 'skip' them, default: None, no detection
+                near_duplicates_threshold: float, estimated jaccard similarity of near-duplicates, default: 0.8
+                near_duplicates_index: str, *.npz path, where the minhash signatures are kept across runs,
+                    default: None
+                output_dir: str, directory of the exported files, default: None, the working directory
+                background_export: bool, write the exports on a background thread, from snapshots of the scraped data,
+                    see self.flush(), default: False
+                export_queue: int, maximum number of pending background exports, default: 4
+                snapshot_interval: float, with background_export, write posts_content to snapshot_content.json
+                    every (snapshot_interval) seconds while scraping, default: None
+                record: str, path prefix of a recording of the loaded pages - {record}.rec.gz, {record}.idx.jsonl,
+                    which could be re-extracted without a browser, see self.replay(...), default: None
+                parse_workers: int, if set, the browser only fetches pages, and a pool of (parse_workers) processes
+                    parses their snapshots with compiled xpaths, default: None, extract through the web driver
+                snapshots_dir: str, where the pages snapshots are saved for the parsing processes,
+                    default: None, send the page source directly
+                adaptive_timeout: bool, set the page load timeout of each host from its observed latency,
+                    and skip the pages of hosts which are down, default: False
+                timeout_percentile: float, latency percentile of a host, its timeout = 1.5 * percentile + margin,
+                    default: 0.95
+                timeout_margin: float, seconds, default: 2.0
+                timeout_min: float, seconds, default: 5.0
+                timeout_max: float, seconds, default: time_to_wait
+                host_down_failures: int, a host is down after (host_down_failures) consecutive timeouts, default: 3
+                host_down_cooldown: float, seconds, before a page of a down host is loaded again, default: 300
+                tabs: int, load posts in (tabs) tabs of the same browser, and extract from whichever finishes first,
+                    the browser is not recycled while the tabs are open, and runs with pageLoadStrategy 'eager',
+                    default: None, a single tab
+                network_capture: bool, chrome only, read the topics feeds metadata from their json/graphql responses
+                    in the performance log, instead of scraping the rendered cards, default: False
+                profile_dir: str, keep a reusable browser profile (disk cache, cookies) in {profile_dir}/{browser}/,
+                    default: None, a temporary profile per browser
+                profile_name: str, default: 'default'
+                profile_max_size: float, MB, above it, the profile caches are removed on start, default: 1024
+                profile_template: str, a pre-warmed profile, cloned into missing profiles,
+                    see self.save_profile_template()
+                store: str, sqlite path, where topics, cards and posts are upserted by canonical url while scraping,
+                    across runs, see self.export_store(...), default: None
+                store_batch_size: int, number of upserted rows per transaction, default: 500
+                crawl_max_depth: int, links depth followed by self.crawl(...), default: 3
+                crawl_max_frontier: int, number of queued urls, default: 100000
+                crawl_capacity: int, number of seen urls, at (crawl_error_rate) false positives, default: 1000000
+                crawl_error_rate: float, default: 0.01
+                crawl_scroll_step: int, scroll steps of author and publication pages, default: 3
+                crawl_domains: list, publications domains to follow, in addition to medium.com,
+                    and parser.crawl.publication_domains, default: None
+                export_compression: str, 'gzip', 'xz' or 'zstd' (requires zstandard), compress the json, csv exports,
+                    which are then streamed compactly, default: None
+                enrich_metadata: bool, the csv, parquet metadata exports have typed columns - date (inferred year),
+                    read_time (minutes), publication (without 'in '), canonical url, see parser.enrich,
+                    default: True
         """
 
         self.os_type = os_type
@@ -73,6 +203,9 @@ class MediumScraper:
 
         self.scroll_step = scroll_step
 
+        self.target_count = target_count
+        self.time_limit = time_limit
+
         self.time_to_wait = time_to_wait
         self.reload_page_count = reload_page_count
 
@@ -83,7 +216,7 @@ class MediumScraper:
         self.kwargs = kwargs
 
         self.driver_path: str
-        self.driver: webdriver.Remote
+        self.driver: Union[webdriver.Remote, None] = None
 
         self.topics_urls: list
         self.metadata: dict
@@ -94,8 +227,50 @@ class MediumScraper:
 
         self.scroll_height = None
 
+        self.watermark: Union[Watermark, None] = None
+
+        self.paywalled: Union[UrlSet, None] = None
+
+        self.spill: Union[SpillStore, None] = None
+
+        self.lifecycle: Union[DriverLifecycle, None] = None
+
+        self.latency: Union[LatencyTracker, None] = None
+
+        self.capture: Union[FeedCapture, None] = None
+
+        # set per worker, when several scrapers share a profiles directory, see api.batch
+        self.profile_name = None
+
+        self.search_index: Union[SearchIndex, None] = None
+
+        self.store: Union[PostsStore, None] = None
+
+        self.frontier: Union[CrawlFrontier, None] = None
+        self.crawling = False
+
+        self.near_duplicates = None
+
+        self.recorder = None
+
+        # shared between scrapers of a batch, see api.batch
+        self.url_cache: Union[UrlSet, None] = None
+        self.skipped_urls = 0
+        self.failed_urls = []
+
+        self.writer: Union[BackgroundWriter, None] = None
+
+        # the error, which has stopped the last init_model(...) or run(...)
+        self.last_error: Union[Exception, None] = None
+
     def init_model(self, set_quit=True):
 
+        """
+        returns False, if an error has stopped it, see self.last_error
+        """
+
+        self.last_error = None
+
         try:
 
             self.__init__model__()
@@ -108,6 +283,8 @@ class MediumScraper:
             # Log error
             Logger.error(error)
 
+            self.last_error = error
+
             if set_quit:
 
                 self.quit()
@@ -118,43 +295,95 @@ class MediumScraper:
 
                 self.quit()
 
+        return self.last_error is None
+
     def run(self, scrape_content=False, export_metadata_json=True, export_metadata_csv=True,
-            export_data_json=True, export_data_csv=True, export_overwrite=True, set_quit=True):
+            export_data_json=True, export_data_csv=True, export_overwrite=True, set_quit=True, incremental=False,
+            download_images=False):
+
+        """
+        incremental: bool
+            if True, continue from the previous posts_metadata.json, posts_content.json,
+            each topic feed is scrolled only until it reaches previously seen posts,
+            and only the new posts are scraped, then merged with the previous ones before exporting
+
+        download_images: bool
+            if True, download the posts figures into a local store, see self.download_images(...)
+
+        returns False, if an error has stopped it, see self.last_error
+        """
+
+        self.last_error = None
 
         try:
 
+            self.__clear_spilled__()
+
+            previous_metadata, rows, counts = None, None, None
+
+            # the watermark of a previous incremental run doesn't apply to this one
+            self.watermark = None
+
+            if incremental:
+
+                previous_metadata = Reader.json_to_dict(self.output_path('posts_metadata.json'))
+
+                self.watermark = Watermark(previous_metadata)
+
             self.__get_posts_metadata__()
 
             Logger.info('No. of posts :', str(self.get_posts_count()))
 
+            if incremental:
+
+                # the new posts only, including the spilled ones, are scraped
+                rows, counts = self.iter_metadata_rows(), self.__metadata_counts__()
+
+                self.metadata = self.watermark.merge(self.metadata, self.__drop_spilled__(previous_metadata))
+
             if export_metadata_json:
 
-                self.export_metadata_json(filename='posts_metadata.json', overwrite=export_overwrite, indent_level=3,
-                                          sort_keys=False)
+                self.__export__(self.export_metadata_json, filename=self.output_path('posts_metadata.json'),
+                                overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
             if export_metadata_csv:
 
-                self.export_metadata_csv(filename='posts_metadata.csv',
-                                         overwrite=export_overwrite)
+                self.__export__(self.export_metadata_csv, filename=self.output_path('posts_metadata.csv'),
+                                overwrite=export_overwrite)
 
             if scrape_content:
 
-                self.__get_data__()
+                self.__get_data__(rows=rows, counts=counts)
+
+            if download_images and scrape_content:
+
+                self.download_images()
+
+            if incremental and scrape_content:
+
+                previous_content = Reader.json_to_dict(self.output_path('posts_content.json'))
+
+                spilled = self.spill.iter_column('content', 'url') if self.__has_spilled__('content') else ()
+
+                self.posts_content = merge_columns(self.posts_content, previous_content, seen=spilled)
 
             if export_data_json:
 
-                self.export_data_json(filename='posts_content.json', overwrite=export_overwrite, indent_level=3,
-                                      sort_keys=False)
+                self.__export__(self.export_data_json, filename=self.output_path('posts_content.json'),
+                                overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
             if export_data_csv:
 
-                self.export_data_csv(filename='posts_content.csv', overwrite=export_overwrite)
+                self.__export__(self.export_data_csv, filename=self.output_path('posts_content.csv'),
+                                overwrite=export_overwrite)
 
         except (WebDriverException, ScraperException) as error:
 
             # Log error
             Logger.error(error)
 
+            self.last_error = error
+
             if set_quit:
 
                 self.quit()
@@ -165,41 +394,64 @@ class MediumScraper:
 
                 self.quit()
 
+        return self.last_error is None
+
     def scrape_content_from_file(self, metadata_filename='posts_metadata.json',
                                  export_json=True, export_csv=True,
-                                 export_overwrite=True, timeout_export=False, set_quit=True):
+                                 export_overwrite=True, timeout_export=False, set_quit=True, use_mmap=False):
+
+        """
+        metadata_filename: str
+            *.json - {topic: {column: [...]}}, *.jsonl or *.csv - a post per row, with a topic column,
+            read lazily, so scraping starts without loading the file
+
+        use_mmap: bool
+            read (metadata_filename) through a memory map
+        """
 
         try:
 
-            _metadata = Reader.json_to_dict(metadata_filename)
+            if not OS.file_exists(metadata_filename):
+
+                Logger.warning(f'File: {metadata_filename} Doesn\'t Exist')
+
+                return None
+
+            reader = MetadataReader(metadata_filename, use_mmap=use_mmap)
 
-            setattr(self, 'metadata', _metadata)
+            self.__clear_spilled__()
+
+            setattr(self, 'metadata', dict())
 
             if not hasattr(self, 'posts_content'):
 
                 setattr(self, 'posts_content', dict())
 
-            n_post = self.get_posts_count()
+            # known from the index of a previous read, otherwise it is written by this one
+            counts = reader.topics_counts(build=False)
+
+            n_post = sum(counts.values()) if counts is not None else None
 
-            Logger.info('No. of posts :', str(n_post))
+            Logger.info('No. of posts :', str(n_post) if n_post is not None else 'not indexed yet')
 
-            if n_post > 0:
+            if n_post is None or n_post > 0:
 
                 setattr(self, 'timeout_export', timeout_export)
 
                 setattr(self, 'export_json', export_json)
                 setattr(self, 'export_csv', export_csv)
 
-                self.__get_data__()
+                self.__get_data__(rows=reader.iter_rows(), counts=counts)
 
             if export_json:
 
-                self.export_data_json(filename='posts_content.json', overwrite=export_overwrite, indent_level=3,
-                                      sort_keys=False)
+                self.__export__(self.export_data_json, filename=self.output_path('posts_content.json'),
+                                overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
             if export_csv:
 
-                self.export_data_csv(filename='posts_content.csv', overwrite=export_overwrite)
+                self.__export__(self.export_data_csv, filename=self.output_path('posts_content.csv'),
+                                overwrite=export_overwrite)
 
         except (WebDriverException, ScraperException) as error:
 
@@ -216,360 +468,1488 @@ class MediumScraper:
 
                 self.quit()
 
-    def export_metadata_json(self, filename='posts_urls.json', overwrite=False, indent_level=3, sort_keys=False):
+    def crawl(self, max_pages: int = 1000, seeds: list = None, export_data_json=True, export_data_csv=True,
+              export_overwrite=True, set_quit=True):
 
-        if self.metadata is not None:
+        """
+        follow author pages, publication pages and in-article medium links, starting from (seeds),
+        or from the root page links, see self.init_model() without topics,
+        the posts are scraped by priority - topics relevance, recency and depth, see parser.crawl.CrawlFrontier
 
-            Writer.dict_to_json(json_filename=filename, content=self.metadata,
-                                overwrite=overwrite,  indent_level=indent_level, sort_keys=sort_keys)
+        max_pages: int
+            number of loaded pages, posts and listing pages
+        """
 
-        else:
+        frontier = self.__crawl_frontier__()
 
-            error_log = {'error_type': 'ValueError', 'message': 'No urls to export'}
+        for seed in seeds or []:
 
-            Logger.write_messages_json(error_log)
+            frontier.push(seed, depth=0)
 
-            # Log Error
-            Logger.error('Export failed, Check log file')
+        if not hasattr(self, 'posts_content'):
 
-    def export_metadata_csv(self, filename='posts_urls.csv', overwrite=False):
+            setattr(self, 'posts_content', dict())
 
-        if self.metadata is not None:
+        self.paywalled = UrlSet(filename=self.kwargs.get('paywalled_urls', 'paywalled_urls.json'))
 
-            keys = list(self.metadata.keys())
+        # the links of scraped posts are followed in crawl mode only
+        self.crawling = True
 
-            metadata = {key: [] for key in self.metadata[keys[0]].keys()}
-            metadata.setdefault('topic', [])
+        try:
 
-            for topic in self.metadata.keys():
+            if len(frontier) == 0:
 
-                topic_name = [topic] * len(self.metadata[topic]['url'])
+                self.get(MediumScraper.main_urls['root']['url'])
 
-                metadata['topic'] += topic_name
+                self.__get_taps_urls__()
 
-                for key in self.metadata[topic].keys():
+            pages = 0
 
-                    values = self.metadata[topic][key]
-                    metadata[key] += values
+            while pages < max_pages and len(frontier) > 0:
 
-            Writer.dict_to_csv(csv_filename=filename, content=metadata, overwrite=overwrite, use_pandas=True)
+                url, kind, depth, topic = frontier.pop()
 
-        else:
+                pages += 1
 
-            error_log = {'error_type': 'ValueError', 'message': 'No urls to export'}
+                Logger.info_r(f'crawled pages : {pages}/{max_pages}, frontier : {len(frontier)}')
 
-            Logger.write_messages_json(error_log)
+                if kind != 'post':
 
-            # Log Error
-            Logger.error('Export failed, Check log file')
+                    if self.get(url) is not False:
 
-    def export_data_json(self, filename='posts_content.json', overwrite=False, indent_level=3, sort_keys=False):
+                        self.scroll_down(callback=lambda: None, delay=0.5,
+                                         limit=self.kwargs.get('crawl_scroll_step', 3))
 
-        if self.posts_content is not None:
+                        self.__follow_links__(depth=depth + 1, topic=topic)
 
-            Writer.dict_to_json(json_filename=filename, content=self.posts_content,
-                                overwrite=overwrite,  indent_level=indent_level, sort_keys=sort_keys)
+                    continue
 
-        else:
+                if url in self.paywalled:
 
-            error_log = {'error_type': 'ValueError', 'message': 'No data to export'}
+                    continue
 
-            Logger.write_messages_json(error_log)
+                if self.url_cache is not None and not self.url_cache.claim(url):
 
-            # Log Error
-            Logger.error('Export failed, Check log file')
+                    self.skipped_urls += 1
 
-    def export_data_csv(self, filename='posts_content.csv', overwrite=False):
+                    continue
 
-        if self.posts_content is not None:
+                self.__get_post_content__(url=url, meta={'topic': topic, 'depth': depth})
 
-            Writer.dict_to_csv(csv_filename=filename, content=self.posts_content, overwrite=overwrite, use_pandas=True)
+            Logger.info('', end='\n')
+            Logger.info(f'Crawled pages : {pages}, frontier : {len(frontier)}, seen urls : {frontier.seen.count}')
 
-        else:
+            self.paywalled.save()
 
-            error_log = {'error_type': 'ValueError', 'message': 'No data to export'}
+            if export_data_json:
 
-            Logger.write_messages_json(error_log)
+                self.__export__(self.export_data_json, filename=self.output_path('posts_content.json'),
+                                overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
-            # Log Error
-            Logger.error('Export failed, Check log file')
+            if export_data_csv:
 
-    def get(self, url):
+                self.__export__(self.export_data_csv, filename=self.output_path('posts_content.csv'),
+                                overwrite=export_overwrite)
 
-        self.driver.set_page_load_timeout(time_to_wait=self.time_to_wait)
+        except (WebDriverException, ScraperException) as error:
 
-        if 'script_timeout' in self.kwargs.keys():
+            # Log error
+            Logger.error(error)
 
-            self.driver.set_script_timeout(time_to_wait=self.kwargs['script_timeout'])
+        finally:
 
-        else:
+            self.crawling = False
 
-            self.driver.set_script_timeout(0.001)
+            if set_quit:
 
-        for i in range(self.reload_page_count):
+                self.quit()
 
-            try:
+    def discover(self, sitemaps: Union[str, list], topic='sitemap', start_date=None, end_date=None,
+                 include: list = None, exclude: list = None, limit: int = None, scrape_content=True,
+                 export_metadata_json=True, export_metadata_csv=True, export_data_json=True, export_data_csv=True,
+                 export_overwrite=True, set_quit=True):
 
-                self.driver.get(url=url)
+        """
+        collect the posts urls from sitemaps, instead of scrolling the topics feeds, see parser.sitemap.SitemapReader
 
-                break
+        sitemaps: Union[str, list]
+            urls or local paths of sitemaps or sitemap indexes, plain or gzip
 
-            except TimeoutException as error:
+        topic: str
+            the metadata key of the collected urls
 
-                if i < self.reload_page_count - 1:
+        start_date, end_date: str
+            ex: '2021-01-01', keep the urls whose <lastmod> is within [start_date, end_date]
 
-                    Logger.fail(str(i+1) + ': timeout::page has been reloaded')
-                    Logger.set_line(length=60)
+        include, exclude: list
+            regex patterns of the urls paths, ex: include=['^/@'], exclude=['^/tag/']
+        """
 
-                else:
+        from parser.sitemap import SitemapReader
 
-                    Logger.fail(str(i + 1) + ': timeout::page reload Limit has been exceed\n'
-                                             '\tdo you want to try again - [y/n]: ', end='')
-                    ok = input()
+        reader = SitemapReader(start_date=start_date, end_date=end_date, include=include, exclude=exclude)
 
-                    Logger.set_line(length=60)
+        self.__clear_spilled__()
 
-                    if ok.lower() == 'y':
+        self.metadata = {topic: reader.metadata(sitemaps, limit=limit)}
 
-                        self.time_to_wait = float(input('time to wait :'))
-                        self.reload_page_count = int(input('reload count :'))
+        self.__store_cards__(topic, self.metadata[topic])
 
-                        self.get(url)
+        Logger.info('No. of posts :', str(self.get_posts_count()))
 
-                    elif ok.lower() == 'n':
+        if export_metadata_json:
 
-                        self.___timeout_export__()
-                        Logger.error(error)
+            self.__export__(self.export_metadata_json, filename=self.output_path('posts_metadata.json'),
+                            overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
-                    else:
+        if export_metadata_csv:
 
-                        self.___timeout_export__()
+            self.__export__(self.export_metadata_csv, filename=self.output_path('posts_metadata.csv'),
+                            overwrite=export_overwrite)
 
-                        Logger.fail('Abort')
-                        Logger.error(error)
+        if not scrape_content:
 
-        self.scroll_height = self.driver.execute_script("return document.body.scrollHeight")
+            return None
 
-    def scroll_down(self, callback, delay=0.5, limit: int = -1, **meta):
+        try:
 
-        for i in range(limit):
+            self.__get_data__()
 
-            # scroll to - document.body.scrollHeight
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            if export_data_json:
 
-            Logger.info_r(f'steps : {i+1}/{limit}')
+                self.__export__(self.export_data_json, filename=self.output_path('posts_content.json'),
+                                overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
-            Requests.sleep(delay)
+            if export_data_csv:
 
-        Logger.info('', end='\n')
-        Logger.set_line(length=50)
+                self.__export__(self.export_data_csv, filename=self.output_path('posts_content.csv'),
+                                overwrite=export_overwrite)
 
-        outputs = callback(**meta)
+        except (WebDriverException, ScraperException) as error:
 
-        return outputs
+            # Log error
+            Logger.error(error)
 
-    def find_elements_by_xpath(self, xpath, raise_error=True):
+        finally:
 
-        try:
+            if set_quit:
 
-            return self.driver.find_elements_by_xpath(xpath)
+                self.quit()
 
-        except WebDriverException as error:
+    def replay(self, recording='crawl', scrape_content=True, export_metadata_json=True, export_metadata_csv=True,
+               export_data_json=True, export_data_csv=True, export_overwrite=True, parse_workers: int = None):
 
-            if raise_error:
+        """
+        re-extract metadata and posts content from a recording, see kwargs: record, without a browser or network
 
-                raise error
+        recording: str
+            path prefix of the recording
 
-            else:
-                return []
+        parse_workers: int
+            number of parsing processes, default: os.cpu_count()
+        """
 
-    def find_element_by_xpath(self, xpath, raise_error=True):
+        from concurrent.futures import ProcessPoolExecutor, as_completed
 
-        try:
+        from parser.html import MetadataParser, ParsePool, parse_recorded_post
 
-            return self.driver.find_element_by_xpath(xpath)
+        recording = Recording(recording)
 
-        except WebDriverException as error:
+        self.__init_topics__()
 
-            if raise_error:
+        self.__clear_spilled__()
 
-                raise error
+        self.metadata = dict()
 
-            else:
+        metadata_parser = MetadataParser()
 
-                return None
+        for entry in recording.entries(kind='topic'):
 
-    @staticmethod
-    def node_find_element_by_xpath(node, xpath, raise_error=True):
+            topic = entry['topic']
 
-        if node is None:
+            if isinstance(self.topics, list) and topic not in self.topics:
 
-            return None
+                continue
 
-        try:
+            page_source = Recording.read_entry(recording.data_filename, entry['offset'], entry['length'])
 
-            return node.find_element_by_xpath(xpath)
+            self.metadata[topic] = metadata_parser.parse(entry['url'], page_source)
 
-        except WebDriverException as error:
+            self.__store_cards__(topic, self.metadata[topic], entry['url'])
 
-            if raise_error:
+        Logger.info('No. of posts :', str(self.get_posts_count()))
 
-                raise error
+        if export_metadata_json:
 
-            else:
+            self.__export__(self.export_metadata_json, filename=self.output_path('posts_metadata.json'),
+                            overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
-                return None
+        if export_metadata_csv:
 
-    @staticmethod
-    def node_find_elements_by_xpath(node, xpath, raise_error=True):
+            self.__export__(self.export_metadata_csv, filename=self.output_path('posts_metadata.csv'),
+                            overwrite=export_overwrite)
 
-        if node is None:
+        if not scrape_content:
 
-            return []
+            return None
 
-        try:
+        self.posts_content = dict()
 
-            return node.find_elements_by_xpath(xpath)
+        posts, missing = [], 0
 
-        except WebDriverException as error:
+        for topic, url, fields in self.iter_metadata_rows():
 
-            if raise_error:
+            entry = recording.entry(url)
 
-                raise error
+            if entry is None:
 
-            else:
+                missing += 1
 
-                return None
+                continue
 
-    @staticmethod
-    def safe_get_attribute(element, attr_name, default):
+            meta = {'topic': topic, 'title': fields.get('title'), 'author': fields.get('author')}
 
-        return getattr(element, attr_name, default)
+            posts.append((url, entry, meta))
 
-    def quit(self):
+        Logger.info(f'Recorded posts : {len(posts)}, missing : {missing}')
 
-        self.driver.quit()
+        with ProcessPoolExecutor(max_workers=parse_workers) as executor:
 
-    def close(self):
+            futures = {executor.submit(parse_recorded_post, recording.data_filename, entry['offset'], entry['length'],
+                                       url, post_image_indicator, limited_access_indicator): (url, meta)
+                       for url, entry, meta in posts}
 
-        self.driver.close()
+            for i, future in enumerate(as_completed(futures)):
 
-    def get_post_content(self, url):
+                Logger.info_r(f'replayed content : {i + 1}/{len(posts)}')
 
-        if not hasattr(self, 'posts_content'):
+                url, meta = futures.pop(future)
 
-            setattr(self, 'posts_content', dict())
+                self.__add_parsed_post__(ParsePool.result(future, url), meta)
 
-        self.__get_post_content__(url)
+        Logger.info('', end='\n')
+        Logger.set_line(length=50)
 
-    def get_posts_count(self):
+        if export_data_json:
 
-        count = 0
+            self.__export__(self.export_data_json, filename=self.output_path('posts_content.json'),
+                            overwrite=export_overwrite, indent_level=3, sort_keys=False)
 
-        for key in self.metadata.keys():
+        if export_data_csv:
 
-            count += len(self.metadata[key]['url'])
+            self.__export__(self.export_data_csv, filename=self.output_path('posts_content.csv'),
+                            overwrite=export_overwrite)
 
-        return count
+    def export_metadata_json(self, filename='posts_urls.json', overwrite=False, indent_level=3, sort_keys=False,
+                             content: dict = None):
 
-    def ___timeout_export__(self):
+        """
+        filename: str
+            *.json, or *.jsonl - a post per line, with a topic field,
+            compressed if it ends with .gz, .xz or .zst, compressed and spilled metadata are streamed compactly
+        """
 
-        if hasattr(self, 'timeout_export') and self.timeout_export:
+        metadata = self.metadata if content is None else content
 
-            if hasattr(self, 'export_json') and self.export_json:
+        spilled = content is None and self.metadata is not None and self.__has_spilled__('metadata/')
 
-                self.export_data_json(filename='timeout_export_content.json', overwrite=True,
-                                      indent_level=3,
-                                      sort_keys=False)
+        if metadata is not None and Files.is_jsonl(filename):
 
-            if hasattr(self, 'export_csv') and self.export_csv:
+            Writer.rows_to_jsonl(jsonl_filename=filename, rows=self.__metadata_rows__(content), overwrite=overwrite)
 
-                self.export_data_csv(filename='timeout_export_content.csv', overwrite=True)
+        elif metadata is not None and (spilled or Files.compression(filename) is not None):
 
-    def __init_web_driver__(self):
+            topics = self.__metadata_topics__() if content is None else list(metadata.keys())
 
-        self.__init_driver_options__()
+            content = {topic: self.__iter_columns__('metadata/' + topic if content is None else None,
+                                                    metadata.get(topic))
+                       for topic in topics}
 
-        if self.browser == 'chrome':
+            Writer.iter_to_json(json_filename=filename, content=content, overwrite=overwrite)
 
-            self.driver_path = self.__os_process__.locate_file(pattern='/chromedriver$', params='-i --regexp',
-                                                               updatedb=self.__updatedb__)[0]
+        elif metadata is not None:
 
-            if self.driver_path is None:
+            Writer.dict_to_json(json_filename=filename, content=metadata,
+                                overwrite=overwrite,  indent_level=indent_level, sort_keys=sort_keys)
 
-                Logger.error(initialization_error_msg + 'Can\'t Find Chrome Driver Executable File')
+        else:
 
-            self.driver = webdriver.Chrome(options=self.options, executable_path=self.driver_path)
+            error_log = {'error_type': 'ValueError', 'message': 'No urls to export'}
 
-        elif self.browser == 'firefox':
+            Logger.write_messages_json(error_log)
 
-            self.driver_path = self.__os_process__.locate_file(pattern='/geckodriver$', params='-i --regexp',
-                                                               updatedb=self.__updatedb__)[0]
+            # Log Error
+            Logger.error('Export failed, Check log file')
 
-            if self.driver_path is None:
+    def export_metadata_csv(self, filename='posts_urls.csv', overwrite=False, content: dict = None):
 
-                Logger.error(initialization_error_msg + 'Can\'t Find Firefox Driver Executable File')
+        """
+        filename: str
+            *.csv, compressed if it ends with .gz, .xz or .zst,
+            the columns are enriched in bulk, unless kwargs: enrich_metadata is False
+        """
 
-            self.driver = webdriver.Firefox(options=self.options, executable_path=self.driver_path)
+        _metadata = self.metadata if content is None else content
 
-        else:  # Log Error
-            pass
+        spilled = content is None and self.metadata is not None and self.__has_spilled__('metadata/')
 
-    def __init_driver_options__(self):
+        if _metadata is not None and self.kwargs.get('enrich_metadata', True):
 
-        if self.cfg_filename is not None:
+            Writer.frames_to_csv(csv_filename=filename, frames=self.__metadata_frames__(content), overwrite=overwrite)
 
-            self.__set_config__()
+        elif _metadata is not None and (spilled or Files.compression(filename) is not None):
 
-        if self.browser == 'chrome':
+            topics = self.__metadata_topics__() if content is None else list(_metadata.keys())
 
-            self.options = ChromeOptions()
+            columns = self.__columns_names__('metadata/' + topics[0] if content is None else None,
+                                             _metadata.get(topics[0])) if len(topics) > 0 else []
 
-        elif self.browser == 'firefox':
+            Writer.rows_to_csv(csv_filename=filename, columns=columns + ['topic'], rows=self.__metadata_rows__(content),
+                               overwrite=overwrite)
 
-            self.options = FirefoxOptions()
+        elif _metadata is not None:
 
-        else:  # Log Error
-            pass
+            keys = list(_metadata.keys())
 
-    def __set_config__(self):
+            metadata = {key: [] for key in _metadata[keys[0]].keys()}
+            metadata.setdefault('topic', [])
 
-        self.kwargs = Reader.json_to_dict(self.cfg_filename)
+            for topic in _metadata.keys():
 
-        # ....., parsing, set options
+                topic_name = [topic] * len(_metadata[topic]['url'])
 
-    def __init__model__(self):
+                metadata['topic'] += topic_name
+
+                for key in _metadata[topic].keys():
+
+                    values = _metadata[topic][key]
+                    metadata[key] += values
+
+            Writer.dict_to_csv(csv_filename=filename, content=metadata, overwrite=overwrite, use_pandas=True)
+
+        else:
+
+            error_log = {'error_type': 'ValueError', 'message': 'No urls to export'}
+
+            Logger.write_messages_json(error_log)
+
+            # Log Error
+            Logger.error('Export failed, Check log file')
+
+    def export_metadata_parquet(self, filename='posts_metadata.parquet', overwrite=False, content: dict = None):
+
+        """
+        requires pyarrow, the metadata of all topics, with a topic column, is written (chunk_size) rows at a time,
+        enriched unless kwargs: enrich_metadata is False
+        """
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        metadata = self.metadata if content is None else content
+
+        if metadata is None:
+
+            error_log = {'error_type': 'ValueError', 'message': 'No urls to export'}
+
+            Logger.write_messages_json(error_log)
+
+            # Log Error
+            Logger.error('Export failed, Check log file')
+
+            return None
+
+        if not Writer.confirm_write(filename, overwrite):
+
+            return None
+
+        parquet_writer = None
+
+        try:
+
+            for frame in self.__metadata_frames__(content):
+
+                # text columns of chunks without values, would be inferred as null
+                frame = frame.astype({name: 'string' for name in frame.columns if frame[name].dtype == object})
+
+                if parquet_writer is None:
+
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+                    parquet_writer = pq.ParquetWriter(filename, table.schema)
+
+                else:
+
+                    table = pa.Table.from_pandas(frame.reindex(columns=parquet_writer.schema.names),
+                                                 schema=parquet_writer.schema, preserve_index=False)
+
+                parquet_writer.write_table(table)
+
+        finally:
+
+            if parquet_writer is not None:
+
+                parquet_writer.close()
+
+    def export_data_json(self, filename='posts_content.json', overwrite=False, indent_level=3, sort_keys=False,
+                         content: dict = None):
+
+        """
+        filename: str
+            *.json, or *.jsonl - a post per line, compressed if it ends with .gz, .xz or .zst
+        """
+
+        posts_content = self.posts_content if content is None else content
+
+        partition = 'content' if content is None else None
+
+        spilled = content is None and self.posts_content is not None and self.__has_spilled__('content')
+
+        if posts_content is not None and Files.is_jsonl(filename):
+
+            Writer.rows_to_jsonl(jsonl_filename=filename, rows=self.__iter_rows__(partition, posts_content),
+                                 overwrite=overwrite)
+
+        elif posts_content is not None and (spilled or Files.compression(filename) is not None):
+
+            content = self.__iter_columns__(partition, posts_content)
+
+            Writer.iter_to_json(json_filename=filename, content=content, overwrite=overwrite)
+
+        elif posts_content is not None:
+
+            Writer.dict_to_json(json_filename=filename, content=posts_content,
+                                overwrite=overwrite,  indent_level=indent_level, sort_keys=sort_keys)
+
+        else:
+
+            error_log = {'error_type': 'ValueError', 'message': 'No data to export'}
+
+            Logger.write_messages_json(error_log)
+
+            # Log Error
+            Logger.error('Export failed, Check log file')
+
+    def export_data_csv(self, filename='posts_content.csv', overwrite=False, content: dict = None):
+
+        posts_content = self.posts_content if content is None else content
+
+        partition = 'content' if content is None else None
+
+        spilled = content is None and self.posts_content is not None and self.__has_spilled__('content')
+
+        if posts_content is not None and (spilled or Files.compression(filename) is not None):
+
+            columns = self.__columns_names__(partition, posts_content)
+
+            Writer.rows_to_csv(csv_filename=filename, columns=columns,
+                               rows=self.__iter_rows__(partition, posts_content), overwrite=overwrite)
+
+        elif posts_content is not None:
+
+            Writer.dict_to_csv(csv_filename=filename, content=posts_content, overwrite=overwrite, use_pandas=True)
+
+        else:
+
+            error_log = {'error_type': 'ValueError', 'message': 'No data to export'}
+
+            Logger.write_messages_json(error_log)
+
+            # Log Error
+            Logger.error('Export failed, Check log file')
+
+    def download_images(self, root_dir: str = None, max_workers: int = None):
+
+        """
+        download the figures of self.posts_content['img_src'], with a bounded thread pool,
+        into a content-addressed store - root_dir/ab/cd/<sha256><ext>, deduplicated by url and content,
+        then set the local paths, self.posts_content['img_path']
+
+        kwargs: images_dir, default: 'images', images_workers, default: 8
+        """
+
+        from parser.images import ImageStore
+
+        spilled = self.__has_spilled__('content')
+
+        if not spilled and (not getattr(self, 'posts_content', None) or 'img_src' not in self.posts_content):
+
+            return None
+
+        store = ImageStore(root_dir=root_dir or self.kwargs.get('images_dir', 'images'),
+                           max_workers=max_workers or self.kwargs.get('images_workers', 8))
+
+        Logger.info('Downloading images')
+
+        if spilled:
+
+            # one spilled segment at a time, rewritten with its local paths
+            self.spill.map_column('content', source='img_src', target='img_path', function=store.store)
+
+        if (getattr(self, 'posts_content', None) or dict()).get('img_src') is not None:
+
+            self.posts_content['img_path'] = store.store(self.posts_content['img_src'])
+
+        Logger.info(f'Images store : {len(store.index)}, {store.root_dir}')
+        Logger.set_line(length=50)
+
+    def flush(self):
+
+        """
+        block until all background exports are written
+        """
+
+        if self.writer is not None:
+
+            self.writer.flush()
+
+    def __background_writer__(self):
+
+        if self.writer is None and self.kwargs.get('background_export', False):
+
+            self.writer = BackgroundWriter(max_queue=self.kwargs.get('export_queue', 4),
+                                           snapshot_interval=self.kwargs.get('snapshot_interval'))
+
+        return self.writer
+
+    def __export__(self, export, **params):
+
+        """
+        call (export) - one of self.export_*(...), on the background writer if enabled,
+        with a snapshot of the data, so scraping continues while it's written
+        """
+
+        writer = self.__background_writer__()
+
+        # spilled data is already streamed from disk
+        if writer is None or self.__has_spilled__(''):
+
+            return export(**params)
+
+        if export in (self.export_metadata_json, self.export_metadata_csv):
+
+            content = snapshot_columns(self.metadata)
+
+        else:
+
+            content = snapshot_columns(getattr(self, 'posts_content', None))
+
+        writer.submit(export, content=content, **params)
+
+    def output_path(self, filename):
+
+        compression = self.kwargs.get('export_compression')
+
+        if compression is not None and Files.compression(filename) is None \
+                and Files.extension(filename) in ('.json', '.jsonl', '.csv'):
+
+            filename += {'gzip': '.gz', 'xz': '.xz', 'zstd': '.zst'}[compression]
+
+        output_dir = self.kwargs.get('output_dir')
+
+        if output_dir is None:
+
+            return filename
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        return os.path.join(output_dir, filename)
+
+    def get(self, url, record=True):
+
+        if self.driver is None:
+
+            self.__init_web_driver__()
+
+        else:
+
+            reason = self.lifecycle.reason(pid=self.__driver_pid__())
+
+            if reason is not None:
+
+                self.recycle(reason)
+
+        self.__set_timeouts__()
+
+        host = Urls.host(url)
+        latency = self.__latency__()
+
+        for i in range(self.reload_page_count):
+
+            if latency is not None:
+
+                if latency.is_down(host):
+
+                    Logger.fail('host is down::page has been skipped :' + url)
+                    Logger.set_line(length=60)
+
+                    return False
+
+                self.driver.set_page_load_timeout(time_to_wait=latency.timeout(host, default=self.time_to_wait))
+
+            start = time.monotonic()
+
+            try:
+
+                self.driver.get(url=url)
+
+                self.lifecycle.succeeded()
+
+                if latency is not None:
+
+                    latency.record(host, time.monotonic() - start)
+
+                break
+
+            except TimeoutException as error:
+
+                self.lifecycle.failed()
+
+                if latency is not None:
+
+                    latency.failure(host, time.monotonic() - start)
+
+                    if latency.is_down(host):
+
+                        Logger.fail(str(i + 1) + ': timeout::host is down, page has been skipped :' + url)
+                        Logger.set_line(length=60)
+
+                        return False
+
+                if i < self.reload_page_count - 1:
+
+                    Logger.fail(str(i+1) + ': timeout::page has been reloaded')
+                    Logger.set_line(length=60)
+
+                else:
+
+                    Logger.fail(str(i + 1) + ': timeout::page reload Limit has been exceed\n'
+                                             '\tdo you want to try again - [y/n]: ', end='')
+                    ok = input()
+
+                    Logger.set_line(length=60)
+
+                    if ok.lower() == 'y':
+
+                        self.time_to_wait = float(input('time to wait :'))
+                        self.reload_page_count = int(input('reload count :'))
+
+                        return self.get(url, record=record)
+
+                    elif ok.lower() == 'n':
+
+                        self.___timeout_export__()
+                        Logger.error(error)
+
+                    else:
+
+                        self.___timeout_export__()
+
+                        Logger.fail('Abort')
+                        Logger.error(error)
+
+            except WebDriverException as error:
+
+                # renderer crash, or lost browser session --> restart the browser, then reload,
+                # other errors (ex: an invalid url) are raised
+                if not MediumScraper.is_crash(error):
+
+                    raise error
+
+                self.lifecycle.failed()
+
+                Logger.fail(str(i + 1) + ': ' + str(error.msg) + '::browser has been restarted')
+                Logger.set_line(length=60)
+
+                self.recycle(reason='page load failure')
+                self.__set_timeouts__()
+
+                if i == self.reload_page_count - 1:
+
+                    Logger.fail('page reload Limit has been exceed::page has been skipped :' + url)
+
+                    return False
+
+        self.scroll_height = self.driver.execute_script("return document.body.scrollHeight")
+
+        if record and self.__recorder__() is not None:
+
+            self.recorder.write(url, self.driver.page_source, kind='page')
+
+        return True
+
+    def scroll_down(self, callback, delay=0.5, limit: int = -1, stop_condition=None, **meta):
+
+        for i in range(limit):
+
+            reason = stop_condition() if stop_condition is not None else None
+
+            if reason:
+
+                Logger.info_r(f'steps : {i}/{limit}, {reason}')
+
+                break
+
+            # scroll to - document.body.scrollHeight
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+            Logger.info_r(f'steps : {i+1}/{limit}')
+
+            Requests.sleep(delay)
+
+        Logger.info('', end='\n')
+        Logger.set_line(length=50)
+
+        outputs = callback(**meta)
+
+        return outputs
+
+    def find_elements_by_xpath(self, xpath, raise_error=True):
+
+        try:
+
+            return self.driver.find_elements_by_xpath(xpath)
+
+        except WebDriverException as error:
+
+            if raise_error:
+
+                raise error
+
+            else:
+                return []
+
+    def find_element_by_xpath(self, xpath, raise_error=True):
+
+        try:
+
+            return self.driver.find_element_by_xpath(xpath)
+
+        except WebDriverException as error:
+
+            if raise_error:
+
+                raise error
+
+            else:
+
+                return None
+
+    def xpath_count(self, xpath):
+
+        script = 'return document.evaluate(arguments[0], document, null, ' \
+                 'XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;'
+
+        return self.driver.execute_script(script, xpath)
+
+    def xpath_tail(self, xpath, start=0, attr='href'):
+
+        """
+        in-page evaluation of (xpath), returns (attr) of the matched nodes from index (start) onward,
+        which avoids a WebElement round trip per node
+        """
+
+        script = 'var nodes = document.evaluate(arguments[0], document, null, ' \
+                 'XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);' \
+                 'var values = [];' \
+                 'for (var i = arguments[1]; i < nodes.snapshotLength; i++) ' \
+                 '{ values.push(nodes.snapshotItem(i)[arguments[2]]); }' \
+                 'return values;'
+
+        return self.driver.execute_script(script, xpath, start, attr)
+
+    @staticmethod
+    def node_find_element_by_xpath(node, xpath, raise_error=True):
+
+        if node is None:
+
+            return None
+
+        try:
+
+            return node.find_element_by_xpath(xpath)
+
+        except WebDriverException as error:
+
+            if raise_error:
+
+                raise error
+
+            else:
+
+                return None
+
+    @staticmethod
+    def node_find_elements_by_xpath(node, xpath, raise_error=True):
+
+        if node is None:
+
+            return []
+
+        try:
+
+            return node.find_elements_by_xpath(xpath)
+
+        except WebDriverException as error:
+
+            if raise_error:
+
+                raise error
+
+            else:
+
+                return None
+
+    @staticmethod
+    def safe_get_attribute(element, attr_name, default):
+
+        return getattr(element, attr_name, default)
+
+    def export_store(self, filename='posts_content.parquet', table='posts', overwrite=False):
+
+        """
+        stream a table of kwargs: store, into (filename), see parser.store.PostsStore.export
+
+        table: str
+            'cards', the posts metadata of all topics, or 'posts', their content
+        """
+
+        if self.__posts_store__() is None:
+
+            Logger.fail('export_store requires kwargs: store')
+
+            return None
+
+        self.store.export(self.output_path(filename), table=table, overwrite=overwrite)
+
+    def search(self, query: str, limit: int = 10, topic: str = None):
+
+        """
+        full-text search over the indexed posts, see kwargs: search_index,
+        returns a list of {'url', 'title', 'author', 'topic', 'snippet'}, best matches first
+        """
+
+        if self.__search_index__() is None:
+
+            raise ScraperException('No search index, set search_index=to_path/posts_index.db')
+
+        return self.search_index.search(query=query, limit=limit, topic=topic)
+
+    def __search_index__(self):
+
+        if self.search_index is None and self.kwargs.get('search_index') is not None:
+
+            self.search_index = SearchIndex(filename=self.kwargs['search_index'])
+
+        return self.search_index
+
+    def __posts_store__(self):
+
+        if self.store is None and self.kwargs.get('store') is not None:
+
+            self.store = PostsStore(filename=self.kwargs['store'], batch_size=self.kwargs.get('store_batch_size', 500))
+
+        return self.store
+
+    def __store_cards__(self, topic, columns: dict, topic_url=None):
+
+        if self.__posts_store__() is not None:
+
+            self.store.add_cards(topic, columns, topic_url=topic_url)
+
+    def __near_duplicates__(self):
+
+        if self.near_duplicates is None and self.kwargs.get('near_duplicates') is not None:
+
+            from parser.dedup import MinHashLSH
+
+            self.near_duplicates = MinHashLSH(threshold=self.kwargs.get('near_duplicates_threshold', 0.8))
+
+            if self.kwargs.get('near_duplicates_index') is not None:
+
+                self.near_duplicates.load(self.kwargs['near_duplicates_index'])
+
+        return self.near_duplicates
+
+    def __recorder__(self):
+
+        if self.recorder is None and self.kwargs.get('record') is not None:
+
+            self.recorder = Recorder(path=self.kwargs['record'])
+
+        return self.recorder
+
+    @staticmethod
+    def is_crash(error: WebDriverException):
+
+        message = (error.msg or '').lower()
+
+        return any(indicator in message for indicator in crash_indicators)
+
+    def recycle(self, reason=''):
+
+        """
+        restart the browser, the scraped metadata and posts content are kept
+        """
+
+        Logger.info_r(f'recycle browser : {reason}')
+
+        try:
+
+            self.__quit_driver__()
+
+        except WebDriverException:
+
+            self.driver = None
+
+        self.__init_web_driver__()
+
+        self.lifecycle.recycled += 1
+
+    def quit(self):
+
+        if self.writer is not None:
+
+            self.writer.close()
+
+            self.writer = None
+
+        if self.search_index is not None:
+
+            self.search_index.flush()
+
+        if self.store is not None:
+
+            self.store.flush()
+
+        self.__quit_driver__()
+
+    def reset(self):
+
+        """
+        closes the components, which are created from the kwargs of a run - the store, the search index,
+        the spilled segments, the recorder, ..., so that the next run creates them from its own kwargs,
+        the browser is kept
+        """
+
+        if self.writer is not None:
+
+            self.writer.close()
+
+            self.writer = None
+
+        if self.search_index is not None:
+
+            self.search_index.close()
+
+        if self.store is not None:
+
+            self.store.close()
+
+        if self.spill is not None:
+
+            self.spill.close()
+
+        self.search_index, self.store, self.spill = None, None, None
+
+        self.watermark, self.paywalled, self.recorder, self.near_duplicates = None, None, None, None
+        self.latency, self.capture, self.frontier = None, None, None
+
+    def __quit_driver__(self):
+
+        # the browser only, the background writer, the store and the search index are kept
+        if self.driver is not None:
+
+            self.driver.quit()
+
+            self.driver = None
+
+    def close(self):
+
+        if self.driver is not None:
+
+            self.driver.close()
+
+    def save_profile_template(self):
+
+        """
+        copies the browser profile into kwargs: profile_template, after quitting the browser,
+        so the following runs, or the other workers of a batch, start from a warm cache
+        """
+
+        if self.kwargs.get('profile_dir') is None or self.kwargs.get('profile_template') is None:
+
+            return None
+
+        if self.driver is not None:
+
+            self.__quit_driver__()
+
+        profile = BrowserProfile(root_dir=self.kwargs['profile_dir'], browser=self.browser,
+                                 template=self.kwargs['profile_template'])
+
+        return profile.save_template(self.profile_name or self.kwargs.get('profile_name', 'default'))
+
+    def get_post_content(self, url):
+
+        if not hasattr(self, 'posts_content'):
+
+            setattr(self, 'posts_content', dict())
+
+        self.__get_post_content__(url)
+
+    def get_posts_count(self):
+
+        count = 0
+
+        for key in self.metadata.keys():
+
+            count += len(self.metadata[key]['url'])
+
+        if self.spill is not None:
+
+            for partition in self.spill.partitions('metadata/'):
+
+                count += self.spill.count(partition)
+
+        return count
 
-        self.__init_web_driver__()
+    def get_content_count(self):
+
+        count = len((getattr(self, 'posts_content', None) or dict()).get('url', []))
+
+        if self.spill is not None:
+
+            count += self.spill.count('content')
+
+        return count
+
+    def iter_metadata_rows(self, metadata: dict = None):
+
+        """
+        yields (topic, url, fields) of (metadata), default: self.metadata, and of the spilled metadata, row by row,
+        the rows are the ones at the time of the call, posts which are spilled meanwhile aren't repeated
+        """
+
+        metadata = self.metadata if metadata is None else metadata
+
+        topics = list(metadata.keys())
+
+        topics += [partition[len('metadata/'):] for partition in self.spill.partitions('metadata/')
+                   if partition[len('metadata/'):] not in topics] if self.spill is not None else []
+
+        # the spilled segments, and the in-memory columns (replaced, not cleared, once spilled) of each topic
+        snapshot = [(topic, len(self.spill.segments.get('metadata/' + topic, [])) if self.spill is not None else 0,
+                     metadata.get(topic)) for topic in topics]
+
+        def iter_rows():
+
+            for topic, segments, columns in snapshot:
+
+                for row in self.__iter_rows__('metadata/' + topic, columns, segments=segments):
+
+                    yield topic, row.pop('url', None), row
+
+        return iter_rows()
+
+    def __metadata_counts__(self, metadata: dict = None):
+
+        # {topic: number of posts} of (metadata), default: self.metadata, and of the spilled metadata
+        metadata = self.metadata if metadata is None else metadata
+
+        counts = {topic: len(columns.get('url', [])) for topic, columns in metadata.items()}
+
+        for partition in self.spill.partitions('metadata/') if self.spill is not None else []:
+
+            topic = partition[len('metadata/'):]
+
+            counts[topic] = counts.get(topic, 0) + self.spill.count(partition)
+
+        return counts
+
+    def __spill_store__(self):
+
+        if self.spill is None and self.kwargs.get('memory_limit') is not None:
+
+            self.spill = SpillStore(directory=self.kwargs.get('spill_dir', 'spill'),
+                                    memory_limit=self.kwargs['memory_limit'])
+
+        return self.spill
+
+    def __check_memory__(self, record=None):
+
+        spill = self.__spill_store__()
+
+        if spill is None:
+
+            return None
+
+        if record is not None:
+
+            spill.track(record)
+
+        if not spill.exceeded():
+
+            return None
+
+        Logger.info_r(f'memory limit has been exceeded, spill to : {spill.directory}')
+
+        for topic, columns in list(self.metadata.items()):
+
+            spill.spill('metadata/' + topic, columns)
+
+            self.metadata[topic] = {key: [] for key in columns.keys()}
+
+        if getattr(self, 'posts_content', None):
+
+            spill.spill('content', self.posts_content)
+
+            self.posts_content = {key: [] for key in self.posts_content.keys()}
+
+        spill.memory_size = 0
+
+    def __clear_spilled__(self):
+
+        # the spilled metadata and content of a previous run
+        if self.spill is not None:
+
+            self.spill.clear()
+
+    def __has_spilled__(self, prefix):
+
+        return self.spill is not None and len(self.spill.partitions(prefix)) > 0
+
+    def __drop_spilled__(self, metadata: dict = None):
+
+        # the rows of (metadata), without the posts of the spilled metadata
+        if metadata is None or not self.__has_spilled__('metadata/'):
+
+            return metadata
+
+        return {topic: merge_columns(dict(), columns, seen=self.spill.iter_column('metadata/' + topic, 'url'))
+                if self.spill.has('metadata/' + topic) else columns for topic, columns in metadata.items()}
+
+    def __metadata_topics__(self):
+
+        topics = list(self.metadata.keys())
+
+        if self.spill is not None:
+
+            for partition in self.spill.partitions('metadata/'):
+
+                topic = partition[len('metadata/'):]
+
+                if topic not in topics:
+
+                    topics.append(topic)
+
+        return topics
+
+    def __columns_names__(self, partition, columns: dict = None):
+
+        if columns:
+
+            return list(columns.keys())
+
+        return self.spill.columns(partition) if self.spill is not None and partition is not None else []
+
+    def __iter_columns__(self, partition, columns: dict = None):
+
+        # partition: None, only the in-memory (columns)
+        columns = columns or dict()
+
+        names = self.__columns_names__(partition, columns)
+
+        spilled = self.spill.iter_columns(partition, names) if self.spill is not None and partition is not None \
+            else dict()
+
+        return {name: chain(spilled.get(name, []), columns.get(name, [])) for name in names}
+
+    def __iter_rows__(self, partition, columns: dict = None, segments: int = None):
+
+        if self.spill is not None and partition is not None:
+
+            yield from self.spill.iter_rows(partition, segments=segments)
+
+        if columns:
+
+            names = list(columns.keys())
+
+            for i in range(len(columns.get('url', []))):
+
+                yield {name: columns[name][i] if i < len(columns[name]) else None for name in names}
+
+    def __metadata_rows__(self, content: dict = None):
+
+        # rows of all topics, with a topic field, of (content), or of self.metadata and its spilled parts
+        topics = self.__metadata_topics__() if content is None else list(content.keys())
+
+        for topic in topics:
+
+            partition = 'metadata/' + topic if content is None else None
+
+            for row in self.__iter_rows__(partition, (content or self.metadata).get(topic)):
+
+                row['topic'] = topic
+
+                yield row
+
+    def __metadata_frames__(self, content: dict = None, chunk_size: int = 100000):
+
+        # DataFrames of (chunk_size) rows of self.__metadata_rows__(content), enriched if kwargs: enrich_metadata
+        rows = self.__metadata_rows__(content)
+
+        while True:
+
+            chunk = list(islice(rows, chunk_size))
+
+            if len(chunk) == 0:
+
+                return
+
+            frame = pd.DataFrame.from_records(chunk)
+
+            yield enrich_metadata(frame) if self.kwargs.get('enrich_metadata', True) else frame
+
+    def ___timeout_export__(self):
+
+        if hasattr(self, 'timeout_export') and self.timeout_export:
+
+            if hasattr(self, 'export_json') and self.export_json:
+
+                self.__export__(self.export_data_json, filename=self.output_path('timeout_export_content.json'),
+                                overwrite=True, indent_level=3, sort_keys=False)
+
+            if hasattr(self, 'export_csv') and self.export_csv:
+
+                self.__export__(self.export_data_csv, filename=self.output_path('timeout_export_content.csv'),
+                                overwrite=True)
+
+    def __latency__(self):
+
+        if self.latency is None and self.kwargs.get('adaptive_timeout', False):
+
+            self.latency = LatencyTracker(percentile=self.kwargs.get('timeout_percentile', 0.95),
+                                          margin=self.kwargs.get('timeout_margin', 2.0),
+                                          min_timeout=self.kwargs.get('timeout_min', 5.0),
+                                          max_timeout=self.kwargs.get('timeout_max', self.time_to_wait),
+                                          down_after=self.kwargs.get('host_down_failures', 3),
+                                          down_cooldown=self.kwargs.get('host_down_cooldown', 300.0))
+
+        return self.latency
+
+    def __network_capture__(self):
+
+        if self.capture is None and self.kwargs.get('network_capture', False):
+
+            if self.browser != 'chrome':
+
+                Logger.warning('network_capture is supported by chrome only, cards are scraped instead')
+
+                self.kwargs['network_capture'] = False
+
+                return None
+
+            self.capture = FeedCapture()
+
+        return self.capture
+
+    def __capture_feed__(self):
+
+        if self.capture is None:
+
+            return 0
+
+        self.capture.feed(self.driver.get_log('performance'))
+
+        added = 0
+
+        for request_id in self.capture.pending():
+
+            try:
+
+                response = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
 
-        if self.driver is None:  # Log Error
+            except WebDriverException:
+
+                # the body has been evicted, or the request was redirected
+                continue
+
+            added += self.capture.add_body(response['body'], response.get('base64Encoded', False))
+
+        return added
+
+    def __set_timeouts__(self):
+
+        self.driver.set_page_load_timeout(time_to_wait=self.time_to_wait)
+
+        if 'script_timeout' in self.kwargs.keys():
+
+            self.driver.set_script_timeout(time_to_wait=self.kwargs['script_timeout'])
+
+        else:
+
+            self.driver.set_script_timeout(0.001)
+
+    def __driver_pid__(self):
+
+        service = getattr(self.driver, 'service', None)
+        process = getattr(service, 'process', None)
+
+        return getattr(process, 'pid', None)
+
+    def __init_web_driver__(self):
+
+        self.__init_driver_options__()
+
+        if self.lifecycle is None:
+
+            self.lifecycle = DriverLifecycle(max_pages=self.kwargs.get('recycle_pages'),
+                                             max_rss=self.kwargs.get('recycle_rss'),
+                                             max_failures=self.kwargs.get('recycle_failures', 3))
+
+        self.lifecycle.reset()
+
+        if self.browser == 'chrome':
+
+            self.driver_path = self.__os_process__.locate_file(pattern='/chromedriver$', params='-i --regexp',
+                                                               updatedb=self.__updatedb__)[0]
+
+            if self.driver_path is None:
+
+                Logger.error(initialization_error_msg + 'Can\'t Find Chrome Driver Executable File')
+
+            self.driver = webdriver.Chrome(options=self.options, executable_path=self.driver_path)
+
+        elif self.browser == 'firefox':
+
+            self.driver_path = self.__os_process__.locate_file(pattern='/geckodriver$', params='-i --regexp',
+                                                               updatedb=self.__updatedb__)[0]
+
+            if self.driver_path is None:
+
+                Logger.error(initialization_error_msg + 'Can\'t Find Firefox Driver Executable File')
+
+            self.driver = webdriver.Firefox(options=self.options, executable_path=self.driver_path)
+
+        else:  # Log Error
+            pass
+
+    def __init_driver_options__(self):
+
+        if self.cfg_filename is not None:
+
+            self.__set_config__()
+
+        if self.browser == 'chrome':
+
+            self.options = ChromeOptions()
+
+            if self.kwargs.get('network_capture', False):
+
+                self.options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+        elif self.browser == 'firefox':
+
+            self.options = FirefoxOptions()
+
+        else:  # Log Error
             pass
 
+        if self.kwargs.get('tabs') is not None and self.kwargs['tabs'] > 1:
+
+            # tabs are navigated by a script, so the driver must not block until each load completes
+            self.options.set_capability('pageLoadStrategy', 'eager')
+
+        profile_path = self.__browser_profile__()
+
+        if profile_path is not None and self.browser == 'chrome':
+
+            self.options.add_argument('--user-data-dir=' + profile_path)
+
+        elif profile_path is not None and self.browser == 'firefox':
+
+            # used in place, instead of a temporary copy
+            self.options.add_argument('-profile')
+            self.options.add_argument(profile_path)
+
+    def __browser_profile__(self):
+
+        if self.kwargs.get('profile_dir') is None:
+
+            return None
+
+        profile = BrowserProfile(root_dir=self.kwargs['profile_dir'], browser=self.browser,
+                                 max_size=self.kwargs.get('profile_max_size', 1024),
+                                 template=self.kwargs.get('profile_template'))
+
+        return profile.acquire(self.profile_name or self.kwargs.get('profile_name', 'default'))
+
+    def __set_config__(self):
+
+        # settings which are already set (ex: the output_dir of a batch job) take precedence over the file
+        self.kwargs = dict(Reader.json_to_dict(self.cfg_filename) or dict(), **(self.kwargs or dict()))
+
+        # ....., parsing, set options
+
+    def __init__model__(self):
+
+        # the browser is launched lazily, by the first call of self.get(...)
+        if self.cfg_filename is not None:
+
+            self.__set_config__()
+
         self.__init__urls__()
 
+    def __init_topics__(self):
+
+        if self.topics is None:
+
+            return None
+
+        if not isinstance(self.topics, list) and self.topics != 'all':
+
+            self.topics: str
+
+            self.topics = self.topics.split(',')
+            self.topics = list(map(lambda _str: _str.strip(), self.topics))
+
+        if self.topics != 'all':
+
+            self.topics = list(map(lambda name: name.lower(), self.topics))
+
+            # Log Info
+            Logger.info('Topics : ' + ', '.join(self.topics))
+
     def __init__urls__(self):
 
         if self.topics is not None:
 
-            if not isinstance(self.topics, list) and self.topics != 'all':
+            self.__init_topics__()
 
-                self.topics: str
+            cache = TopicsCache(filename=self.kwargs.get('topics_cache', 'topics_cache.json'),
+                                ttl=self.kwargs.get('topics_cache_ttl', 7 * 24 * 3600))
 
-                self.topics = self.topics.split(',')
-                self.topics = list(map(lambda _str: _str.strip(), self.topics))
+            topics_urls = cache.load()
 
             if self.topics != 'all':
 
-                self.topics = list(map(lambda name: name.lower(), self.topics))
+                self.__resolve_topics_urls__(topics_urls)
 
-                # Log Info
-                Logger.info('Topics : ' + ', '.join(self.topics))
+            elif topics_urls is not None:
 
-            info = MediumScraper.main_urls['topics']
+                self.topics_urls = topics_urls
+                self.metadata = dict()
 
-            self.get(info['url'])
+            else:
+
+                info = MediumScraper.main_urls['topics']
 
-            self.__get_topics_urls__()
+                self.get(info['url'])
+
+                self.__get_topics_urls__()
+
+                cache.save(self.topics_urls)
 
         else:
 
@@ -579,9 +1959,20 @@ class MediumScraper:
 
             self.__get_taps_urls__()
 
-    def __get_topics_urls__(self):
+    def __resolve_topics_urls__(self, topics_urls: list = None):
+
+        known = dict()
+
+        for url in topics_urls or []:
+
+            known[TopicsCache.topic_name(url)] = url
+
+        info = MediumScraper.main_urls['topic']
+
+        self.topics_urls = [known.get(name, info['url'] + name) for name in self.topics]
+        self.metadata = dict()
 
-        topic_xpath = '//section/div/div/div/a'
+    def __get_topics_urls__(self):
 
         elements = self.find_elements_by_xpath(xpath=topic_xpath)
 
@@ -593,35 +1984,67 @@ class MediumScraper:
             href = element.get_attribute('href')
             self.topics_urls.append(href)
 
-    def __get_posts_metadata__(self):
+    def __get_posts_metadata__(self):
+
+        if len(self.topics_urls) > 0:
+
+            budget = TopicsBudget(scroll_step=self.scroll_step, target_count=self.target_count,
+                                  time_limit=self.time_limit, patience=self.kwargs.get('scroll_patience', 5))
+
+            def get_urls(topic_url, index):
+
+                name = topic_url.split('/')[-1]
+
+                allotment = budget.start(name, index)
+
+                metadata = self.__get_metadata__(url=topic_url, topic=name, allotment=allotment)
+
+                budget.stop(allotment)
+
+                if metadata is None:
+
+                    return
+
+                if self.watermark is not None:
 
-        if len(self.topics_urls) > 0:
+                    metadata = self.watermark.filter(name, metadata)
 
-            def get_urls(topic_url):
+                self.metadata[name] = metadata
 
-                name = topic_url.split('/')[-1]
+                self.__store_cards__(name, metadata, topic_url)
 
-                if (isinstance(self.topics, list) and name in self.topics) \
-                        or self.topics == 'all':
+                self.__check_memory__(record=metadata)
 
-                    self.metadata[name] = self.__get_metadata__(url=topic_url)
+            selected = [url for url in self.topics_urls
+                        if (isinstance(self.topics, list) and url.split('/')[-1] in self.topics)
+                        or self.topics == 'all']
 
-            for url in self.topics_urls:
+            for i, url in enumerate(selected):
 
-                get_urls(url)
+                get_urls(url, i)
 
         else:
 
             pass
 
-    def __get_metadata__(self, url):
+    def __get_metadata__(self, url, topic=None, allotment: Allotment = None):
+
+        capture = self.__network_capture__()
+
+        if capture is not None and self.driver is not None:
+
+            # discard the responses of the previous pages
+            self.driver.get_log('performance')
+
+        # topic pages are recorded after scrolling
+        if self.get(url, record=False) is False:
+
+            return None
 
-        self.get(url)
+        if capture is not None:
 
-        article_xpath = '//section/div/section/div/div/div/h3/a'
-        subtitle_xpath = '//section/div/section' + '/div' * 4 + '/h3'
-        pub_xpath = '//section/div/section' + '/div' * 5 + '[@class="n"]'
-        datetime_xpath = '//section/div/section' + '/div' * 7
+            capture.reset()
+            capture.add_state(self.driver.execute_script(apollo_state_script))
 
         def get_pub(elements_pub: List[WebElement]):
 
@@ -645,6 +2068,20 @@ class MediumScraper:
 
         def get_metadata():
 
+            if self.__recorder__() is not None:
+
+                self.recorder.write(url, self.driver.page_source, kind='topic', topic=topic)
+
+            if capture is not None:
+
+                self.__capture_feed__()
+
+                if capture.count() > 0:
+
+                    return capture.columns()
+
+                Logger.warning('No feed responses have been captured :' + url)
+
             elements_url = self.find_elements_by_xpath(xpath=article_xpath)
             elements_subtitle = self.find_elements_by_xpath(xpath=subtitle_xpath)
             elements_pub = self.find_elements_by_xpath(xpath=pub_xpath)
@@ -669,15 +2106,88 @@ class MediumScraper:
 
             return _metadata
 
+        checked = {'url': 0, 'date': 0}
+
+        def reached_seen_posts():
+
+            urls = self.xpath_tail(article_xpath, start=checked['url'], attr='href')
+            dates = self.xpath_tail(datetime_xpath, start=checked['date'], attr='innerText')
+
+            checked['url'] += len(urls)
+            checked['date'] += len(dates)
+
+            dates = list(map(lambda text: text.split('\n')[0] if text else None, dates))
+
+            if self.watermark.reached(topic, urls, dates):
+
+                return 'reached previously seen posts'
+
+            return None
+
+        def budget_exhausted():
+
+            allotment.update(self.xpath_count(article_xpath))
+
+            return allotment.reason()
+
+        def stop_condition():
+
+            reason = None
+
+            # response bodies are fetched while scrolling, before the browser evicts them
+            self.__capture_feed__()
+
+            if self.watermark is not None and self.watermark.has_topic(topic):
+
+                reason = reached_seen_posts()
+
+            if reason is None and allotment is not None and allotment.active:
+
+                reason = budget_exhausted()
+
+            # a check without a reason is followed by a scroll step
+            if reason is None and allotment is not None:
+
+                allotment.step()
+
+            return reason
+
+        limit = allotment.limit if allotment is not None else self.scroll_step or 1
+
         metadata = self.scroll_down(callback=get_metadata,
                                     delay=0.5,
-                                    limit=self.scroll_step)
+                                    limit=limit,
+                                    stop_condition=stop_condition)
 
         return metadata
 
-    def __get_data__(self):
+    def __get_data__(self, metadata: dict = None, rows=None, counts: dict = None):
+
+        """
+        metadata: dict
+            in-memory {topic: columns} of the posts to scrape
+
+        rows: iterable
+            (topic, url, fields) of the posts to scrape, ex: parser.metadata.MetadataReader.iter_rows(),
+            default: the rows of (metadata), or of self.metadata, including the spilled parts
+
+        counts: dict
+            {topic: number of posts}, for the progress, if known
+        """
+
+        if rows is None and metadata is None and self.metadata is not None:
+
+            rows = self.iter_metadata_rows()
+
+            counts = self.__metadata_counts__()
+
+        elif rows is None and metadata is not None:
 
-        if self.metadata is None:
+            rows = MediumScraper.__iter_rows_of__(metadata.items())
+
+            counts = {topic: len(columns.get('url', [])) for topic, columns in metadata.items()}
+
+        if rows is None:
 
             error_log = {'error_type': 'ValueError', 'message': 'Not urls to iterate through'}
             Logger.write_messages_json(error_log)
@@ -689,27 +2199,230 @@ class MediumScraper:
 
         self.posts_content = dict()
 
-        for topic, metadata in self.metadata.items():
+        if self.spill is not None:
+
+            self.spill.drop('content')
+
+        self.paywalled = UrlSet(filename=self.kwargs.get('paywalled_urls', 'paywalled_urls.json'))
+        paywall_policy = self.kwargs.get('paywall_policy', 'skip')
+
+        deferred = []
+
+        pool = self.__init_parse_pool__()
+        # posts which have been skipped, or have not been loaded, they are loaded once more at the end
+        failed = []
+
+        def on_failure(url, meta, reason):
+
+            # a page of the tabs pool
+            if reason == 'timeout':
+
+                self.lifecycle.failed()
+
+            failed.append((url, meta))
+
+        tabs = self.__init_tab_pool__(on_failure=on_failure)
+
+        def extract(url, meta):
+
+            # called by the tabs pool, with the driver switched to the tab of (url)
+            if pool is None:
+
+                self.__get_post_content__(url=url, meta=meta, load=False)
+
+            else:
+
+                self.__fetch_snapshot__(url=url, meta=meta, pool=pool, load=False)
+
+        def scrape(url, meta):
+
+            if tabs is not None:
+
+                # failures are reported by on_failure(...)
+                tabs.submit(url, meta, extract)
+
+                return None
+
+            if pool is None:
+
+                loaded = self.__get_post_content__(url=url, meta=meta)
+
+            else:
+
+                loaded = self.__fetch_snapshot__(url=url, meta=meta, pool=pool)
+
+            if loaded is False:
+
+                failed.append((url, meta))
+
+        current, i = None, 0
+
+        for topic, url, fields in rows:
+
+            if topic != current:
+
+                if current is not None:
+
+                    Logger.info(f'End Scraping : {current}')
+                    Logger.set_line(length=50)
+
+                Logger.info(f'Begin Scraping : {topic}')
+
+                current, i = topic, 0
+
+            i += 1
+
+            n_post = (counts or dict()).get(topic)
+
+            Logger.info_r(f'scraped content : {i}/{n_post}' if n_post is not None else f'scraped content : {i}')
+
+            meta = {'topic': topic, 'title': fields.get('title'), 'author': fields.get('author')}
+
+            if url in self.paywalled:
+
+                if paywall_policy == 'defer':
+
+                    deferred.append((url, meta))
+
+                continue
+
+            if self.url_cache is not None and not self.url_cache.claim(url):
+
+                self.skipped_urls += 1
+
+                continue
+
+            scrape(url, meta)
 
-            n_post = len(metadata['url'])
+        if current is not None:
 
-            Logger.info(f'Begin Scraping : {topic}')
+            Logger.info(f'End Scraping : {current}')
+            Logger.set_line(length=50)
+
+        if len(deferred) > 0:
+
+            Logger.info(f'Begin Scraping : limited access posts')
+
+            for i, (url, meta) in enumerate(deferred):
+
+                Logger.info_r(f'scraped content : {i + 1}/{len(deferred)}')
+
+                scrape(url, meta)
+
+            Logger.info(f'End Scraping : limited access posts')
+            Logger.set_line(length=50)
+
+        if tabs is not None:
+
+            tabs.drain(extract)
+
+        if len(failed) > 0:
+
+            retry = list(failed)
+            failed.clear()
+
+            Logger.info(f'Begin Scraping : failed posts')
+
+            # the hosts, which are still down after a retry, their other posts aren't retried in this pass
+            down_hosts = set()
+
+            for i, (url, meta) in enumerate(retry):
+
+                Logger.info_r(f'scraped content : {i + 1}/{len(retry)}')
 
-            for i in range(n_post):
+                host = Urls.host(url)
 
-                Logger.info_r(f'scraped content : {i + 1}/{n_post}')
+                if host in down_hosts:
 
-                self.__get_post_content__(url=metadata['url'][i])
+                    failed.append((url, meta))
 
-            Logger.info(f'End Scraping : {topic}')
+                    continue
+
+                self.__wait_host__(url)
+
+                scrape(url, meta)
+
+                if self.latency is not None and self.latency.down_for(host) > 0:
+
+                    down_hosts.add(host)
+
+            if tabs is not None:
+
+                tabs.drain(extract)
+
+            Logger.info(f'End Scraping : failed posts')
             Logger.set_line(length=50)
 
-    def __get_post_content__(self, url):
+        self.failed_urls = [url for url, _ in failed]
+
+        if len(failed) > 0:
+
+            Logger.write_messages_json({'failed_urls': self.failed_urls})
+
+            Logger.fail(f'No. of failed posts : {len(failed)}, see self.failed_urls')
+
+        if tabs is not None:
+
+            tabs.close()
+
+        if pool is not None:
+
+            for post, meta in pool.drain():
+
+                self.__add_parsed_post__(post, meta)
 
-        self.get(url)
+            pool.close()
 
-        text_xpath = '//article/div/section/div/div/p'
-        figure_xpath = '//article/div/section/div/div/figure'
+        self.paywalled.save()
+
+        if self.search_index is not None:
+
+            self.search_index.flush()
+
+        if self.store is not None:
+
+            self.store.flush()
+
+        if self.near_duplicates is not None and self.kwargs.get('near_duplicates_index') is not None:
+
+            self.near_duplicates.save(self.kwargs['near_duplicates_index'])
+
+    def __wait_host__(self, url):
+
+        # before loading a page of a down host again, its cooldown is waited for
+        if self.latency is None:
+
+            return None
+
+        seconds = self.latency.down_for(Urls.host(url))
+
+        if seconds > 0:
+
+            Logger.info(f'host is down : {Urls.host(url)}, waiting {seconds:.0f}s')
+
+            time.sleep(seconds)
+
+    @staticmethod
+    def __iter_rows_of__(items):
+
+        # (topic, columns) --> (topic, url, fields)
+        for topic, columns in items:
+
+            others = [name for name in columns.keys() if name != 'url']
+
+            for i, url in enumerate(columns.get('url', [])):
+
+                yield topic, url, {name: columns[name][i] if i < len(columns[name]) else None for name in others}
+
+    def __get_post_content__(self, url, meta: dict = None, load=True):
+
+        if load and self.get(url) is False:
+
+            return False
+
+        if not load:
+
+            self.__loaded__(url)
 
         def section_reformat(text):
             return '[' + text + ']'
@@ -789,19 +2502,17 @@ class MediumScraper:
 
         def check_limited_access():
 
-            ok = self.find_element_by_xpath(f"//*[contains(text(), '{limited_access_indicator[0]}')]",
-                                            raise_error=False)
-
-            if ok is None:
+            try:
 
-                ok = self.find_element_by_xpath(f"//*[contains(text(), '{limited_access_indicator[1]}')]",
-                                                raise_error=False)
+                indicators = self.driver.execute_script(limited_access_script, limited_access_indicator) or []
 
-            if ok is None:
+            except WebDriverException:
 
                 return False
 
-            return True
+            self.__mark_paywalled__(url, indicators)
+
+            return len(indicators) > 0
 
         def get_post_content():
 
@@ -833,23 +2544,217 @@ class MediumScraper:
 
             text = get_text(elements_text)
 
-            img_src, img_caption = get_figure(elements_figure)
+            duplicate_of, skip = self.__find_duplicate__(url, text)
 
-            keys = list(self.posts_content.keys())
+            if skip:
 
-            if len(keys) == 0:
+                return
 
-                self.posts_content = {'url': [],
-                                      'text':  [],
-                                      'img_src': [],
-                                      'caption': []}
+            img_src, img_caption = get_figure(elements_figure)
 
-            self.posts_content['url'].append(url)
-            self.posts_content['text'].append(text)
-            self.posts_content['img_src'].append(img_src)
-            self.posts_content['caption'].append(img_caption)
+            self.__add_post_content__(url, text, img_src, img_caption, meta=meta, duplicate_of=duplicate_of)
 
         get_post_content()
 
+        if self.crawling:
+
+            meta = meta or dict()
+
+            self.__follow_links__(depth=meta.get('depth', 0) + 1)
+
+    def __init_tab_pool__(self, on_failure=None):
+
+        tabs = self.kwargs.get('tabs')
+
+        if tabs is None or tabs < 2:
+
+            return None
+
+        if self.driver is None:
+
+            self.__init_web_driver__()
+
+        self.__set_timeouts__()
+
+        return TabPool(self.driver, tabs=tabs, time_to_wait=self.time_to_wait, latency=self.__latency__(),
+                       on_failure=on_failure)
+
+    def __loaded__(self, url):
+
+        # bookkeeping of a page, which has been loaded in a tab, instead of self.get(url)
+        self.lifecycle.succeeded()
+
+        if self.__recorder__() is not None:
+
+            self.recorder.write(url, self.driver.page_source, kind='page')
+
+    def __init_parse_pool__(self):
+
+        if self.kwargs.get('parse_workers') is None:
+
+            return None
+
+        from parser.html import ParsePool
+
+        return ParsePool(post_image_indicator=post_image_indicator, limited_access_indicator=limited_access_indicator,
+                         max_workers=self.kwargs['parse_workers'], snapshots_dir=self.kwargs.get('snapshots_dir'))
+
+    def __fetch_snapshot__(self, url, meta: dict, pool, load=True):
+
+        """
+        load (url), hand its page source to the parsing processes, and add the posts which are already parsed,
+        so the next page load overlaps with parsing
+        """
+
+        if load and self.get(url) is False:
+
+            return False
+
+        if not load:
+
+            self.__loaded__(url)
+
+        for post, post_meta in pool.submit(url, self.driver.page_source, meta):
+
+            self.__add_parsed_post__(post, post_meta)
+
+    def __add_parsed_post__(self, post: Union[dict, None], meta: dict = None):
+
+        # a page, which has failed to be parsed, is skipped
+        if post is None:
+
+            self.skipped_urls += 1
+
+            return None
+
+        url = post['url']
+
+        if post['limited_access']:
+
+            Logger.warning('You have a limited access :' + url)
+
+        self.__mark_paywalled__(url, post['limited_access_indicators'])
+
+        duplicate_of, skip = self.__find_duplicate__(url, post['text'])
+
+        if skip:
+
+            return None
+
+        self.__add_post_content__(url, post['text'], post['img_src'], post['caption'], meta=meta,
+                                  duplicate_of=duplicate_of)
+
+    def __mark_paywalled__(self, url, indicators: list):
+
+        # a post is known as paywalled by its own indicator, the exhausted monthly quota says nothing about it
+        if self.paywalled is None:
+
+            return None
+
+        if paywall_indicator in indicators:
+
+            self.paywalled.add(url)
+
+        elif len(indicators) == 0:
+
+            self.paywalled.discard(url)
+
+    def __find_duplicate__(self, url, text):
+
+        """
+        returns (duplicate_of, skip), the url of an already scraped near-duplicate of (text), if any,
+        and whether the post should be skipped
+        """
+
+        if self.__near_duplicates__() is None:
+
+            return None, False
+
+        duplicate_of = self.near_duplicates.add(url, text)
+
+        if duplicate_of is None:
+
+            return None, False
+
+        Logger.warning(f'near-duplicate of {duplicate_of} :' + url)
+
+        return duplicate_of, self.kwargs['near_duplicates'] == 'skip'
+
+    def __add_post_content__(self, url, text, img_src, img_caption, meta: dict = None, duplicate_of=None):
+
+        keys = list(self.posts_content.keys())
+
+        if len(keys) == 0:
+
+            self.posts_content = {'url': [],
+                                  'text':  [],
+                                  'img_src': [],
+                                  'caption': []}
+
+            if self.near_duplicates is not None:
+
+                self.posts_content['duplicate_of'] = []
+
+        self.posts_content['url'].append(url)
+        self.posts_content['text'].append(text)
+        self.posts_content['img_src'].append(img_src)
+        self.posts_content['caption'].append(img_caption)
+
+        if 'duplicate_of' in self.posts_content:
+
+            self.posts_content['duplicate_of'].append(duplicate_of)
+
+        self.__check_memory__(record=[url, text, img_src, img_caption])
+
+        if self.writer is not None and self.writer.due_snapshot():
+
+            self.__export__(self.export_data_json, filename=self.output_path('snapshot_content.json'), overwrite=True,
+                            indent_level=None, sort_keys=False)
+
+        meta = meta or dict()
+
+        if self.__search_index__() is not None:
+
+            self.search_index.add(url=url, text=text, title=meta.get('title'), author=meta.get('author'),
+                                  topic=meta.get('topic'))
+
+        if self.__posts_store__() is not None:
+
+            self.store.add_post(url=url, text=text, img_src=img_src, caption=img_caption, topic=meta.get('topic'),
+                                title=meta.get('title'), author=meta.get('author'), duplicate_of=duplicate_of)
+
     def __get_taps_urls__(self):
-        pass
+
+        # without topics, the root page links seed the crawl frontier, see self.crawl(...)
+        self.topics_urls = list()
+        self.metadata = dict()
+
+        self.__follow_links__(depth=0)
+
+    def __crawl_frontier__(self):
+
+        if self.frontier is None:
+
+            self.frontier = CrawlFrontier(topics=self.topics if isinstance(self.topics, list) else None,
+                                          max_depth=self.kwargs.get('crawl_max_depth', 3),
+                                          max_size=self.kwargs.get('crawl_max_frontier', 100000),
+                                          capacity=self.kwargs.get('crawl_capacity', 1000000),
+                                          error_rate=self.kwargs.get('crawl_error_rate', 0.01),
+                                          domains=self.kwargs.get('crawl_domains'))
+
+        return self.frontier
+
+    def __follow_links__(self, depth, topic=None):
+
+        frontier = self.__crawl_frontier__()
+
+        try:
+
+            links = self.driver.execute_script(links_script) or []
+
+        except WebDriverException:
+
+            return 0
+
+        return sum(frontier.push(href, depth=depth, text=text, date=parse_date(date), topic=topic)
+                   for href, text, date in links)
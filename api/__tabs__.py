@@ -0,0 +1,199 @@
+from typing import Union
+
+import time
+
+from selenium import webdriver
+
+from parser.utils import Logger, Urls
+from parser.latency import LatencyTracker
+from errors.exceptions import WebDriverException, TimeoutException
+
+__all__ = ['TabPool']
+
+# mark the current document, so a tab is ready only once the new document has replaced it
+navigate_script = 'window.__stale_document__ = true; window.location.href = arguments[0];'
+
+# the driver runs with pageLoadStrategy 'eager', a tab is extracted once its document has been parsed
+ready_script = 'return document.readyState !== "loading" && !window.__stale_document__ ' \
+               '&& window.location.href !== "about:blank";'
+
+stale_script = 'return !!window.__stale_document__ || window.location.href === "about:blank";'
+
+
+class TabPool:
+
+    def __init__(self, driver: webdriver.Remote, tabs: int = 4, time_to_wait: float = 30.0, poll_interval: float = 0.1,
+                 latency: Union[LatencyTracker, None] = None, on_failure=None):
+
+        """
+        loads pages in (tabs) tabs of a single browser, and extracts from whichever tab finishes first
+
+        Parameters
+        ----------
+        time_to_wait: float
+            seconds, a tab which is still loading after (time_to_wait) is stopped, and extracted as it is,
+            unless it still holds the previous document
+
+        latency: LatencyTracker
+            if set, the load time of each page is recorded by host, and pages of down hosts are skipped
+
+        on_failure: callable
+            on_failure(url, meta, reason), for pages which have been skipped - reason: 'host down',
+            or have not been loaded - reason: 'timeout'
+        """
+
+        self.driver = driver
+
+        self.time_to_wait = time_to_wait
+        self.poll_interval = poll_interval
+
+        self.latency = latency
+        self.on_failure = on_failure
+
+        self.main_handle = self.driver.current_window_handle
+
+        for _ in range(tabs - 1):
+
+            self.driver.execute_script('window.open("about:blank", "_blank");')
+
+        self.free = list(self.driver.window_handles)
+
+        # handle: (url, meta, start)
+        self.busy = dict()
+
+    def submit(self, url, meta: dict, extract):
+
+        """
+        starts loading (url) in a free tab, waiting first for a busy tab to finish, if all of them are busy,
+        extract(url, meta) is called with the driver switched to the finished tab
+        """
+
+        host = Urls.host(url)
+
+        if self.latency is not None and self.latency.is_down(host):
+
+            Logger.fail('host is down::page has been skipped :' + url)
+
+            self.__failed__(url, meta, 'host down')
+
+            return
+
+        if len(self.free) == 0:
+
+            self.finish(self.wait(), extract)
+
+        handle = self.free.pop()
+
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script(navigate_script, url)
+
+        self.busy[handle] = (url, meta, time.monotonic())
+
+    def wait(self):
+
+        while True:
+
+            for handle, (url, _, start) in self.busy.items():
+
+                try:
+
+                    self.driver.switch_to.window(handle)
+
+                    if self.driver.execute_script(ready_script):
+
+                        return handle
+
+                except TimeoutException:
+
+                    # the tab is still busy, checked again on the next round
+                    pass
+
+                if time.monotonic() - start > self.time_to_wait:
+
+                    return handle
+
+            time.sleep(self.poll_interval)
+
+    def finish(self, handle, extract):
+
+        url, meta, start = self.busy.pop(handle)
+
+        elapsed = time.monotonic() - start
+
+        loaded = True
+
+        try:
+
+            self.driver.switch_to.window(handle)
+
+            if elapsed > self.time_to_wait:
+
+                Logger.fail('timeout::page load has been stopped :' + url)
+
+                self.driver.execute_script('window.stop();')
+
+                # a stopped navigation leaves the previous post in the tab
+                loaded = not self.driver.execute_script(stale_script)
+
+        except TimeoutException:
+
+            loaded = False
+
+        if self.latency is not None:
+
+            if elapsed > self.time_to_wait:
+
+                self.latency.failure(Urls.host(url), elapsed)
+
+            else:
+
+                self.latency.record(Urls.host(url), elapsed)
+
+        if not loaded:
+
+            Logger.fail('timeout::page has not been loaded :' + url)
+
+            self.free.append(handle)
+            self.__failed__(url, meta, 'timeout')
+
+            return
+
+        try:
+
+            extract(url, meta)
+
+        finally:
+
+            self.free.append(handle)
+
+    def __failed__(self, url, meta, reason):
+
+        if self.on_failure is not None:
+
+            self.on_failure(url, meta, reason)
+
+    def drain(self, extract):
+
+        while len(self.busy) > 0:
+
+            self.finish(self.wait(), extract)
+
+    def close(self):
+
+        for handle in self.driver.window_handles:
+
+            if handle != self.main_handle:
+
+                try:
+
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+
+                except WebDriverException:
+
+                    pass
+
+        self.driver.switch_to.window(self.main_handle)
+
+        self.free = [self.main_handle]
+        self.busy = dict()
@@ -0,0 +1,6 @@
+from api.__batch__ import *
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1 @@
+from api.__tabs__ import *
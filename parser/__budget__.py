@@ -0,0 +1,162 @@
+from typing import Union
+
+import time
+
+__all__ = ['TopicsBudget', 'Allotment']
+
+# scroll steps of a topic with a target count or a time limit, and without an explicit scroll_step
+max_scroll_steps = 100000
+
+
+class Allotment:
+
+    def __init__(self, topic, limit: int, target: int = None, time_limit: float = None, patience: int = 5):
+
+        self.topic = topic
+
+        self.limit = limit
+        self.target = target
+        self.time_limit = time_limit
+
+        self.patience = patience
+
+        self.start_time = time.monotonic()
+
+        self.steps = 0
+        self.count = 0
+        self.idle_steps = 0
+
+    @property
+    def active(self):
+
+        return self.target is not None or self.time_limit is not None
+
+    def elapsed(self):
+
+        return time.monotonic() - self.start_time
+
+    def update(self, count: int):
+
+        if count > self.count:
+
+            self.idle_steps = 0
+
+        else:
+
+            self.idle_steps += 1
+
+        self.count = count
+
+    def step(self):
+
+        # the feed has been scrolled once more
+        self.steps += 1
+
+    def reason(self):
+
+        if self.target is not None and self.count >= self.target:
+
+            return 'target count has been reached'
+
+        if self.time_limit is not None and self.elapsed() >= self.time_limit:
+
+            return 'time limit has been reached'
+
+        if self.active and self.idle_steps >= self.patience:
+
+            return 'no more posts'
+
+        return None
+
+    def done(self):
+
+        return self.reason() is not None
+
+
+class TopicsBudget:
+
+    def __init__(self, scroll_step: Union[int, list, dict] = None, target_count: Union[int, list, dict] = None,
+                 time_limit: Union[float, list, dict] = None, patience: int = 5):
+
+        """
+        Parameters
+        ----------
+        scroll_step: Union[int, list, dict]
+            maximum scroll steps, int: for all topics, list: for each topic (i), dict: for each topic name,
+            default: 1, or unbounded for the topics with a target count or a time limit
+
+        target_count: Union[int, list, dict]
+            stop scrolling a topic, once it has (target_count) posts cards
+
+        time_limit: float
+            wall-clock limit of scrolling a topic in seconds
+
+        patience: int
+            stop scrolling a topic, after (patience) steps without new posts cards
+
+        unused scroll steps, and time of the topics which stopped early, are handed to the next topics
+        which have a target count or a time limit, they spend them only while producing new posts cards
+        """
+
+        self.scroll_step = scroll_step
+        self.target_count = target_count
+        self.time_limit = time_limit
+
+        self.patience = patience
+
+        self.spare_steps = 0
+        self.spare_time = 0.0
+
+    @staticmethod
+    def resolve(value, topic, index):
+
+        if isinstance(value, dict):
+
+            return value.get(topic)
+
+        if isinstance(value, (list, tuple)):
+
+            return value[index] if index < len(value) else None
+
+        return value
+
+    def start(self, topic, index) -> Allotment:
+
+        limit = TopicsBudget.resolve(self.scroll_step, topic, index)
+        target = TopicsBudget.resolve(self.target_count, topic, index)
+        time_limit = TopicsBudget.resolve(self.time_limit, topic, index)
+
+        if limit is None:
+
+            # the budget of a topic is expressed by its target count, or its time limit alone
+            limit = max_scroll_steps if target is not None or time_limit is not None else 1
+
+        elif limit < 0:
+
+            limit = 0
+
+        # topics without a target or a time limit scroll (limit) steps, as without a budget
+        if target is not None or time_limit is not None:
+
+            limit += self.spare_steps
+
+            self.spare_steps = 0
+
+        if time_limit is not None:
+
+            time_limit += self.spare_time
+
+            self.spare_time = 0.0
+
+        return Allotment(topic, limit=limit, target=target, time_limit=time_limit, patience=self.patience)
+
+    def stop(self, allotment: Allotment):
+
+        # the unbounded steps aren't spare ones
+        if allotment.limit < max_scroll_steps:
+
+            self.spare_steps += max(0, allotment.limit - allotment.steps)
+
+        if allotment.time_limit is not None:
+
+            self.spare_time += max(0.0, allotment.time_limit - allotment.elapsed())
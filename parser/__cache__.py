@@ -0,0 +1,67 @@
+from typing import Union
+
+import time
+import threading
+
+from parser.utils import OS, Reader, Writer
+
+__all__ = ['TopicsCache']
+
+# scrapers of the same process (ex: batch workers) share the cache file
+files_lock = threading.Lock()
+
+
+class TopicsCache:
+
+    def __init__(self, filename: str = 'topics_cache.json', ttl: float = 7 * 24 * 3600):
+
+        """
+        Parameters
+        ----------
+        filename: str
+            *.json, path of the cached topics urls
+
+        ttl: float
+            cache time to live in seconds, expired cache is treated as missing
+        """
+
+        self.filename = filename
+        self.ttl = ttl
+
+    def load(self) -> Union[list, None]:
+
+        if self.filename is None or not OS.file_exists(self.filename):
+
+            return None
+
+        with files_lock:
+
+            content = Reader.json_to_dict(self.filename)
+
+        if content is None or 'topics_urls' not in content:
+
+            return None
+
+        if time.time() - content.get('update_time', 0) > self.ttl:
+
+            return None
+
+        return content['topics_urls']
+
+    def save(self, topics_urls: list):
+
+        if self.filename is None:
+
+            return None
+
+        content = {'update_time': time.time(), 'topics_urls': topics_urls}
+
+        with files_lock:
+
+            Writer.dict_to_json(json_filename=self.filename, content=content,
+                                overwrite=OS.file_exists(self.filename), indent_level=3, sort_keys=False)
+
+    @staticmethod
+    def topic_name(topic_url: str):
+
+        return topic_url.rstrip('/').split('/')[-1]
@@ -0,0 +1,275 @@
+from typing import Union, List
+
+import re
+import math
+import heapq
+import hashlib
+import itertools
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from parser.utils import Urls, Dates
+
+__all__ = ['BloomFilter', 'CrawlFrontier', 'classify_url', 'parse_date']
+
+# posts slugs end with a hex id, ex: /@author/some-title-1a2b3c4d5e6f, /p/1a2b3c4d5e6f
+post_pattern = re.compile(r'(^|-)[0-9a-f]{8,12}$')
+
+# single-segment paths of medium.com, which are not publications
+reserved_paths = {'topics', 'topic', 'tag', 'tags', 'search', 'me', 'm', 'about', 'membership', 'plans', 'creators',
+                  'policy', 'sitemap', 'signin', 'new-story', 'p', 'jobs-at-medium', 'business', 'verified-authors'}
+
+# publications hosted on their own domains
+publication_domains = {'towardsdatascience.com', 'uxdesign.cc', 'levelup.gitconnected.com', 'productcoalition.com',
+                       'heartbeat.fritz.ai', 'codeburst.io', 'becominghuman.ai', 'blog.usejournal.com',
+                       'betterprogramming.pub', 'betterhumans.pub', 'entrepreneurshandbook.co', 'psiloveyou.xyz',
+                       'writingcooperative.com', 'bootcamp.uxdesign.cc', 'javascript.plainenglish.io'}
+
+
+def parse_date(text) -> Union[datetime, None]:
+
+    """
+    the date of a link card, ex: 'Sep 14', 'Sep 14, 2020', or an iso datetime attribute
+    """
+
+    if not text:
+
+        return None
+
+    try:
+
+        return datetime.fromisoformat(text.strip().replace('Z', '+00:00')).replace(tzinfo=None)
+
+    except ValueError:
+
+        return Dates.parse(text)
+
+
+def classify_url(url, domains: set = None) -> Union[str, None]:
+
+    """
+    'post', 'author', 'publication', or None for the links, which are not followed,
+    (domains): publications domains, in addition to publication_domains
+    """
+
+    parts = urlsplit(url)
+
+    host = parts.netloc.lower().rstrip('.')
+
+    if parts.scheme not in ('http', 'https'):
+
+        return None
+
+    segments = [segment for segment in parts.path.split('/') if segment]
+
+    if host in publication_domains or host in (domains or ()):
+
+        if len(segments) == 0:
+
+            return 'publication'
+
+        if len(segments) == 1 and segments[0].startswith('@'):
+
+            return 'author'
+
+        return 'post' if post_pattern.search(segments[-1]) else None
+
+    if not (host == 'medium.com' or host.endswith('.medium.com')):
+
+        return None
+
+    if len(segments) > 0 and post_pattern.search(segments[-1]) and (len(segments) > 1 or host != 'medium.com'):
+
+        return 'post'
+
+    if len(segments) == 0 and host not in ('medium.com', 'www.medium.com', 'help.medium.com', 'policy.medium.com'):
+
+        # author subdomain, ex: https://author.medium.com
+        return 'author'
+
+    if len(segments) == 1 and segments[0].startswith('@'):
+
+        return 'author'
+
+    if len(segments) == 1 and host == 'medium.com' and segments[0] not in reserved_paths:
+
+        return 'publication'
+
+    return None
+
+
+class BloomFilter:
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.01):
+
+        """
+        a set of strings, in (capacity) * 1.2 bytes for error_rate=0.01,
+        false positives at (error_rate) up to (capacity) items, no false negatives
+        """
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.n_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * math.log(2))))
+
+        self.bits = bytearray((self.n_bits + 7) // 8)
+
+        self.count = 0
+
+    def indexes(self, key: str):
+
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+        # double hashing, k indexes from two 64-bit hashes
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def __contains__(self, key: str):
+
+        return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self.indexes(key))
+
+    def add(self, key: str):
+
+        """
+        returns False if (key) is, or is likely to be, already in the filter
+        """
+
+        added = False
+
+        for index in self.indexes(key):
+
+            mask = 1 << (index & 7)
+
+            if not self.bits[index >> 3] & mask:
+
+                self.bits[index >> 3] |= mask
+
+                added = True
+
+        self.count += added
+
+        return added
+
+
+class CrawlFrontier:
+
+    def __init__(self, topics: Union[List[str], None] = None, max_depth: int = 3, max_size: int = 100000,
+                 capacity: int = 1000000, error_rate: float = 0.01, domains: List[str] = None):
+
+        """
+        a priority queue of the urls to crawl, by topics relevance, recency and depth,
+        the seen urls are kept in a bloom filter
+
+        Parameters
+        ----------
+        topics: List[str]
+            topics names, ex: ['artificial-intelligence'], their words raise the priority of matching links
+
+        max_size: int
+            number of queued urls, the lowest priority ones are dropped above it
+
+        capacity, error_rate: see BloomFilter
+
+        domains: List[str]
+            publications domains, which are followed, in addition to medium.com and publication_domains
+        """
+
+        self.topics = topics if isinstance(topics, list) else []
+
+        self.keywords = {topic: set(topic.lower().split('-')) for topic in self.topics}
+
+        self.max_depth = max_depth
+        self.max_size = max_size
+
+        self.domains = set(domain.lower() for domain in domains or [])
+
+        self.seen = BloomFilter(capacity=capacity, error_rate=error_rate)
+
+        self.heap = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+
+        return len(self.heap)
+
+    def relevance(self, url, text=None):
+
+        if len(self.keywords) == 0:
+
+            return None, 0.0
+
+        words = set(re.split(r'[^a-z0-9]+', (url + ' ' + (text or '')).lower()))
+
+        topic, keywords = max(self.keywords.items(), key=lambda item: len(item[1] & words))
+
+        matches = len(keywords & words)
+
+        return (topic, matches / len(keywords)) if matches > 0 else (None, 0.0)
+
+    @staticmethod
+    def recency(date: Union[datetime, None]):
+
+        if date is None:
+
+            return 0.0
+
+        return math.exp(-max(0, (datetime.now() - date).days) / 365)
+
+    def score(self, kind, depth, relevance, date=None):
+
+        # listing pages expand into many posts, though posts are what is scraped
+        kind_score = {'post': 1.0, 'author': 0.6, 'publication': 0.8}[kind]
+
+        return 2.0 * relevance + CrawlFrontier.recency(date) + kind_score - 0.5 * depth
+
+    def push(self, url, depth: int = 0, text: str = None, date: datetime = None, topic: str = None):
+
+        """
+        returns True if (url) is queued, False if it is not followed, or has already been seen
+        """
+
+        if depth > self.max_depth:
+
+            return False
+
+        kind = classify_url(url, self.domains)
+
+        if kind is None:
+
+            return False
+
+        url = Urls.canonical(url)
+
+        if not self.seen.add(url):
+
+            return False
+
+        best_topic, relevance = self.relevance(url, text)
+
+        priority = -self.score(kind, depth, relevance, date)
+
+        heapq.heappush(self.heap, (priority, next(self.counter), url, kind, depth, best_topic or topic or 'crawl'))
+
+        if len(self.heap) > 2 * self.max_size:
+
+            # sorted, so still a heap
+            self.heap = heapq.nsmallest(self.max_size, self.heap)
+
+        return True
+
+    def pop(self):
+
+        """
+        returns (url, kind, depth, topic) of the highest priority url, or None
+        """
+
+        if len(self.heap) == 0:
+
+            return None
+
+        _, _, url, kind, depth, topic = heapq.heappop(self.heap)
+
+        return url, kind, depth, topic
@@ -0,0 +1,281 @@
+from typing import List, Union
+
+import numpy as np
+
+from parser.utils import OS, Urls, Logger
+
+__all__ = ['MinHashLSH']
+
+max_hash = np.uint64(2 ** 32 - 1)
+
+
+class MinHashLSH:
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 9, threshold: float = 0.8,
+                 min_shingles: int = 32, seed: int = 1, chunk_size: int = 2 ** 22):
+
+        """
+        Parameters
+        ----------
+        num_perm: int
+            minhash signature length, a power of 2
+
+        bands: int
+            banded lsh, (num_perm / bands) rows per band, candidates share at least one identical band
+
+        shingle_size: int
+            character shingles length, computed over the normalized (lower case, single spaced) text
+
+        threshold: float
+            estimated jaccard similarity, above which a candidate is a near-duplicate
+
+        min_shingles: int
+            texts with fewer shingles are neither indexed, nor checked, most of their bins would be empty
+
+        chunk_size: int
+            maximum number of characters hashed at once, bounds the memory of batch signatures
+        """
+
+        if num_perm & (num_perm - 1) != 0:
+
+            raise ValueError('num_perm should be a power of 2')
+
+        if num_perm % bands != 0:
+
+            raise ValueError('num_perm should be a multiple of bands')
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        self.bits = num_perm.bit_length() - 1
+
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.min_shingles = min_shingles
+
+        self.chunk_size = chunk_size
+
+        rng = np.random.default_rng(seed)
+
+        # multiply-shift hashing, uint64 arithmetic wraps around
+        self.a = np.uint64(rng.integers(1, 2 ** 63, dtype=np.uint64) | np.uint64(1))
+        self.b = np.uint64(rng.integers(0, 2 ** 63, dtype=np.uint64))
+
+        self.powers = np.uint32(31) ** np.arange(shingle_size - 1, -1, -1, dtype=np.uint32)
+
+        self.keys = []
+        self.signatures = np.empty((0, num_perm), dtype=np.uint32)
+
+        # key --> its index in (keys), (signatures)
+        self.indices = dict()
+
+        self.buckets = [dict() for _ in range(bands)]
+
+    @staticmethod
+    def normalize(text: str) -> bytes:
+
+        return ' '.join((text or '').lower().split()).encode('utf-8')
+
+    def signature_batch(self, texts: List[str]) -> np.ndarray:
+
+        """
+        one permutation minhash signatures of (texts), shape: (len(texts), num_perm),
+        each shingle is hashed once, the top bits select its bin, and each bin keeps its minimum,
+        bins without shingles keep the max value, and texts with less than (min_shingles) shingles
+        get a signature of max values
+        """
+
+        signatures = np.full(len(texts) * self.num_perm, max_hash, dtype=np.uint64)
+
+        encoded = [MinHashLSH.normalize(text) for text in texts]
+
+        start = 0
+
+        while start < len(texts):
+
+            # group documents, so that each group hashes at most (chunk_size) characters
+            end, size = start, 0
+
+            while end < len(texts) and (end == start or size + len(encoded[end]) <= self.chunk_size):
+
+                size += len(encoded[end])
+                end += 1
+
+            self.__hash_group__(encoded[start:end], signatures[start * self.num_perm: end * self.num_perm])
+
+            start = end
+
+        return signatures.reshape(len(texts), self.num_perm).astype(np.uint32)
+
+    def __hash_group__(self, encoded: List[bytes], signatures: np.ndarray):
+
+        lengths = np.array(list(map(len, encoded)), dtype=np.int64)
+
+        if lengths.sum() < self.shingle_size:
+
+            return None
+
+        codes = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint32)
+
+        shingles = np.lib.stride_tricks.sliding_window_view(codes, self.shingle_size) @ self.powers
+
+        # keep the windows which don't cross documents boundaries
+        documents = np.repeat(np.arange(len(encoded)), lengths)
+
+        valid = documents[:len(shingles)] == documents[self.shingle_size - 1:]
+
+        shingles = shingles[valid].astype(np.uint64)
+        documents = documents[:len(valid)][valid]
+
+        hashes = shingles * self.a + self.b
+
+        bins = (hashes >> np.uint64(64 - self.bits)).astype(np.int64)
+        values = (hashes >> np.uint64(32 - self.bits)) & max_hash
+
+        np.minimum.at(signatures, documents * self.num_perm + bins, values)
+
+        short = np.bincount(documents, minlength=len(encoded)) < self.min_shingles
+
+        signatures.reshape(len(encoded), self.num_perm)[short] = max_hash
+
+    def band_keys(self, signature: np.ndarray):
+
+        return [signature[i * self.rows: (i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def query(self, signature: np.ndarray, exclude: str = None) -> Union[str, None]:
+
+        if np.all(signature == np.uint32(max_hash)):
+
+            return None
+
+        candidates = set()
+
+        for band, key in enumerate(self.band_keys(signature)):
+
+            candidates.update(self.buckets[band].get(key, []))
+
+        # a re-scraped post, isn't a duplicate of itself
+        candidates = [index for index in candidates if self.keys[index] != exclude]
+
+        if len(candidates) == 0:
+
+            return None
+
+        candidates = np.array(candidates, dtype=np.int64)
+
+        signatures = self.signatures[candidates]
+
+        # one permutation estimate, bins which are empty in both signatures are ignored
+        empty = (signatures == np.uint32(max_hash)) & (signature[None, :] == np.uint32(max_hash))
+
+        matches = ((signatures == signature[None, :]) & ~empty).sum(axis=1)
+
+        similarity = matches / np.maximum(self.num_perm - empty.sum(axis=1), 1)
+
+        best = int(np.argmax(similarity))
+
+        if similarity[best] >= self.threshold:
+
+            return self.keys[candidates[best]]
+
+        return None
+
+    def insert(self, key, signature: np.ndarray):
+
+        index = self.indices.get(key)
+
+        if index is not None:
+
+            # a re-scraped post replaces its previous signature
+            for band, band_key in enumerate(self.band_keys(self.signatures[index])):
+
+                bucket = self.buckets[band][band_key]
+                bucket.remove(index)
+
+                if len(bucket) == 0:
+
+                    del self.buckets[band][band_key]
+
+            self.signatures[index] = signature
+
+            for band, band_key in enumerate(self.band_keys(signature)):
+
+                self.buckets[band].setdefault(band_key, []).append(index)
+
+            return None
+
+        index = len(self.keys)
+
+        self.keys.append(key)
+        self.indices[key] = index
+
+        if index >= len(self.signatures):
+
+            capacity = max(1024, 2 * len(self.signatures))
+
+            signatures = np.empty((capacity, self.num_perm), dtype=np.uint32)
+            signatures[:index] = self.signatures[:index]
+
+            self.signatures = signatures
+
+        self.signatures[index] = signature
+
+        for band, band_key in enumerate(self.band_keys(signature)):
+
+            self.buckets[band].setdefault(band_key, []).append(index)
+
+    def add_batch(self, keys: List[str], texts: List[str], insert_duplicates=False) -> List[Union[str, None]]:
+
+        """
+        returns, for each text, the key of an already indexed near-duplicate or None,
+        non-duplicates are inserted in order, so near-duplicates within the batch are detected too
+        """
+
+        duplicates = []
+
+        for key, signature in zip(keys, self.signature_batch(texts)):
+
+            key = Urls.canonical(key)
+
+            duplicate = self.query(signature, exclude=key)
+
+            if (duplicate is None or insert_duplicates) and not np.all(signature == np.uint32(max_hash)):
+
+                self.insert(key, signature)
+
+            duplicates.append(duplicate)
+
+        return duplicates
+
+    def add(self, key, text) -> Union[str, None]:
+
+        return self.add_batch([key], [text])[0]
+
+    def save(self, filename):
+
+        np.savez_compressed(filename, keys=np.array(self.keys, dtype=str),
+                            signatures=self.signatures[:len(self.keys)])
+
+    def load(self, filename):
+
+        if not OS.file_exists(filename):
+
+            return None
+
+        # the keys are strings, nothing is unpickled from (filename)
+        with np.load(filename, allow_pickle=False) as content:
+
+            try:
+
+                keys, signatures = content['keys'], content['signatures']
+
+            except ValueError as error:
+
+                Logger.warning(f'near duplicates index has not been loaded : {filename}, {error}')
+
+                return None
+
+        for key, signature in zip(keys, signatures):
+
+            self.insert(str(key), signature)
@@ -0,0 +1,186 @@
+from typing import Union
+
+from datetime import datetime
+
+import pandas as pd
+
+from parser.utils import Urls
+
+__all__ = ['enrich_metadata', 'parse_dates', 'read_minutes', 'publication_names', 'canonical_urls']
+
+relative_pattern = r'^(\d+)\s*(min|minute|hour|hr|day|week)s?\s+ago$'
+
+relative_seconds = {'min': 60, 'minute': 60, 'hour': 3600, 'hr': 3600, 'day': 86400, 'week': 604800}
+
+
+def as_text(values: pd.Series) -> pd.Series:
+
+    return values.astype('string').str.strip()
+
+
+def on_uniques(values: pd.Series, transform) -> pd.Series:
+
+    """
+    dates, read times and publications repeat a lot, so (transform) is applied once per distinct value,
+    then taken back to the rows
+    """
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+
+    transformed = transform(pd.Series(uniques, dtype=object))
+
+    # the sentinel -1 takes the appended missing value
+    transformed = pd.concat([transformed, pd.Series([None], dtype=transformed.dtype)], ignore_index=True)
+
+    return pd.Series(transformed.take(codes).to_numpy(), index=values.index, dtype=transformed.dtype)
+
+
+def parse_dates(values: pd.Series, reference: Union[datetime, None] = None) -> pd.Series:
+
+    return on_uniques(values, lambda uniques: parse_unique_dates(uniques, reference))
+
+
+def parse_unique_dates(values: pd.Series, reference: Union[datetime, None] = None) -> pd.Series:
+
+    """
+    card dates - 'Sep 14, 2020', 'September 14, 2020', '2020-09-14', 'Sep 14' (the year is inferred,
+    as in parser.utils.Dates), '3 days ago', to datetime64 days, NaT otherwise,
+    each format is parsed in bulk, over the rows which are still unparsed
+    """
+
+    reference = pd.Timestamp(reference or datetime.now())
+
+    text = as_text(values)
+
+    dates = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+
+    def unparsed():
+
+        return dates.isna() & text.notna()
+
+    for date_format in ['%b %d, %Y', '%B %d, %Y', '%Y-%m-%d']:
+
+        missing = unparsed()
+
+        if missing.any():
+
+            dates[missing] = pd.to_datetime(text[missing], format=date_format, errors='coerce')
+
+    for date_format in ['%b %d', '%B %d']:
+
+        missing = unparsed()
+
+        if not missing.any():
+
+            continue
+
+        current = pd.to_datetime(text[missing] + f' {reference.year}', format=date_format + ' %Y', errors='coerce')
+        previous = pd.to_datetime(text[missing] + f' {reference.year - 1}', format=date_format + ' %Y',
+                                  errors='coerce')
+
+        # cards of the current year omit the year, so a future date belongs to the previous one
+        dates[missing] = current.where(current.notna() & (current <= reference), previous)
+
+    missing = unparsed()
+
+    if missing.any():
+
+        lowered = text[missing].str.lower()
+
+        parts = lowered.str.extract(relative_pattern)
+
+        seconds = pd.to_numeric(parts[0], errors='coerce') * parts[1].map(relative_seconds)
+        seconds = seconds.where(~lowered.isin(['just now', 'today']), 0.0)
+        seconds = seconds.where(lowered != 'yesterday', 86400.0)
+
+        dates[missing] = reference - pd.to_timedelta(seconds, unit='s')
+
+    return dates.dt.normalize()
+
+
+def read_minutes(values: pd.Series) -> pd.Series:
+
+    """
+    '10 min read' --> 10, as a nullable integer
+    """
+
+    def transform(uniques):
+
+        minutes = as_text(uniques).str.extract(r'(\d+)\s*min', expand=False)
+
+        return pd.to_numeric(minutes, errors='coerce').astype('Int64')
+
+    return on_uniques(values, transform)
+
+
+def publication_names(values: pd.Series) -> pd.Series:
+
+    """
+    'in Towards Data Science' --> 'Towards Data Science'
+    """
+
+    def transform(uniques):
+
+        names = as_text(uniques).str.replace(r'^in\s+', '', regex=True)
+
+        return names.where(names != '')
+
+    return on_uniques(values, transform)
+
+
+def canonical_url(url):
+
+    if not isinstance(url, str):
+
+        return None
+
+    base = url.split('#', 1)[0].split('?', 1)[0]
+
+    scheme, separator, rest = base.partition('://')
+
+    if not separator:
+
+        return Urls.canonical(url)
+
+    host, slash, path = rest.partition('/')
+
+    return scheme.lower() + '://' + host.lower().rstrip('.') + ((slash + path).rstrip('/') or '/')
+
+
+def canonical_urls(values: pd.Series) -> pd.Series:
+
+    """
+    the same as parser.utils.Urls.canonical, urls are distinct, and pandas string methods loop over the rows
+    as well, so plain str splitting is used, it is several times faster than a regex extract, or urlsplit
+    """
+
+    return pd.Series([canonical_url(url) for url in values.tolist()], index=values.index, dtype='string')
+
+
+def enrich_metadata(frame: pd.DataFrame, reference: Union[datetime, None] = None) -> pd.DataFrame:
+
+    """
+    typed metadata columns, for the csv and parquet exports:
+        date: datetime64 days, read_time: minutes (Int64), publication: without the 'in ' prefix,
+        url: canonical
+    """
+
+    frame = frame.copy(deep=False)
+
+    if 'date' in frame.columns:
+
+        frame['date'] = parse_dates(frame['date'], reference=reference)
+
+    if 'read_time' in frame.columns:
+
+        frame['read_time'] = read_minutes(frame['read_time'])
+
+    if 'publication' in frame.columns:
+
+        frame['publication'] = publication_names(frame['publication'])
+
+    if 'url' in frame.columns:
+
+        frame['url'] = canonical_urls(frame['url'])
+
+    return frame
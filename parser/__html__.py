@@ -0,0 +1,417 @@
+from typing import List
+
+import os
+import re
+import gzip
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from urllib.parse import urljoin
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from parser.recording import Recording
+from parser.utils import Logger
+from parser.xpaths import article_xpath, subtitle_xpath, pub_xpath, datetime_xpath, text_xpath, figure_xpath
+
+__all__ = ['MetadataParser', 'PostParser', 'ParsePool', 'visible_text', 'parse_post_snapshot', 'parse_recorded_post']
+
+# the rendering rules of WebElement.text, see the bot.dom.getVisibleText atom of selenium
+block_tags = frozenset(['address', 'article', 'aside', 'blockquote', 'body', 'center', 'dd', 'details', 'dialog', 'dir',
+                        'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+                        'h4', 'h5', 'h6', 'header', 'hgroup', 'hr', 'html', 'legend', 'li', 'main', 'menu', 'nav',
+                        'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr',
+                        'ul'])
+hidden_tags = frozenset(['head', 'link', 'meta', 'noscript', 'script', 'style', 'template', 'title'])
+preformatted_tags = frozenset(['pre', 'textarea'])
+
+# the whitespace, which is collapsed outside of <pre>, not the non-breaking space
+whitespace_pattern = re.compile(r'[ \t\n\r\f\v]+')
+
+
+def is_hidden(node):
+
+    style = (node.get('style') or '').replace(' ', '').lower()
+
+    return node.tag in hidden_tags or node.get('hidden') is not None or 'display:none' in style \
+        or 'visibility:hidden' in style
+
+
+def append_text(lines, text, preformatted):
+
+    if not text:
+
+        return
+
+    if preformatted:
+
+        parts = text.split('\n')
+
+        lines[-1] += parts[0]
+        lines.extend(parts[1:])
+
+        return
+
+    text = whitespace_pattern.sub(' ', text)
+
+    # a space is not repeated, nor does it start a line
+    if len(lines[-1]) == 0 or lines[-1].endswith(' '):
+
+        text = text.lstrip(' ')
+
+    lines[-1] += text
+
+
+def append_lines(node, lines, preformatted=False):
+
+    if not isinstance(node.tag, str) or is_hidden(node):
+
+        return
+
+    if node.tag == 'br':
+
+        lines.append('')
+
+        return
+
+    block = node.tag in block_tags
+    preformatted = preformatted or node.tag in preformatted_tags
+
+    if block and len(lines[-1]) > 0:
+
+        lines.append('')
+
+    append_text(lines, node.text, preformatted)
+
+    for child in node:
+
+        append_lines(child, lines, preformatted)
+        append_text(lines, child.tail, preformatted)
+
+    if block and len(lines[-1]) > 0:
+
+        lines.append('')
+
+
+def visible_text(node) -> str:
+
+    """
+    the text of (node), as WebElement.text renders it - a line per block, and per <br>,
+    the whitespace collapsed outside of <pre>, the hidden elements skipped, the lines trimmed
+    """
+
+    lines = ['']
+
+    append_lines(node, lines)
+
+    lines = [line.strip(' ').replace('\xa0', ' ') for line in lines]
+
+    return '\n'.join(lines).strip('\n')
+
+
+class MetadataParser:
+
+    # compiled once per process
+    article_xpath = etree.XPath(article_xpath)
+    subtitle_xpath = etree.XPath(subtitle_xpath)
+    pub_xpath = etree.XPath(pub_xpath)
+    datetime_xpath = etree.XPath(datetime_xpath)
+
+    children_xpath = etree.XPath('child::*')
+
+    @staticmethod
+    def node_lines(node):
+
+        # the rendered lines of (node), as WebElement.text.split('\n')
+        return visible_text(node).split('\n')
+
+    def parse(self, url, page_source: str) -> dict:
+
+        """
+        the same extraction as MediumScraper.__get_metadata__, over a topic page snapshot
+        """
+
+        tree = lxml_html.fromstring(page_source)
+
+        elements_url = MetadataParser.article_xpath(tree)
+        elements_subtitle = MetadataParser.subtitle_xpath(tree)
+        elements_pub = MetadataParser.pub_xpath(tree)
+        elements_date = MetadataParser.datetime_xpath(tree)
+
+        author, publication = [], []
+
+        for pub in elements_pub:
+
+            children = MetadataParser.children_xpath(pub)
+
+            author.append(visible_text(children[0]) if len(children) > 0 else None)
+            publication.append(visible_text(children[1]) if len(children) == 2 else None)
+
+        dates = [MetadataParser.node_lines(node) for node in elements_date]
+
+        return {'title': [visible_text(node) for node in elements_url],
+                'subtitle': [visible_text(node) for node in elements_subtitle],
+                'publication': publication,
+                'url': [urljoin(url, node.get('href')) for node in elements_url],
+                'author': author,
+                'date': [lines[0] for lines in dates],
+                'read_time': [lines[-1] for lines in dates]}
+
+
+class PostParser:
+
+    # compiled once per process
+    text_xpath = etree.XPath(text_xpath)
+    figure_xpath = etree.XPath(figure_xpath)
+
+    children_xpath = etree.XPath('child::*')
+    img_xpath = etree.XPath('.//img')
+
+    def __init__(self, post_image_indicator: str, limited_access_indicator: List[str]):
+
+        self.post_image_indicator = post_image_indicator
+        self.limited_access_indicator = limited_access_indicator
+
+    @staticmethod
+    def node_text(node):
+
+        return visible_text(node)
+
+    @staticmethod
+    def section_reformat(text):
+
+        return '[' + text + ']'
+
+    @staticmethod
+    def child_reformat(text):
+
+        return '<' + text + '>'
+
+    def get_text(self, p_nodes):
+
+        text = ''
+
+        for node in p_nodes:
+
+            text += PostParser.section_reformat(PostParser.node_text(node))
+
+            for child in PostParser.children_xpath(node):
+
+                txt = PostParser.node_text(child)
+
+                if len(txt) > 3:
+
+                    text += PostParser.child_reformat(txt)
+
+                else:
+
+                    text += txt
+
+        return text
+
+    def get_caption(self, node):
+
+        caption = ''
+
+        for child in PostParser.children_xpath(node):
+
+            caption += PostParser.child_reformat(PostParser.node_text(child))
+
+        return caption
+
+    def get_figure(self, figure_nodes):
+
+        img_src, img_caption = [], []
+
+        for node in figure_nodes:
+
+            children = PostParser.children_xpath(node)
+
+            if len(children) == 0:
+
+                continue
+
+            img_nodes = PostParser.img_xpath(children[0])
+
+            if len(img_nodes) == 0 or img_nodes[0].get('alt') != self.post_image_indicator:
+
+                continue
+
+            img_src.append(img_nodes[0].get('src'))
+            img_caption.append(self.get_caption(children[1]) if len(children) == 2 else None)
+
+        return img_src, img_caption
+
+    def limited_access(self, tree):
+
+        # as limited_access_script, the indicators found in document.body.textContent, the entities decoded
+        body = tree.find('.//body') if tree.tag != 'body' else tree
+        text = (body if body is not None else tree).text_content()
+
+        return [indicator for indicator in self.limited_access_indicator if indicator in text]
+
+    def parse(self, url, page_source: str) -> dict:
+
+        """
+        the same extraction as MediumScraper.__get_post_content__, over a page snapshot
+        """
+
+        try:
+
+            tree = lxml_html.fromstring(page_source)
+
+        except etree.ParserError as error:
+
+            # lxml errors can not be sent back from the parsing processes
+            raise ValueError(str(error)) from None
+
+        text = self.get_text(PostParser.text_xpath(tree))
+        img_src, img_caption = self.get_figure(PostParser.figure_xpath(tree))
+
+        indicators = self.limited_access(tree)
+
+        return {'url': url,
+                'text': text,
+                'img_src': img_src,
+                'caption': img_caption,
+                'limited_access': len(indicators) > 0,
+                'limited_access_indicators': indicators}
+
+
+def read_snapshot(path):
+
+    opener = gzip.open if path.endswith('.gz') else open
+
+    with opener(path, 'rt', encoding='utf-8') as buffer:
+
+        return buffer.read()
+
+
+def parse_post_snapshot(url, snapshot: str, post_image_indicator: str, limited_access_indicator: List[str]):
+
+    """
+    process pool entry point, (snapshot) is either the page source, or the path of a saved page source
+    """
+
+    if not snapshot.lstrip().startswith('<') and os.path.isfile(snapshot):
+
+        snapshot = read_snapshot(snapshot)
+
+    parser = PostParser(post_image_indicator=post_image_indicator, limited_access_indicator=limited_access_indicator)
+
+    return parser.parse(url, snapshot)
+
+
+class ParsePool:
+
+    def __init__(self, post_image_indicator: str, limited_access_indicator: List[str], max_workers: int = None,
+                 max_pending: int = None, snapshots_dir: str = None):
+
+        """
+        Parameters
+        ----------
+        max_workers: int
+            number of parsing processes, default: os.cpu_count()
+
+        max_pending: int
+            maximum number of snapshots waiting to be parsed, submit(...) blocks on the oldest one above it,
+            default: 4 * max_workers
+
+        snapshots_dir: str
+            if set, snapshots are saved as gzip files, and the workers read them from disk,
+            otherwise the page source is sent to the workers directly
+        """
+
+        self.post_image_indicator = post_image_indicator
+        self.limited_access_indicator = limited_access_indicator
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.max_workers
+
+        self.snapshots_dir = snapshots_dir
+
+        if snapshots_dir is not None:
+
+            os.makedirs(snapshots_dir, exist_ok=True)
+
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        # (future, url, meta), in submission order
+        self.pending = deque()
+
+    def save_snapshot(self, url, page_source):
+
+        filename = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html.gz'
+        path = os.path.join(self.snapshots_dir, filename)
+
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=1) as buffer_writer:
+
+            buffer_writer.write(page_source)
+
+        return path
+
+    def submit(self, url, page_source: str, meta: dict = None):
+
+        """
+        returns the parsed posts, which are ready, in submission order - [(post, meta), ...],
+        post is None, if the page has not been parsed
+        """
+
+        snapshot = page_source if self.snapshots_dir is None else self.save_snapshot(url, page_source)
+
+        future = self.executor.submit(parse_post_snapshot, url, snapshot,
+                                      self.post_image_indicator, self.limited_access_indicator)
+
+        self.pending.append((future, url, meta))
+
+        ready = []
+
+        while len(self.pending) > 0 and (self.pending[0][0].done() or len(self.pending) > self.max_pending):
+
+            future, url, meta = self.pending.popleft()
+
+            ready.append((ParsePool.result(future, url), meta))
+
+        return ready
+
+    def drain(self):
+
+        while len(self.pending) > 0:
+
+            future, url, meta = self.pending.popleft()
+
+            yield ParsePool.result(future, url), meta
+
+    @staticmethod
+    def result(future, url):
+
+        # a page which fails to be parsed, ex: an empty page source, is skipped, not the whole run
+        try:
+
+            return future.result()
+
+        except Exception as error:
+
+            Logger.fail(f'post has not been parsed : {url}, {type(error).__name__}: {error}')
+
+            return None
+
+    def close(self):
+
+        self.executor.shutdown(wait=True)
+
+
+def parse_recorded_post(data_filename, offset, length, url, post_image_indicator: str,
+                        limited_access_indicator: List[str]):
+
+    """
+    process pool entry point, parse a post page, recorded by parser.recording.Recorder
+    """
+
+    page_source = Recording.read_entry(data_filename, offset, length)
+
+    parser = PostParser(post_image_indicator=post_image_indicator, limited_access_indicator=limited_access_indicator)
+
+    return parser.parse(url, page_source)
@@ -0,0 +1,217 @@
+from typing import List
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from urllib.parse import urlsplit
+
+import requests
+
+from parser.utils import Logger, OS, Reader
+
+__all__ = ['ImageStore']
+
+content_type_extensions = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/gif': '.gif',
+                           'image/webp': '.webp', 'image/svg+xml': '.svg'}
+
+
+class ImageStore:
+
+    # the index files may be shared by the stores of several scrapers, ex: batch workers
+    files_lock = threading.Lock()
+
+    def __init__(self, root_dir: str = 'images', max_workers: int = 8, timeout: float = 30.0, shard_depth: int = 2,
+                 chunk_size: int = 64 * 1024):
+
+        """
+        Parameters
+        ----------
+        root_dir: str
+            content-addressed store, each image is written to - root_dir/ab/cd/<sha256><ext>
+
+        max_workers: int
+            bounded thread pool size, each thread reuses its own http session
+
+        timeout: float
+            request timeout in seconds
+
+        shard_depth: int
+            number of 2-hex-chars directories levels
+        """
+
+        self.root_dir = root_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.shard_depth = shard_depth
+        self.chunk_size = chunk_size
+
+        self.index_filename = os.path.join(root_dir, 'index.json')
+
+        # url --> local path
+        self.index = dict()
+
+        # url --> future, for the urls which are being downloaded
+        self.pending = dict()
+
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+        os.makedirs(root_dir, exist_ok=True)
+
+        if OS.file_exists(self.index_filename):
+
+            self.index = Reader.json_to_dict(self.index_filename) or dict()
+
+    def session(self):
+
+        if not hasattr(self.local, 'session'):
+
+            session = requests.Session()
+
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+            self.local.session = session
+
+        return self.local.session
+
+    def shard_path(self, digest, extension):
+
+        shards = [digest[2 * i: 2 * i + 2] for i in range(self.shard_depth)]
+
+        return os.path.join(self.root_dir, *shards, digest + extension)
+
+    def download(self, url):
+
+        response = self.session().get(url, stream=True, timeout=self.timeout)
+
+        if response.status_code != 200:
+
+            Logger.warning(f'ImageStore: {response.status_code}, {url}')
+
+            response.close()
+
+            return None
+
+        extension = os.path.splitext(urlsplit(url).path)[1].lower()
+
+        if extension == '' or len(extension) > 5:
+
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+            extension = content_type_extensions.get(content_type, '')
+
+        sha256 = hashlib.sha256()
+
+        # unique, as the thread idents of several processes sharing (root_dir) are not
+        descriptor, temp_path = tempfile.mkstemp(suffix='.part', dir=self.root_dir)
+
+        with os.fdopen(descriptor, 'wb') as buffer_writer:
+
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+
+                sha256.update(chunk)
+                buffer_writer.write(chunk)
+
+        path = self.shard_path(sha256.hexdigest(), extension)
+
+        if OS.file_exists(path):
+
+            # same content under another url
+            os.remove(temp_path)
+
+        else:
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+
+        return path
+
+    def fetch(self, url):
+
+        try:
+
+            path = self.download(url)
+
+        except (requests.RequestException, OSError) as error:
+
+            Logger.warning(f'ImageStore: {error}, {url}')
+
+            path = None
+
+        with self.lock:
+
+            if path is not None:
+
+                self.index[url] = path
+
+            self.pending.pop(url, None)
+
+        return path
+
+    def submit(self, executor: ThreadPoolExecutor, url):
+
+        with self.lock:
+
+            if url in self.index:
+
+                return None
+
+            if url not in self.pending:
+
+                self.pending[url] = executor.submit(self.fetch, url)
+
+    def local_path(self, url):
+
+        if url is None:
+
+            return None
+
+        return self.index.get(url)
+
+    def store(self, img_src: List[List[str]]) -> List[List[str]]:
+
+        """
+        download all images of (img_src) - [[src, ...], ...] per post, returns the local paths with the same layout,
+        a post without images - None, stays None
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            for sources in img_src:
+
+                for url in sources or []:
+
+                    if url is not None:
+
+                        self.submit(executor, url)
+
+        self.save()
+
+        return [None if sources is None else [self.local_path(url) for url in sources] for sources in img_src]
+
+    def save(self):
+
+        with ImageStore.files_lock:
+
+            # keep the images which have been saved by others, since this index has been loaded
+            if OS.file_exists(self.index_filename):
+
+                content = Reader.json_to_dict(self.index_filename) or dict()
+
+                with self.lock:
+
+                    self.index = dict(content, **self.index)
+
+            descriptor, temp_filename = tempfile.mkstemp(prefix='.index.', suffix='.tmp', dir=self.root_dir)
+
+            with os.fdopen(descriptor, 'w') as buffer_writer:
+
+                json.dump(self.index, buffer_writer)
+
+            os.replace(temp_filename, self.index_filename)
@@ -0,0 +1,169 @@
+from typing import Union
+
+import math
+import time
+
+__all__ = ['LatencyTracker']
+
+
+class HostLatency:
+
+    def __init__(self, n_buckets):
+
+        self.buckets = [0] * n_buckets
+        self.count = 0
+
+        self.consecutive_failures = 0
+        self.last_failure = None
+
+
+class LatencyTracker:
+
+    def __init__(self, percentile: float = 0.95, margin: float = 2.0, min_timeout: float = 5.0,
+                 max_timeout: float = 60.0, min_samples: int = 5, down_after: int = 3, down_cooldown: float = 300.0,
+                 min_latency: float = 0.1, n_buckets: int = 48):
+
+        """
+        Parameters
+        ----------
+        percentile: float
+            page load timeout of a host = latency percentile * 1.5 + margin, clipped to [min_timeout, max_timeout]
+
+        margin: float
+            seconds, added to the percentile
+
+        min_samples: int
+            number of page loads of a host, before its timeout is adapted
+
+        down_after: int
+            a host is down after (down_after) consecutive failed page loads,
+            its pages are given up without loading, until (down_cooldown) seconds have passed
+
+        min_latency: float
+            seconds, the first histogram bucket, buckets are log-spaced up to max_timeout
+        """
+
+        self.percentile = percentile
+        self.margin = margin
+
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+
+        self.min_samples = min_samples
+
+        self.down_after = down_after
+        self.down_cooldown = down_cooldown
+
+        self.min_latency = min_latency
+        self.n_buckets = n_buckets
+
+        self.ratio = (max_timeout / min_latency) ** (1.0 / (n_buckets - 1))
+
+        self.hosts = dict()
+
+    def host(self, host) -> HostLatency:
+
+        if host not in self.hosts:
+
+            self.hosts[host] = HostLatency(self.n_buckets)
+
+        return self.hosts[host]
+
+    def bucket(self, seconds):
+
+        if seconds <= self.min_latency:
+
+            return 0
+
+        return min(self.n_buckets - 1, int(math.ceil(math.log(seconds / self.min_latency, self.ratio))))
+
+    def bucket_bound(self, index):
+
+        return self.min_latency * self.ratio ** index
+
+    def record(self, host, seconds):
+
+        latency = self.host(host)
+
+        latency.buckets[self.bucket(seconds)] += 1
+        latency.count += 1
+
+        latency.consecutive_failures = 0
+
+    def failure(self, host, seconds: float = None):
+
+        latency = self.host(host)
+
+        # a timed out load took at least (seconds)
+        if seconds is not None:
+
+            latency.buckets[self.bucket(seconds)] += 1
+            latency.count += 1
+
+        latency.consecutive_failures += 1
+        latency.last_failure = time.monotonic()
+
+    def quantile(self, host) -> Union[float, None]:
+
+        latency = self.hosts.get(host)
+
+        if latency is None or latency.count == 0:
+
+            return None
+
+        rank = self.percentile * latency.count
+
+        cumulative = 0
+
+        for index, count in enumerate(latency.buckets):
+
+            cumulative += count
+
+            if cumulative >= rank:
+
+                return self.bucket_bound(index)
+
+        return self.bucket_bound(self.n_buckets - 1)
+
+    def timeout(self, host, default: float):
+
+        latency = self.hosts.get(host)
+
+        if latency is None or latency.count < self.min_samples:
+
+            return default
+
+        timeout = 1.5 * self.quantile(host) + self.margin
+
+        return max(self.min_timeout, min(self.max_timeout, timeout))
+
+    def down_for(self, host):
+
+        """
+        seconds until a page of (host) is loaded again, 0 if the host isn't down
+        """
+
+        latency = self.hosts.get(host)
+
+        if latency is None or latency.consecutive_failures < self.down_after:
+
+            return 0.0
+
+        return max(0.0, self.down_cooldown - (time.monotonic() - latency.last_failure))
+
+    def is_down(self, host):
+
+        latency = self.hosts.get(host)
+
+        if latency is None or latency.consecutive_failures < self.down_after:
+
+            return False
+
+        # half-open, after the cooldown one page load is allowed, to probe the host
+        if time.monotonic() - latency.last_failure >= self.down_cooldown:
+
+            latency.consecutive_failures = self.down_after - 1
+
+            return False
+
+        return True
@@ -0,0 +1,156 @@
+from typing import Union
+
+import os
+
+__all__ = ['DriverLifecycle']
+
+
+class DriverLifecycle:
+
+    def __init__(self, max_pages: int = None, max_rss: float = None, max_failures: int = 3, rss_check_every: int = 25):
+
+        """
+        Parameters
+        ----------
+        max_pages: int
+            recycle the browser after (max_pages) page loads, None: never
+
+        max_rss: float
+            recycle the browser once the resident memory of the driver and browser processes exceeds (max_rss) MB,
+            None: never
+
+        max_failures: int
+            recycle the browser after (max_failures) consecutive failed page loads, None: never
+
+        rss_check_every: int
+            measure the resident memory every (rss_check_every) page loads
+        """
+
+        self.max_pages = max_pages
+        self.max_rss = max_rss
+        self.max_failures = max_failures
+        self.rss_check_every = rss_check_every
+
+        self.pages = 0
+        self.failures = 0
+
+        self.recycled = 0
+
+    def reset(self):
+
+        self.pages = 0
+        self.failures = 0
+
+    def succeeded(self):
+
+        self.pages += 1
+        self.failures = 0
+
+    def failed(self):
+
+        self.pages += 1
+        self.failures += 1
+
+    def reason(self, pid: int = None) -> Union[str, None]:
+
+        if self.max_failures is not None and self.failures >= self.max_failures:
+
+            return f'{self.failures} consecutive failures'
+
+        if self.max_pages is not None and self.pages >= self.max_pages:
+
+            return f'{self.pages} pages'
+
+        if self.max_rss is not None and pid is not None and self.pages > 0 \
+                and self.pages % self.rss_check_every == 0:
+
+            rss = DriverLifecycle.tree_rss(pid)
+
+            if rss >= self.max_rss:
+
+                return f'{rss:.0f} MB rss'
+
+        return None
+
+    @staticmethod
+    def tree_rss(pid: int) -> float:
+
+        """
+        resident memory in MB of (pid) and all of its descendants (the driver, and the browser processes)
+        """
+
+        try:
+
+            import psutil
+
+        except ImportError:
+
+            return DriverLifecycle.proc_tree_rss(pid)
+
+        try:
+
+            process = psutil.Process(pid)
+
+            processes = [process] + process.children(recursive=True)
+
+        except psutil.Error:
+
+            return 0.0
+
+        rss = 0
+
+        for process in processes:
+
+            try:
+
+                rss += process.memory_info().rss
+
+            except psutil.Error:
+
+                continue
+
+        return rss / 1024 ** 2
+
+    @staticmethod
+    def proc_tree_rss(pid: int) -> float:
+
+        if not os.path.isdir('/proc'):
+
+            return 0.0
+
+        children = dict()
+        rss = dict()
+
+        for entry in os.listdir('/proc'):
+
+            if not entry.isdigit():
+
+                continue
+
+            try:
+
+                with open(f'/proc/{entry}/status', 'r') as buffer:
+
+                    status = dict(line.split(':', 1) for line in buffer if ':' in line)
+
+            except OSError:
+
+                continue
+
+            ppid = int(status.get('PPid', '0').strip())
+
+            children.setdefault(ppid, []).append(int(entry))
+
+            rss[int(entry)] = int(status.get('VmRSS', '0 kB').split()[0])
+
+        total, stack = 0, [pid]
+
+        while len(stack) > 0:
+
+            current = stack.pop()
+
+            total += rss.get(current, 0)
+
+            stack += children.get(current, [])
+
+        return total / 1024
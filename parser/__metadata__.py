@@ -0,0 +1,294 @@
+from typing import Union, Iterator, Tuple
+
+import os
+import csv
+import json
+import mmap
+import codecs
+from itertools import zip_longest, chain, repeat
+
+from parser.utils import Logger, OS, Files
+
+__all__ = ['MetadataReader']
+
+whitespace = ' \t\n\r'
+
+
+class JsonStream:
+
+    def __init__(self, source, chunk_size: int = 1 << 22):
+
+        """
+        incremental decoding of a json object, one top-level value at a time, from a binary (source)
+        """
+
+        self.source = source
+        self.chunk_size = chunk_size
+
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self, size):
+
+        if self.eof:
+
+            return False
+
+        chunk = self.source.read(size)
+
+        self.eof = len(chunk) == 0
+
+        # the consumed part is dropped, so the buffer holds one topic at most
+        self.buffer = self.buffer[self.position:] + self.text_decoder.decode(chunk, final=self.eof)
+        self.position = 0
+
+        return not self.eof
+
+    def peek(self):
+
+        while True:
+
+            while self.position < len(self.buffer) and self.buffer[self.position] in whitespace:
+
+                self.position += 1
+
+            if self.position < len(self.buffer):
+
+                return self.buffer[self.position]
+
+            if not self.fill(self.chunk_size):
+
+                return None
+
+    def expect(self, chars):
+
+        char = self.peek()
+
+        if char is None or char not in chars:
+
+            raise ValueError(f'invalid metadata json, expected one of {chars!r}, found {char!r}')
+
+        self.position += 1
+
+        return char
+
+    def value(self):
+
+        self.peek()
+
+        size = self.chunk_size
+
+        while True:
+
+            try:
+
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+
+                # a value at the end of the buffer, could be cut, unless the file has ended
+                if end < len(self.buffer) or self.eof:
+
+                    self.position = end
+
+                    return value
+
+            except json.JSONDecodeError:
+
+                if self.eof:
+
+                    raise
+
+            self.fill(size)
+
+            size *= 2
+
+    def items(self):
+
+        self.expect('{')
+
+        if self.peek() == '}':
+
+            return
+
+        while True:
+
+            key = self.value()
+
+            self.expect(':')
+
+            yield key, self.value()
+
+            if self.expect(',}') == '}':
+
+                return
+
+
+class MetadataReader:
+
+    def __init__(self, filename: str, use_mmap: bool = False, default_topic: str = 'default'):
+
+        """
+        streams posts metadata from {topic: {column: [...]}} json, jsonl or csv (a topic column per row),
+        yields (topic, url, fields), without loading the file
+
+        Parameters
+        ----------
+        use_mmap: bool
+            read the file through a memory map
+
+        default_topic: str
+            the topic of jsonl, csv rows without a topic
+
+        compressed files - gzip, xz, zstd, are detected by their first bytes, and are not memory-mapped
+        """
+
+        self.filename = filename
+        self.use_mmap = use_mmap
+        self.default_topic = default_topic
+
+        self.format = Files.extension(filename).lstrip('.')
+
+        if self.format not in ('json', 'jsonl', 'csv'):
+
+            raise ValueError(f'unknown metadata format: {self.format}, expected json, jsonl or csv')
+
+        self.index_filename = filename + '.idx.json'
+
+    def open(self):
+
+        buffer = Files.open(self.filename, 'rb')
+
+        if not self.use_mmap or os.path.getsize(self.filename) == 0 or Files.compression(self.filename, detect=True):
+
+            return buffer, buffer
+
+        return buffer, mmap.mmap(buffer.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def lines(source):
+
+        for line in iter(source.readline, b''):
+
+            yield line.decode('utf-8')
+
+    def iter_topics(self, source) -> Iterator[Tuple[str, str, dict]]:
+
+        for topic, columns in JsonStream(source).items():
+
+            others = [name for name in columns.keys() if name != 'url']
+
+            # shorter columns are padded with None
+            rows = chain(zip_longest(*[columns[name] for name in others]), repeat((None,) * len(others)))
+
+            for url, values in zip(columns.get('url', []), rows):
+
+                yield topic, url, dict(zip(others, values))
+
+    def iter_jsonl(self, source):
+
+        for line in MetadataReader.lines(source):
+
+            if line.strip() == '':
+
+                continue
+
+            row = json.loads(line)
+
+            yield row.pop('topic', None) or self.default_topic, row.pop('url', None), row
+
+    def iter_csv(self, source):
+
+        for row in csv.DictReader(MetadataReader.lines(source)):
+
+            row = {name: value if value != '' else None for name, value in row.items()}
+
+            yield row.pop('topic', None) or self.default_topic, row.pop('url', None), row
+
+    def iter_rows(self) -> Iterator[Tuple[str, str, dict]]:
+
+        """
+        yields (topic, url, fields), the index of counts is written once the file has been read to its end
+        """
+
+        iterators = {'json': self.iter_topics, 'jsonl': self.iter_jsonl, 'csv': self.iter_csv}
+
+        counts = dict()
+
+        buffer, source = self.open()
+
+        try:
+
+            for topic, url, fields in iterators[self.format](source):
+
+                if not url:
+
+                    continue
+
+                counts[topic] = counts.get(topic, 0) + 1
+
+                yield topic, url, fields
+
+        finally:
+
+            if source is not buffer:
+
+                source.close()
+
+            buffer.close()
+
+        self.write_index(counts)
+
+    def stat(self):
+
+        stat = os.stat(self.filename)
+
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def write_index(self, counts: dict):
+
+        # the index is a cache, ex: a read-only directory of the metadata is not an error
+        try:
+
+            with open(self.index_filename, 'w') as buffer_writer:
+
+                json.dump(dict(self.stat(), topics=counts), buffer_writer)
+
+        except OSError as error:
+
+            Logger.warning(f'the metadata index has not been written : {self.index_filename}, {error}')
+
+    def topics_counts(self, build: bool = False) -> Union[dict, None]:
+
+        """
+        {topic: number of posts}, from the index, if it matches the file,
+        otherwise None, or the counts of a full pass, if (build)
+        """
+
+        if OS.file_exists(self.index_filename):
+
+            with open(self.index_filename, 'r') as buffer:
+
+                index = json.load(buffer)
+
+            if index.get('size') == self.stat()['size'] and index.get('mtime') == self.stat()['mtime']:
+
+                return index['topics']
+
+        if not build:
+
+            return None
+
+        for _ in self.iter_rows():
+
+            pass
+
+        return self.topics_counts(build=False)
+
+    def count(self, build: bool = True) -> Union[int, None]:
+
+        counts = self.topics_counts(build=build)
+
+        return None if counts is None else sum(counts.values())
@@ -0,0 +1,239 @@
+from typing import Union, List
+
+import re
+import json
+import math
+import base64
+from datetime import datetime, timezone
+
+__all__ = ['FeedCapture', 'parse_posts']
+
+feed_url_pattern = re.compile(r'/_/(graphql|api/)')
+
+# the posts of a topic feed are under its connection, ex: topic.latestPosts.postPreviews[].post,
+# the ones of the sidebar, or of the recommendations are not
+feed_key_pattern = re.compile(r'(?i)feed|latestPosts|latestStories')
+excluded_key_pattern = re.compile(r'(?i)recommend|related|popular|sidebar|trending|curated|staffPicks')
+
+# legacy json responses are prefixed against json hijacking
+json_prefix = '])}while(1);</x>'
+
+columns_names = ['title', 'subtitle', 'publication', 'url', 'author', 'date', 'read_time']
+
+
+def resolve(value, refs: dict = None):
+
+    # apollo state is normalized, nested objects are {'__ref': 'User:id'}
+    if refs is not None and isinstance(value, dict) and '__ref' in value:
+
+        return refs.get(value['__ref'], value)
+
+    return value
+
+
+def field(node, path: str, refs: dict = None):
+
+    for key in path.split('.'):
+
+        node = resolve(node, refs)
+
+        if not isinstance(node, dict):
+
+            return None
+
+        node = node.get(key)
+
+    return resolve(node, refs)
+
+
+def post_row(node: dict, refs: dict = None) -> Union[dict, None]:
+
+    url = node.get('mediumUrl')
+
+    if not url:
+
+        return None
+
+    published_at = node.get('firstPublishedAt') or node.get('latestPublishedAt')
+    reading_time = node.get('readingTime')
+
+    date, read_time = None, None
+
+    if isinstance(published_at, (int, float)):
+
+        date = datetime.fromtimestamp(published_at / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+    if isinstance(reading_time, (int, float)):
+
+        read_time = f'{max(1, math.ceil(reading_time))} min read'
+
+    subtitle = field(node, 'extendedPreviewContent.subtitle', refs) or field(node, 'previewContent.subtitle', refs)
+
+    return {'title': node.get('title'),
+            'subtitle': subtitle,
+            'publication': field(node, 'collection.name', refs),
+            'url': url,
+            'author': field(node, 'creator.name', refs),
+            'date': date,
+            'read_time': read_time}
+
+
+def parse_posts(payload, refs: dict = None, feed_keys=feed_key_pattern,
+                excluded_keys=excluded_key_pattern) -> List[dict]:
+
+    """
+    walks a feed response, or an apollo state (refs=payload), returns the metadata rows of the Post objects,
+    which are under a key matching (feed_keys), and not under a key matching (excluded_keys)
+    """
+
+    rows, stack = [], [(payload, False)]
+
+    visited = set()
+
+    while len(stack) > 0:
+
+        node, in_feed = stack.pop()
+
+        if isinstance(node, list):
+
+            stack.extend((item, in_feed) for item in reversed(node))
+
+        elif isinstance(node, dict):
+
+            if in_feed and refs is not None and '__ref' in node:
+
+                # each normalized object is walked once
+                if node['__ref'] in visited:
+
+                    continue
+
+                visited.add(node['__ref'])
+
+                node = resolve(node, refs)
+
+            if in_feed and node.get('__typename') == 'Post':
+
+                row = post_row(node, refs)
+
+                if row is not None:
+
+                    rows.append(row)
+
+                    continue
+
+            stack.extend((value, in_feed or bool(feed_keys.search(key))) for key, value in reversed(node.items())
+                         if not excluded_keys.search(key))
+
+    return rows
+
+
+class FeedCapture:
+
+    def __init__(self, url_pattern=feed_url_pattern):
+
+        """
+        collects the posts of feed responses, from chrome performance log entries (goog:loggingPrefs),
+        the bodies are fetched by the caller (Network.getResponseBody), see self.pending()
+        """
+
+        self.url_pattern = url_pattern
+
+        self.requests = dict()
+        self.ready = []
+
+        self.rows = dict()
+
+    def reset(self):
+
+        self.requests = dict()
+        self.ready = []
+
+        self.rows = dict()
+
+    def feed(self, entries: List[dict]):
+
+        for entry in entries:
+
+            message = json.loads(entry['message'])['message']
+
+            method, params = message.get('method'), message.get('params', dict())
+
+            if method == 'Network.responseReceived':
+
+                response = params.get('response', dict())
+
+                if self.url_pattern.search(response.get('url', '')) and 'json' in response.get('mimeType', ''):
+
+                    self.requests[params['requestId']] = response['url']
+
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.requests:
+
+                self.ready.append(params['requestId'])
+
+    def pending(self):
+
+        """
+        request ids of the finished feed responses, whose bodies are to be added
+        """
+
+        ready, self.ready = self.ready, []
+
+        for request_id in ready:
+
+            self.requests.pop(request_id, None)
+
+        return ready
+
+    def add_body(self, body: str, base64_encoded: bool = False):
+
+        if base64_encoded:
+
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+
+        if body.startswith(json_prefix):
+
+            body = body[len(json_prefix):]
+
+        try:
+
+            payload = json.loads(body)
+
+        except ValueError:
+
+            return 0
+
+        return self.add_rows(parse_posts(payload))
+
+    def add_state(self, state: dict):
+
+        if not state:
+
+            return 0
+
+        return self.add_rows(parse_posts(list(state.values()), refs=state))
+
+    def add_rows(self, rows: List[dict]):
+
+        count = len(self.rows)
+
+        for row in rows:
+
+            self.rows.setdefault(row['url'], row)
+
+        return len(self.rows) - count
+
+    def count(self):
+
+        return len(self.rows)
+
+    def columns(self):
+
+        columns = {name: [] for name in columns_names}
+
+        for row in self.rows.values():
+
+            for name in columns_names:
+
+                columns[name].append(row[name])
+
+        return columns
@@ -0,0 +1,157 @@
+from typing import Union
+
+import os
+import shutil
+
+from parser.utils import Logger
+
+__all__ = ['BrowserProfile', 'dir_size']
+
+# disposable parts of a profile, removed first once the profile exceeds its size cap
+cache_dirs = {'chrome': ['Default/Cache', 'Default/Code Cache', 'Default/GPUCache',
+                         'Default/Service Worker/CacheStorage', 'ShaderCache', 'GrShaderCache'],
+              'firefox': ['cache2', 'startupCache', 'shader-cache']}
+
+# left behind by a browser, which has not been closed cleanly
+lock_files = {'chrome': ['SingletonLock', 'SingletonSocket', 'SingletonCookie'],
+              'firefox': ['lock', '.parentlock', 'parent.lock']}
+
+
+def dir_size(path):
+
+    size = 0
+
+    for root, _, files in os.walk(path):
+
+        for filename in files:
+
+            try:
+
+                size += os.lstat(os.path.join(root, filename)).st_size
+
+            except OSError:
+
+                continue
+
+    return size
+
+
+class BrowserProfile:
+
+    def __init__(self, root_dir: str = 'profiles', browser: str = 'chrome', max_size: float = 1024,
+                 template: Union[str, None] = None):
+
+        """
+        Parameters
+        ----------
+        root_dir: str
+            profiles are kept in {root_dir}/{browser}/{name}
+
+        max_size: float
+            size cap of a profile in MB, above it, its caches are removed, then the whole profile,
+            if it is still above the cap
+
+        template: str
+            a pre-warmed profile directory, copied into missing profiles, see self.save_template(...)
+        """
+
+        self.root_dir = root_dir
+        self.browser = browser
+
+        self.max_size = max_size
+        self.template = template
+
+    def path(self, name='default'):
+
+        return os.path.abspath(os.path.join(self.root_dir, self.browser, name))
+
+    def acquire(self, name='default'):
+
+        """
+        returns the path of profile (name), cloned from the template if it does not exist yet,
+        a profile is used by a single browser at a time
+        """
+
+        path = self.path(name)
+
+        if os.path.isdir(path):
+
+            self.remove_locks(path)
+            self.cleanup(path)
+
+        if not os.path.isdir(path):
+
+            if self.template is not None and os.path.isdir(self.template):
+
+                shutil.copytree(self.template, path, symlinks=True, ignore=self.ignore_locks)
+
+            else:
+
+                os.makedirs(path, exist_ok=True)
+
+        return path
+
+    def ignore_locks(self, _, names):
+
+        return [name for name in names if name in lock_files.get(self.browser, [])]
+
+    def remove_locks(self, path):
+
+        for filename in lock_files.get(self.browser, []):
+
+            lock_path = os.path.join(path, filename)
+
+            if os.path.lexists(lock_path):
+
+                os.remove(lock_path)
+
+    def cleanup(self, path):
+
+        if self.max_size is None:
+
+            return
+
+        max_size = self.max_size * 1024 ** 2
+
+        size = dir_size(path)
+
+        if size <= max_size:
+
+            return
+
+        caches = [os.path.join(path, cache_dir) for cache_dir in cache_dirs.get(self.browser, [])]
+        caches = sorted([cache for cache in caches if os.path.isdir(cache)], key=os.path.getmtime)
+
+        for cache in caches:
+
+            size -= dir_size(cache)
+
+            shutil.rmtree(cache, ignore_errors=True)
+
+            if size <= max_size:
+
+                Logger.info(f'profile caches have been cleaned : {path}')
+
+                return
+
+        Logger.warning(f'profile exceeds {self.max_size} MB, and has been removed : {path}')
+
+        shutil.rmtree(path, ignore_errors=True)
+
+    def save_template(self, name='default'):
+
+        """
+        copies profile (name), after a warm-up run, into the template directory, replacing it
+        """
+
+        if self.template is None:
+
+            return None
+
+        if os.path.isdir(self.template):
+
+            shutil.rmtree(self.template)
+
+        shutil.copytree(self.path(name), self.template, symlinks=True, ignore=self.ignore_locks)
+
+        return self.template
@@ -0,0 +1,124 @@
+from typing import Union, Iterator
+
+import os
+import json
+import gzip
+import time
+import threading
+
+from parser.utils import OS, Urls
+
+__all__ = ['Recorder', 'Recording']
+
+
+class Recorder:
+
+    def __init__(self, path: str = 'crawl'):
+
+        """
+        Parameters
+        ----------
+        path: str
+            recording path prefix, records are appended to {path}.rec.gz, one gzip member per record,
+            and indexed by url in {path}.idx.jsonl - {"url", "offset", "length", "kind", "topic", "time"}
+        """
+
+        self.data_filename = path + '.rec.gz'
+        self.index_filename = path + '.idx.jsonl'
+
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.data_filename)
+
+        if directory != '':
+
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, url, page_source: str, kind: str = 'page', topic: str = None):
+
+        header = {'url': url, 'kind': kind, 'topic': topic, 'time': time.time()}
+
+        record = gzip.compress((json.dumps(header) + '\n' + page_source).encode('utf-8'), compresslevel=6)
+
+        with self.lock:
+
+            with open(self.data_filename, 'ab') as buffer_writer:
+
+                offset = buffer_writer.tell()
+                buffer_writer.write(record)
+
+            entry = dict(header, offset=offset, length=len(record))
+
+            with open(self.index_filename, 'a', encoding='utf-8') as buffer_writer:
+
+                buffer_writer.write(json.dumps(entry) + '\n')
+
+
+class Recording:
+
+    def __init__(self, path: str = 'crawl'):
+
+        self.path = path
+
+        self.data_filename = path + '.rec.gz'
+        self.index_filename = path + '.idx.jsonl'
+
+        if not OS.file_exists(self.index_filename):
+
+            raise FileNotFoundError(f'Recording index: {self.index_filename} Doesn\'t Exist')
+
+        # canonical url --> entry, the latest record wins
+        self.index = dict()
+
+        with open(self.index_filename, 'r', encoding='utf-8') as buffer:
+
+            for line in buffer:
+
+                if line.strip():
+
+                    entry = json.loads(line)
+
+                    self.index[Urls.canonical(entry['url'])] = entry
+
+    def __contains__(self, url):
+
+        return Urls.canonical(url) in self.index
+
+    def __len__(self):
+
+        return len(self.index)
+
+    def entry(self, url) -> Union[dict, None]:
+
+        return self.index.get(Urls.canonical(url))
+
+    def entries(self, kind: str = None) -> Iterator[dict]:
+
+        for entry in self.index.values():
+
+            if kind is None or entry['kind'] == kind:
+
+                yield entry
+
+    def read(self, url) -> Union[str, None]:
+
+        entry = self.entry(url)
+
+        if entry is None:
+
+            return None
+
+        return Recording.read_entry(self.data_filename, entry['offset'], entry['length'])
+
+    @staticmethod
+    def read_entry(data_filename, offset, length) -> str:
+
+        with open(data_filename, 'rb') as buffer:
+
+            buffer.seek(offset)
+
+            record = gzip.decompress(buffer.read(length)).decode('utf-8')
+
+        _, page_source = record.split('\n', 1)
+
+        return page_source
@@ -0,0 +1,124 @@
+from typing import List
+
+import sqlite3
+
+from parser.utils import Urls
+
+__all__ = ['SearchIndex']
+
+
+class SearchIndex:
+
+    schema = ['CREATE TABLE IF NOT EXISTS posts (url TEXT PRIMARY KEY, title TEXT, author TEXT, topic TEXT, text TEXT)',
+
+              'CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5'
+              '(title, author, topic, text, content=\'posts\', content_rowid=\'rowid\')',
+
+              'CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN '
+              'INSERT INTO posts_fts(rowid, title, author, topic, text) '
+              'VALUES (new.rowid, new.title, new.author, new.topic, new.text); END',
+
+              'CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN '
+              'INSERT INTO posts_fts(posts_fts, rowid, title, author, topic, text) '
+              'VALUES (\'delete\', old.rowid, old.title, old.author, old.topic, old.text); END',
+
+              'CREATE TRIGGER IF NOT EXISTS posts_au AFTER UPDATE ON posts BEGIN '
+              'INSERT INTO posts_fts(posts_fts, rowid, title, author, topic, text) '
+              'VALUES (\'delete\', old.rowid, old.title, old.author, old.topic, old.text); '
+              'INSERT INTO posts_fts(rowid, title, author, topic, text) '
+              'VALUES (new.rowid, new.title, new.author, new.topic, new.text); END']
+
+    def __init__(self, filename: str = 'posts_index.db', batch_size: int = 100):
+
+        """
+        Parameters
+        ----------
+        filename: str
+            sqlite database path, of the full-text (fts5) index
+
+        batch_size: int
+            number of indexed posts per transaction
+        """
+
+        self.filename = filename
+        self.batch_size = batch_size
+
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+
+        for statement in SearchIndex.schema:
+
+            self.connection.execute(statement)
+
+        self.connection.commit()
+
+        self.pending = []
+
+    def add(self, url, text, title=None, author=None, topic=None):
+
+        """
+        index, or re-index a post by its canonical url
+        """
+
+        self.pending.append((Urls.canonical(url), title, author, topic, text))
+
+        if len(self.pending) >= self.batch_size:
+
+            self.flush()
+
+    def flush(self):
+
+        if len(self.pending) == 0:
+
+            return None
+
+        self.connection.executemany('INSERT INTO posts (url, title, author, topic, text) VALUES (?, ?, ?, ?, ?) '
+                                    'ON CONFLICT(url) DO UPDATE SET title=excluded.title, author=excluded.author, '
+                                    'topic=excluded.topic, text=excluded.text', self.pending)
+
+        self.connection.commit()
+
+        self.pending = []
+
+    def search(self, query: str, limit: int = 10, topic: str = None) -> List[dict]:
+
+        """
+        query: str
+            fts5 query, ex: 'reinforcement learning', 'title:transformer', '"neural network" NOT keras'
+        """
+
+        self.flush()
+
+        statement = 'SELECT posts.url, posts.title, posts.author, posts.topic, ' \
+                    'snippet(posts_fts, 3, \'[\', \']\', \'...\', 16) ' \
+                    'FROM posts_fts JOIN posts ON posts.rowid = posts_fts.rowid WHERE posts_fts MATCH ?'
+
+        params = [query]
+
+        if topic is not None:
+
+            statement += ' AND posts.topic = ?'
+            params.append(topic)
+
+        statement += ' ORDER BY bm25(posts_fts) LIMIT ?'
+        params.append(limit)
+
+        rows = self.connection.execute(statement, params).fetchall()
+
+        keys = ['url', 'title', 'author', 'topic', 'snippet']
+
+        return [dict(zip(keys, row)) for row in rows]
+
+    def count(self):
+
+        self.flush()
+
+        return self.connection.execute('SELECT COUNT(*) FROM posts').fetchone()[0]
+
+    def close(self):
+
+        self.flush()
+
+        self.connection.close()
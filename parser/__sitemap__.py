@@ -0,0 +1,292 @@
+from typing import Union, List
+
+import io
+import re
+import gzip
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import xml.etree.ElementTree as ElementTree
+from urllib.request import Request, urlopen
+from urllib.parse import urlsplit
+
+from parser.utils import Logger
+
+__all__ = ['SitemapReader', 'parse_lastmod']
+
+gzip_magic = b'\x1f\x8b'
+
+user_agent = 'Mozilla/5.0 (compatible; medium-scraper)'
+
+
+def parse_lastmod(text) -> Union[datetime, None]:
+
+    """
+    W3C datetime of <lastmod>, ex: 2021-03-01, 2021-03-01T10:00:00Z, 2021-03-01T10:00:00.000+02:00,
+    returns a naive utc datetime
+    """
+
+    if text is None:
+
+        return None
+
+    text = text.strip()
+
+    if text.endswith('Z'):
+
+        text = text[:-1] + '+00:00'
+
+    try:
+
+        date = datetime.fromisoformat(text)
+
+    except ValueError:
+
+        return None
+
+    if date.tzinfo is not None:
+
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return date
+
+
+def local_name(tag):
+
+    return tag.rsplit('}', 1)[-1]
+
+
+def as_date(value) -> Union[datetime, None]:
+
+    if value is None or isinstance(value, datetime):
+
+        return value
+
+    return parse_lastmod(value)
+
+
+def is_day(value) -> bool:
+
+    # a date without a time, ex: '2021-01-20'
+    return isinstance(value, str) and len(value.strip()) == 10
+
+
+class SitemapReader:
+
+    def __init__(self, start_date: Union[str, datetime] = None, end_date: Union[str, datetime] = None,
+                 include: List[str] = None, exclude: List[str] = None, keep_undated: bool = True,
+                 max_depth: int = 5, timeout: float = 30.0):
+
+        """
+        Parameters
+        ----------
+        start_date, end_date: Union[str, datetime]
+            keep the urls, whose <lastmod> is within [start_date, end_date], ex: '2021-01-01',
+            an end_date without a time includes the whole day,
+            nested sitemaps, whose <lastmod> is before start_date, are not opened
+
+        include, exclude: List[str]
+            regex patterns of the urls paths, a url is kept if its path matches any of (include),
+            and none of (exclude)
+
+        keep_undated: bool
+            keep the urls without <lastmod>
+
+        max_depth: int
+            maximum nesting of sitemap indexes
+        """
+
+        self.start_date = as_date(start_date)
+        self.end_date = as_date(end_date)
+
+        # urls are kept before (end_before), or up to (end_date) included
+        self.end_before = self.end_date + timedelta(days=1) if self.end_date is not None and is_day(end_date) \
+            else None
+
+        self.include = [re.compile(pattern) for pattern in include or []]
+        self.exclude = [re.compile(pattern) for pattern in exclude or []]
+
+        self.keep_undated = keep_undated
+
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    @contextmanager
+    def open(self, source):
+
+        """
+        (source): url or local path of a sitemap, plain or gzip, yields a binary stream
+        """
+
+        if urlsplit(source).scheme in ('http', 'https'):
+
+            stream = urlopen(Request(source, headers={'User-Agent': user_agent}), timeout=self.timeout)
+
+        else:
+
+            stream = open(source, 'rb')
+
+        if not hasattr(stream, 'peek'):
+
+            stream = io.BufferedReader(stream)
+
+        try:
+
+            if stream.peek(2)[:2] == gzip_magic:
+
+                yield gzip.GzipFile(fileobj=stream, mode='rb')
+
+            else:
+
+                yield stream
+
+        finally:
+
+            stream.close()
+
+    def in_range(self, date: Union[datetime, None]):
+
+        if date is None:
+
+            return self.keep_undated
+
+        if self.start_date is not None and date < self.start_date:
+
+            return False
+
+        if self.end_before is not None and date >= self.end_before:
+
+            return False
+
+        if self.end_before is None and self.end_date is not None and date > self.end_date:
+
+            return False
+
+        return True
+
+    def match(self, url):
+
+        path = urlsplit(url).path
+
+        if len(self.include) > 0 and not any(pattern.search(path) for pattern in self.include):
+
+            return False
+
+        return not any(pattern.search(path) for pattern in self.exclude)
+
+    def iter_urls(self, source, depth=0, visited: set = None):
+
+        """
+        streams (source) and its nested sitemaps, yields (url, lastmod) of the kept urls
+        """
+
+        visited = set() if visited is None else visited
+
+        if source in visited or depth > self.max_depth:
+
+            return
+
+        visited.add(source)
+
+        nested = []
+
+        with self.open(source) as stream:
+
+            root = None
+
+            for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+
+                if event == 'start':
+
+                    root = element if root is None else root
+
+                    continue
+
+                name = local_name(element.tag)
+
+                if name not in ('url', 'sitemap'):
+
+                    continue
+
+                loc, lastmod = None, None
+
+                for child in element:
+
+                    child_name = local_name(child.tag)
+
+                    if child_name == 'loc':
+
+                        loc = (child.text or '').strip()
+
+                    elif child_name == 'lastmod':
+
+                        lastmod = parse_lastmod(child.text)
+
+                # the parsed entries are released, so memory does not grow with the sitemap size
+                root.clear()
+
+                if not loc:
+
+                    continue
+
+                if name == 'sitemap':
+
+                    # a sitemap, modified before start_date, has no newer urls
+                    if lastmod is None or self.start_date is None or lastmod >= self.start_date:
+
+                        nested.append(loc)
+
+                elif self.in_range(lastmod) and self.match(loc):
+
+                    yield loc, lastmod
+
+        for child_source in nested:
+
+            try:
+
+                yield from self.iter_urls(child_source, depth=depth + 1, visited=visited)
+
+            except (OSError, ElementTree.ParseError) as error:
+
+                Logger.fail(f'sitemap has been skipped : {child_source}, {error}')
+
+    def metadata(self, sources: Union[str, List[str]], limit: int = None):
+
+        """
+        returns the metadata columns of the kept urls, without a browser,
+        the author is taken from /@author/ paths, and the date from <lastmod>
+        """
+
+        sources = [sources] if isinstance(sources, str) else sources
+
+        columns = {'title': [], 'subtitle': [], 'publication': [], 'url': [], 'author': [], 'date': [],
+                   'read_time': []}
+
+        seen = set()
+
+        for source in sources:
+
+            for url, lastmod in self.iter_urls(source):
+
+                if url in seen:
+
+                    continue
+
+                seen.add(url)
+
+                segments = [segment for segment in urlsplit(url).path.split('/') if segment]
+                author = next((segment[1:] for segment in segments if segment.startswith('@')), None)
+
+                columns['title'].append(None)
+                columns['subtitle'].append(None)
+                columns['publication'].append(None)
+                columns['url'].append(url)
+                columns['author'].append(author)
+                columns['date'].append(lastmod.strftime('%Y-%m-%d') if lastmod is not None else None)
+                columns['read_time'].append(None)
+
+                if limit is not None and len(seen) >= limit:
+
+                    return columns
+
+        return columns
@@ -0,0 +1,252 @@
+from typing import Union, Iterator
+
+import os
+import json
+import shutil
+import tempfile
+
+__all__ = ['SpillStore']
+
+
+class SpillStore:
+
+    def __init__(self, directory: str = 'spill', memory_limit: int = 512 * 1024 ** 2):
+
+        """
+        Parameters
+        ----------
+        directory: str
+            where the spilled segments are written, in a subdirectory of its own per store,
+            so that several scrapers can share (directory), one *.jsonl file of rows per segment
+
+        memory_limit: int
+            approximate size in bytes of the in-memory records, above which they are spilled to disk
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = tempfile.mkdtemp(prefix='spill_', dir=directory)
+        self.memory_limit = memory_limit
+
+        self.memory_size = 0
+
+        # partition --> [(path, count), ...]
+        self.segments = dict()
+
+    @staticmethod
+    def size_of(value):
+
+        if value is None or isinstance(value, (bool, int, float)):
+
+            return 16
+
+        if isinstance(value, str):
+
+            return 50 + len(value)
+
+        if isinstance(value, dict):
+
+            return 64 + sum(SpillStore.size_of(key) + SpillStore.size_of(item) for key, item in value.items())
+
+        if isinstance(value, (list, tuple)):
+
+            return 56 + sum(map(SpillStore.size_of, value))
+
+        return 64
+
+    def track(self, value):
+
+        self.memory_size += SpillStore.size_of(value)
+
+    def exceeded(self):
+
+        return self.memory_size > self.memory_limit
+
+    def has(self, partition):
+
+        return len(self.segments.get(partition, [])) > 0
+
+    def count(self, partition):
+
+        return sum(count for _, count in self.segments.get(partition, []))
+
+    def partitions(self, prefix=''):
+
+        return [partition for partition in self.segments.keys() if partition.startswith(prefix)]
+
+    def spill(self, partition, columns: dict, key='url'):
+
+        """
+        append the rows of (columns) - {column: [values, ...]}, to a new segment of (partition)
+        """
+
+        n_rows = len(columns.get(key, []))
+
+        if n_rows == 0:
+
+            return 0
+
+        segments = self.segments.setdefault(partition, [])
+
+        filename = partition.replace('/', '_') + f'_{len(segments):05d}.jsonl'
+        path = os.path.join(self.directory, filename)
+
+        names = list(columns.keys())
+
+        with open(path, 'w', encoding='utf-8') as buffer_writer:
+
+            for i in range(n_rows):
+
+                row = {name: columns[name][i] if i < len(columns[name]) else None for name in names}
+
+                buffer_writer.write(json.dumps(row, separators=(',', ':')))
+                buffer_writer.write('\n')
+
+        segments.append((path, n_rows))
+
+        return n_rows
+
+    def iter_rows(self, partition, segments: int = None) -> Iterator[dict]:
+
+        """
+        (segments): read the first (segments) segments only, default: the segments when reading starts,
+        not the ones which are spilled meanwhile
+        """
+
+        for path, _ in self.segments.get(partition, [])[:segments]:
+
+            with open(path, 'r', encoding='utf-8') as buffer:
+
+                for line in buffer:
+
+                    yield json.loads(line)
+
+    def iter_column(self, partition, column) -> Iterator:
+
+        for row in self.iter_rows(partition):
+
+            yield row.get(column)
+
+    def iter_columns(self, partition, names: list) -> dict:
+
+        """
+        {column: iterator of its values}, for column-oriented writers, the segments are read once,
+        on the first value of any column, each column is buffered into a temporary file
+        """
+
+        buffers = dict()
+
+        def split():
+
+            for name in names:
+
+                buffers[name] = tempfile.TemporaryFile('w+', encoding='utf-8', dir=self.directory)
+
+            for row in self.iter_rows(partition):
+
+                for name in names:
+
+                    buffers[name].write(json.dumps(row.get(name), separators=(',', ':')) + '\n')
+
+        def column(name):
+
+            if len(buffers) == 0:
+
+                split()
+
+            buffer = buffers[name]
+
+            try:
+
+                buffer.seek(0)
+
+                for line in buffer:
+
+                    yield json.loads(line)
+
+            finally:
+
+                buffer.close()
+
+        return {name: column(name) for name in names}
+
+    def map_column(self, partition, source: str, target: str, function):
+
+        """
+        set (target) = function([row[source], ...]) in place, one segment at a time
+        """
+
+        for path, _ in self.segments.get(partition, []):
+
+            with open(path, 'r', encoding='utf-8') as buffer:
+
+                rows = [json.loads(line) for line in buffer]
+
+            values = function([row.get(source) for row in rows])
+
+            with open(path + '.tmp', 'w', encoding='utf-8') as buffer_writer:
+
+                for row, value in zip(rows, values):
+
+                    row[target] = value
+
+                    buffer_writer.write(json.dumps(row, separators=(',', ':')))
+                    buffer_writer.write('\n')
+
+            os.replace(path + '.tmp', path)
+
+    def columns(self, partition) -> Union[list, None]:
+
+        names = []
+
+        for row in self.iter_rows(partition):
+
+            names = list(row.keys())
+
+            break
+
+        return names
+
+    def load(self, partition) -> dict:
+
+        """
+        the spilled rows of (partition) as columns - {column: [values, ...]}
+        """
+
+        columns = dict()
+
+        for i, row in enumerate(self.iter_rows(partition)):
+
+            for name, value in row.items():
+
+                columns.setdefault(name, [None] * i).append(value)
+
+            for name in columns.keys():
+
+                if name not in row:
+
+                    columns[name].append(None)
+
+        return columns
+
+    def drop(self, partition):
+
+        for path, _ in self.segments.pop(partition, []):
+
+            if os.path.exists(path):
+
+                os.remove(path)
+
+    def close(self):
+
+        self.segments = dict()
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def clear(self):
+
+        self.segments = dict()
+        self.memory_size = 0
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
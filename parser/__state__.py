@@ -0,0 +1,298 @@
+from typing import Union, List
+
+import threading
+from itertools import chain
+
+from parser.utils import OS, Reader, Writer, Urls, Dates
+
+__all__ = ['Watermark', 'UrlSet', 'merge_columns', 'concat_columns']
+
+
+def merge_columns(new: dict, old: dict, key: str = 'url', seen=()):
+
+    """
+    merge two column-oriented records - {column: [values, ...]}, rows of (new) come first,
+    rows of (old) sharing the same canonical (key) with a row of (new), or with (seen) are dropped,
+
+    seen: iterable
+        keys of new rows which aren't in (new), ex: spilled to disk
+    """
+
+    if not old:
+
+        return new
+
+    if not new and not seen:
+
+        return old
+
+    new = new or dict()
+
+    n_new = len(new.get(key, []))
+    n_old = len(old.get(key, []))
+
+    known = set(map(Urls.canonical, chain(new.get(key, []), seen)))
+    keep = [i for i, value in enumerate(old.get(key, [])) if Urls.canonical(value) not in known]
+
+    merged = dict()
+
+    for column in list(new.keys()) + [column for column in old.keys() if column not in new]:
+
+        values = list(new.get(column, [None] * n_new))
+        old_values = old.get(column, [None] * n_old)
+
+        values += [old_values[i] if i < len(old_values) else None for i in keep]
+
+        merged[column] = values
+
+    return merged
+
+
+def concat_columns(first: dict, second: dict, key: str = 'url'):
+
+    """
+    the rows of (first) followed by the rows of (second), missing values are filled with None
+    """
+
+    n_first = len(first.get(key, []))
+    n_second = len(second.get(key, []))
+
+    concatenated = dict()
+
+    for column in list(first.keys()) + [column for column in second.keys() if column not in first]:
+
+        values = list(first.get(column, []))
+        values += [None] * (n_first - len(values))
+
+        second_values = list(second.get(column, []))
+        second_values += [None] * (n_second - len(second_values))
+
+        concatenated[column] = values + second_values
+
+    return concatenated
+
+
+class Watermark:
+
+    def __init__(self, metadata: dict = None, older_run: int = 10):
+
+        """
+        Parameters
+        ----------
+        metadata: dict
+            previously scraped metadata - {topic: {'url': [...], 'date': [...], ...}}
+
+        older_run: int
+            number of consecutive cards, older than the newest seen date, which end a feed,
+            a feed isn't strictly chronological, ex: pinned or featured posts
+        """
+
+        self.topics = dict()
+
+        self.older_run = older_run
+
+        if metadata is not None:
+
+            self.update(metadata)
+
+    @staticmethod
+    def from_file(metadata_filename='posts_metadata.json'):
+
+        metadata = Reader.json_to_dict(metadata_filename)
+
+        return Watermark(metadata)
+
+    def update(self, metadata: dict):
+
+        for topic, columns in metadata.items():
+
+            watermark = self.topics.setdefault(topic, {'urls': set(), 'date': None, 'older': 0})
+
+            watermark['urls'].update(map(Urls.canonical, columns.get('url', [])))
+
+            for text in columns.get('date', []):
+
+                date = Dates.parse(text)
+
+                if date is not None and (watermark['date'] is None or date > watermark['date']):
+
+                    watermark['date'] = date
+
+    def has_topic(self, topic):
+
+        return topic in self.topics
+
+    def seen(self, topic, url):
+
+        if topic not in self.topics:
+
+            return False
+
+        return Urls.canonical(url) in self.topics[topic]['urls']
+
+    def reached(self, topic, urls: List[str], dates: List[str] = None):
+
+        """
+        True, if the feed of (topic) reached a previously seen post, or (older_run) consecutive posts older than
+        the newest seen date, (urls, dates) are the cards loaded since the previous call
+        """
+
+        if topic not in self.topics:
+
+            return False
+
+        if any(self.seen(topic, url) for url in urls):
+
+            return True
+
+        watermark = self.topics[topic]
+
+        if watermark['date'] is None or not dates:
+
+            return False
+
+        for text in dates:
+
+            date = Dates.parse(text)
+
+            if date is None:
+
+                continue
+
+            watermark['older'] = watermark['older'] + 1 if date < watermark['date'] else 0
+
+            if watermark['older'] >= self.older_run:
+
+                return True
+
+        return False
+
+    def filter(self, topic, columns: dict, key: str = 'url'):
+
+        """
+        keep the rows of (columns) which haven't been seen for (topic)
+        """
+
+        urls = columns.get(key, [])
+
+        keep = [i for i, url in enumerate(urls) if not self.seen(topic, url)]
+
+        new_columns = dict()
+
+        for column, values in columns.items():
+
+            new_columns[column] = [values[i] if i < len(values) else None for i in keep]
+
+        return new_columns
+
+    def merge(self, new: dict, old: Union[dict, None]):
+
+        if old is None:
+
+            return new
+
+        merged = dict(old)
+
+        for topic, columns in new.items():
+
+            merged[topic] = merge_columns(columns, old.get(topic))
+
+        return merged
+
+
+class UrlSet:
+
+    # scrapers of the same process (ex: batch workers) can save the same file
+    files_lock = threading.Lock()
+
+    def __init__(self, filename: str = None):
+
+        """
+        Parameters
+        ----------
+        filename: str
+            *.json path, where the set is persisted - {'urls': [...]}, None: in-memory only
+        """
+
+        self.filename = filename
+
+        self.urls = set()
+        self.discarded = set()
+        self.modified = False
+
+        self.lock = threading.Lock()
+
+        with UrlSet.files_lock:
+
+            if filename is not None and OS.file_exists(filename):
+
+                content = Reader.json_to_dict(filename) or dict()
+
+                self.urls.update(content.get('urls', []))
+
+    def __contains__(self, url):
+
+        return Urls.canonical(url) in self.urls
+
+    def __len__(self):
+
+        return len(self.urls)
+
+    def add(self, url):
+
+        url = Urls.canonical(url)
+
+        if url not in self.urls:
+
+            self.urls.add(url)
+            self.discarded.discard(url)
+            self.modified = True
+
+    def claim(self, url):
+
+        """
+        add (url), returns False if it was already in the set, safe to share between threads
+        """
+
+        url = Urls.canonical(url)
+
+        with self.lock:
+
+            if url in self.urls:
+
+                return False
+
+            self.urls.add(url)
+            self.modified = True
+
+        return True
+
+    def discard(self, url):
+
+        url = Urls.canonical(url)
+
+        if url in self.urls:
+
+            self.urls.discard(url)
+            self.discarded.add(url)
+            self.modified = True
+
+    def save(self):
+
+        if self.filename is None or not self.modified:
+
+            return None
+
+        with UrlSet.files_lock:
+
+            # keep the urls which have been saved by others, since this set has been loaded
+            if OS.file_exists(self.filename):
+
+                content = Reader.json_to_dict(self.filename) or dict()
+
+                self.urls.update(url for url in content.get('urls', []) if url not in self.discarded)
+
+            Writer.dict_to_json(json_filename=self.filename, content={'urls': sorted(self.urls)},
+                                overwrite=OS.file_exists(self.filename), indent_level=None, sort_keys=False)
+
+            self.modified = False
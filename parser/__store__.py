@@ -0,0 +1,294 @@
+from typing import List
+
+import json
+import time
+import sqlite3
+
+from parser.utils import Files, Writer, Urls
+
+__all__ = ['PostsStore']
+
+cards_columns = ['title', 'subtitle', 'publication', 'url', 'author', 'date', 'read_time']
+posts_columns = ['url', 'topic', 'title', 'author', 'text', 'img_src', 'caption', 'duplicate_of']
+
+# stored as json text
+list_columns = ['img_src', 'caption']
+
+
+class PostsStore:
+
+    schema = ['CREATE TABLE IF NOT EXISTS topics (name TEXT PRIMARY KEY, url TEXT, updated_at REAL)',
+
+              'CREATE TABLE IF NOT EXISTS cards (url TEXT PRIMARY KEY, topic TEXT, title TEXT, subtitle TEXT, '
+              'publication TEXT, author TEXT, date TEXT, read_time TEXT, updated_at REAL)',
+
+              'CREATE INDEX IF NOT EXISTS cards_topic ON cards (topic)',
+
+              'CREATE TABLE IF NOT EXISTS posts (url TEXT PRIMARY KEY, topic TEXT, title TEXT, author TEXT, '
+              'text TEXT, img_src TEXT, caption TEXT, duplicate_of TEXT, updated_at REAL)',
+
+              'CREATE INDEX IF NOT EXISTS posts_topic ON posts (topic)']
+
+    # a re-scraped row replaces the stored one, except for the fields, which are missing in it
+    upsert_cards = 'INSERT INTO cards (url, topic, title, subtitle, publication, author, date, read_time, ' \
+                   'updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET ' \
+                   'topic=excluded.topic, title=COALESCE(excluded.title, title), ' \
+                   'subtitle=COALESCE(excluded.subtitle, subtitle), ' \
+                   'publication=COALESCE(excluded.publication, publication), ' \
+                   'author=COALESCE(excluded.author, author), date=COALESCE(excluded.date, date), ' \
+                   'read_time=COALESCE(excluded.read_time, read_time), updated_at=excluded.updated_at'
+
+    upsert_posts = 'INSERT INTO posts (url, topic, title, author, text, img_src, caption, duplicate_of, updated_at) ' \
+                   'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET ' \
+                   'topic=COALESCE(excluded.topic, topic), title=COALESCE(excluded.title, title), ' \
+                   'author=COALESCE(excluded.author, author), text=excluded.text, img_src=excluded.img_src, ' \
+                   'caption=excluded.caption, duplicate_of=excluded.duplicate_of, updated_at=excluded.updated_at'
+
+    def __init__(self, filename: str = 'posts.db', batch_size: int = 500):
+
+        """
+        Parameters
+        ----------
+        filename: str
+            sqlite database path, topics, cards (posts metadata) and posts (content), keyed by canonical url
+
+        batch_size: int
+            number of upserted rows per transaction
+        """
+
+        self.filename = filename
+        self.batch_size = batch_size
+
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+
+        for statement in PostsStore.schema:
+
+            self.connection.execute(statement)
+
+        self.connection.commit()
+
+        self.pending = {'cards': [], 'posts': []}
+
+    def add_topic(self, name, url=None):
+
+        self.connection.execute('INSERT INTO topics (name, url, updated_at) VALUES (?, ?, ?) ON CONFLICT(name) '
+                                'DO UPDATE SET url=COALESCE(excluded.url, url), updated_at=excluded.updated_at',
+                                (name, url, time.time()))
+
+    def add_cards(self, topic, columns: dict, topic_url=None):
+
+        """
+        upsert the metadata columns of a topic
+        """
+
+        self.add_topic(topic, topic_url)
+
+        now = time.time()
+
+        for i, url in enumerate(columns.get('url', [])):
+
+            if not url:
+
+                continue
+
+            row = {name: columns[name][i] if i < len(columns.get(name, [])) else None for name in cards_columns}
+
+            self.pending['cards'].append((Urls.canonical(url), topic, row['title'], row['subtitle'],
+                                          row['publication'], row['author'], row['date'], row['read_time'], now))
+
+        self.__flush_if_full__()
+
+    def add_post(self, url, text, img_src=None, caption=None, topic=None, title=None, author=None,
+                 duplicate_of=None):
+
+        self.pending['posts'].append((Urls.canonical(url), topic, title, author, text,
+                                      json.dumps(img_src), json.dumps(caption), duplicate_of, time.time()))
+
+        self.__flush_if_full__()
+
+    def __flush_if_full__(self):
+
+        if len(self.pending['cards']) + len(self.pending['posts']) >= self.batch_size:
+
+            self.flush()
+
+    def flush(self):
+
+        if len(self.pending['cards']) > 0:
+
+            self.connection.executemany(PostsStore.upsert_cards, self.pending['cards'])
+
+        if len(self.pending['posts']) > 0:
+
+            self.connection.executemany(PostsStore.upsert_posts, self.pending['posts'])
+
+        self.connection.commit()
+
+        self.pending = {'cards': [], 'posts': []}
+
+    def count(self, table='posts'):
+
+        self.flush()
+
+        return self.connection.execute(f'SELECT COUNT(*) FROM {PostsStore.table(table)}').fetchone()[0]
+
+    @staticmethod
+    def table(name):
+
+        if name not in ('cards', 'posts'):
+
+            raise ValueError(f'unknown table: {name}, expected cards or posts')
+
+        return name
+
+    @staticmethod
+    def columns(table):
+
+        return cards_columns if PostsStore.table(table) == 'cards' else posts_columns
+
+    def topics(self, table='cards'):
+
+        self.flush()
+
+        statement = f'SELECT DISTINCT topic FROM {PostsStore.table(table)} ORDER BY topic'
+
+        return [topic for topic, in self.connection.execute(statement)]
+
+    def iter_rows(self, table='posts', topic: str = None, columns: List[str] = None, fetch_size: int = 1000):
+
+        """
+        yields the rows of (table) as dicts, in insertion order, without loading the table
+        """
+
+        self.flush()
+
+        columns = [name for name in columns or PostsStore.columns(table) if name in PostsStore.columns(table)]
+
+        statement = f'SELECT topic, {", ".join(columns)} FROM {PostsStore.table(table)}'
+        params = []
+
+        if topic is not None:
+
+            statement += ' WHERE topic = ?'
+            params.append(topic)
+
+        cursor = self.connection.cursor()
+        cursor.execute(statement + ' ORDER BY rowid', params)
+
+        while True:
+
+            rows = cursor.fetchmany(fetch_size)
+
+            if len(rows) == 0:
+
+                break
+
+            for row in rows:
+
+                record = dict(zip(['topic'] + columns, row))
+
+                for name in list_columns:
+
+                    if name in record and record[name] is not None:
+
+                        record[name] = json.loads(record[name])
+
+                yield record
+
+    def iter_column(self, table, name, topic: str = None):
+
+        for row in self.iter_rows(table, topic=topic, columns=[name]):
+
+            yield row[name]
+
+    def export_json(self, filename, table='posts', overwrite=False):
+
+        """
+        cards are written as posts_metadata.json - {topic: {column: [...]}},
+        posts as posts_content.json - {column: [...]}, both streamed by column from the database
+        """
+
+        columns = PostsStore.columns(table)
+
+        if table == 'cards':
+
+            content = {topic: {name: self.iter_column(table, name, topic=topic) for name in columns}
+                       for topic in self.topics(table)}
+
+        else:
+
+            content = {name: self.iter_column(table, name) for name in columns}
+
+        Writer.iter_to_json(filename, content, overwrite=overwrite, separators=(',', ':'))
+
+    def export_csv(self, filename, table='posts', overwrite=False):
+
+        Writer.rows_to_csv(filename, columns=PostsStore.columns(table) + (['topic'] if table == 'cards' else []),
+                           rows=self.iter_rows(table), overwrite=overwrite)
+
+    def export_parquet(self, filename, table='posts', overwrite=False, batch_rows: int = 10000):
+
+        """
+        requires pyarrow, rows are written in record batches of (batch_rows)
+        """
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not Writer.confirm_write(filename, overwrite):
+
+            return None
+
+        columns = PostsStore.columns(table)
+
+        if table == 'cards':
+
+            columns = columns + ['topic']
+
+        list_type = pa.list_(pa.string())
+
+        schema = pa.schema([(name, list_type if name in list_columns else pa.string()) for name in columns])
+
+        with pq.ParquetWriter(filename, schema) as parquet_writer:
+
+            batch = []
+
+            for row in self.iter_rows(table):
+
+                batch.append(row)
+
+                if len(batch) >= batch_rows:
+
+                    parquet_writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+                    batch = []
+
+            if len(batch) > 0:
+
+                parquet_writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+    def export(self, filename, table='posts', overwrite=False):
+
+        """
+        the format is chosen by the extension of (filename) - .json, .csv, .parquet,
+        json and csv are compressed if (filename) ends with .gz, .xz or .zst
+        """
+
+        extension = Files.extension(filename)
+
+        exports = {'.json': self.export_json, '.csv': self.export_csv, '.parquet': self.export_parquet}
+
+        if extension not in exports:
+
+            raise ValueError(f'unknown export format: {extension}, expected one of {list(exports.keys())}')
+
+        exports[extension](filename, table=table, overwrite=overwrite)
+
+    def close(self):
+
+        self.flush()
+
+        self.connection.close()
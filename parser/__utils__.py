@@ -8,16 +8,21 @@ from pathlib import Path
 import json
 import csv
 
+import gzip
+import lzma
+
 import pandas as pd
 
 import time
 from datetime import datetime
 
+from urllib.parse import urlsplit, urlunsplit
+
 import traceback
 
 from errors.exceptions import InvalidConfigurations
 
-__all__ = ['Logger', 'OS', 'Reader', 'Requests', 'Writer']
+__all__ = ['Logger', 'OS', 'Files', 'Reader', 'Requests', 'Writer', 'Urls', 'Dates']
 
 OS_TYPE = ['linux', 'windows']
 
@@ -146,6 +151,84 @@ class OS:
         return output
 
 
+class Files:
+
+    extensions = {'.gz': 'gzip', '.xz': 'xz', '.zst': 'zstd'}
+
+    magic_numbers = {b'\x1f\x8b': 'gzip', b'\xfd7zXZ\x00': 'xz', b'\x28\xb5\x2f\xfd': 'zstd'}
+
+    @staticmethod
+    def compression(filename, detect=False):
+
+        """
+        'gzip', 'xz', 'zstd' or None, by the extension of (filename), or by its first bytes if (detect)
+        """
+
+        if detect and OS.file_exists(filename):
+
+            with open(filename, 'rb') as buffer:
+
+                head = buffer.read(6)
+
+            for magic_number, compression in Files.magic_numbers.items():
+
+                if head.startswith(magic_number):
+
+                    return compression
+
+            return None
+
+        return Files.extensions.get(os.path.splitext(filename)[1].lower())
+
+    @staticmethod
+    def extension(filename):
+
+        """
+        the extension of (filename), without the compression one, ex: posts.jsonl.gz --> .jsonl
+        """
+
+        root, extension = os.path.splitext(filename)
+
+        if extension.lower() in Files.extensions:
+
+            root, extension = os.path.splitext(root)
+
+        return extension.lower()
+
+    @staticmethod
+    def is_jsonl(filename):
+
+        return Files.extension(filename) == '.jsonl'
+
+    @staticmethod
+    def open(filename, mode='rt', newline=None):
+
+        """
+        (mode): 'rt', 'wt', 'rb' or 'wb', the compression of a file is detected when reading,
+        and chosen by the extension when writing - .gz, .xz, .zst (requires zstandard)
+        """
+
+        compression = Files.compression(filename, detect='r' in mode)
+
+        text = {'encoding': 'utf-8', 'newline': newline} if 't' in mode else dict()
+
+        if compression == 'gzip':
+
+            return gzip.open(filename, mode, compresslevel=6, **text)
+
+        if compression == 'xz':
+
+            return lzma.open(filename, mode, **text)
+
+        if compression == 'zstd':
+
+            import zstandard
+
+            return zstandard.open(filename, mode, **text)
+
+        return open(filename, mode.replace('t', ''), **text)
+
+
 class Reader:
 
     @staticmethod
@@ -159,7 +242,7 @@ class Reader:
 
         content: dict
 
-        with open(json_filename, "r") as buffer:
+        with Files.open(json_filename, 'rt') as buffer:
 
             content = json.load(buffer)
 
@@ -169,29 +252,40 @@ class Reader:
 class Writer:
 
     @staticmethod
-    def dict_to_json(json_filename, content, overwrite=False, indent_level=3, sort_keys=False, separators=(',', ':')):
+    def confirm_write(filename, overwrite=False):
 
-        is_file_exist = OS.file_exists(json_filename)
+        is_file_exist = OS.file_exists(filename)
 
         if not is_file_exist and overwrite:
 
-            Logger.warning(f'overwrite=True, File: {json_filename} is Not Exists')
+            Logger.warning(f'overwrite=True, File: {filename} is Not Exists')
 
         elif is_file_exist and not overwrite:
 
-            Logger.warning(f'File: {json_filename} Already Exists')
+            Logger.warning(f'File: {filename} Already Exists')
 
             ok = input('Do you want to continue - [y/n]: ')
 
             if ok.lower() == 'n':
 
-                return None
+                return False
 
             elif ok.lower() != 'y':
 
                 Logger.error(f'Abort')
 
-                return None
+                return False
+
+        return True
+
+    @staticmethod
+    def dict_to_json(json_filename, content, overwrite=False, indent_level=3, sort_keys=False, separators=(',', ':')):
+
+        is_file_exist = OS.file_exists(json_filename)
+
+        if not Writer.confirm_write(json_filename, overwrite):
+
+            return None
 
         if not is_file_exist:
 
@@ -216,25 +310,9 @@ class Writer:
 
         is_file_exist = OS.file_exists(csv_filename)
 
-        if not is_file_exist and overwrite:
+        if not Writer.confirm_write(csv_filename, overwrite):
 
-            Logger.warning(f'overwrite=True, File: {csv_filename} is Not Exists')
-
-        elif is_file_exist and not overwrite:
-
-            Logger.warning(f'File: {csv_filename} Already Exists')
-
-            ok = input('Do you want to continue - [y/n]: ')
-
-            if ok.lower() == 'n':
-
-                return None
-
-            elif ok.lower() != 'y':
-
-                Logger.error(f'Abort')
-
-                return None
+            return None
 
         if not use_pandas:
 
@@ -259,6 +337,124 @@ class Writer:
             dataframe = pd.DataFrame(content)
             dataframe.to_csv(csv_filename, index=False, encoding='utf-8')
 
+    @staticmethod
+    def iter_to_json(json_filename, content: dict, overwrite=False, separators=(',', ':')):
+
+        """
+        write (content) as json, without building it in memory, dicts are written key by key,
+        lists and iterators (e.g. generators over spilled segments) are written element by element,
+        the file is overwritten, not merged
+        """
+
+        if not Writer.confirm_write(json_filename, overwrite):
+
+            return None
+
+        with Files.open(json_filename, 'wt') as buffer_writer:
+
+            Writer.__write_json__(buffer_writer, content, separators)
+
+    @staticmethod
+    def __write_json__(buffer_writer, value, separators=(',', ':')):
+
+        item_sep, key_sep = separators
+
+        if isinstance(value, dict):
+
+            buffer_writer.write('{')
+
+            for i, (key, item) in enumerate(value.items()):
+
+                if i > 0:
+
+                    buffer_writer.write(item_sep)
+
+                buffer_writer.write('\n' + json.dumps(str(key)) + key_sep)
+
+                Writer.__write_json__(buffer_writer, item, separators)
+
+            buffer_writer.write('}')
+
+        elif isinstance(value, (list, tuple)) or hasattr(value, '__next__'):
+
+            buffer_writer.write('[')
+
+            for i, item in enumerate(value):
+
+                if i > 0:
+
+                    buffer_writer.write(item_sep)
+
+                buffer_writer.write(json.dumps(item, separators=separators))
+
+            buffer_writer.write(']')
+
+        else:
+
+            buffer_writer.write(json.dumps(value, separators=separators))
+
+    @staticmethod
+    def rows_to_csv(csv_filename, columns: list, rows, overwrite=False):
+
+        """
+        write (rows) - an iterable of dicts, as csv row by row
+        """
+
+        if not Writer.confirm_write(csv_filename, overwrite):
+
+            return None
+
+        with Files.open(csv_filename, 'wt', newline='') as buffer_writer:
+
+            csv_writer = csv.DictWriter(buffer_writer, fieldnames=columns, extrasaction='ignore')
+            csv_writer.writeheader()
+
+            for row in rows:
+
+                csv_writer.writerow(row)
+
+    @staticmethod
+    def frames_to_csv(csv_filename, frames, overwrite=False):
+
+        """
+        write (frames) - an iterable of DataFrames, as one csv, with the columns of the first frame
+        """
+
+        if not Writer.confirm_write(csv_filename, overwrite):
+
+            return None
+
+        columns = None
+
+        with Files.open(csv_filename, 'wt', newline='') as buffer_writer:
+
+            for frame in frames:
+
+                header = columns is None
+
+                if header:
+
+                    columns = list(frame.columns)
+
+                frame.reindex(columns=columns).to_csv(buffer_writer, index=False, header=header)
+
+    @staticmethod
+    def rows_to_jsonl(jsonl_filename, rows, overwrite=False, separators=(',', ':')):
+
+        """
+        write (rows) - an iterable of dicts, a json object per line
+        """
+
+        if not Writer.confirm_write(jsonl_filename, overwrite):
+
+            return None
+
+        with Files.open(jsonl_filename, 'wt') as buffer_writer:
+
+            for row in rows:
+
+                buffer_writer.write(json.dumps(row, separators=separators) + '\n')
+
 
 class Requests:
 
@@ -285,7 +481,75 @@ class Requests:
 
         time.sleep(secs)
 
-        
+
+class Urls:
+
+    @staticmethod
+    def canonical(url):
+
+        if url is None:
+
+            return None
+
+        parts = urlsplit(url)
+
+        host = parts.netloc.lower().rstrip('.')
+        path = parts.path.rstrip('/') or '/'
+
+        return urlunsplit((parts.scheme.lower(), host, path, '', ''))
+
+    @staticmethod
+    def host(url):
+
+        return urlsplit(url).netloc.lower().rstrip('.')
+
+
+class Dates:
+
+    formats = ['%b %d, %Y', '%B %d, %Y', '%Y-%m-%d']
+    short_formats = ['%b %d', '%B %d']
+
+    @staticmethod
+    def parse(text, reference: datetime = None):
+
+        if text is None:
+
+            return None
+
+        text = text.strip()
+
+        for date_format in Dates.formats:
+
+            try:
+
+                return datetime.strptime(text, date_format)
+
+            except ValueError:
+
+                continue
+
+        reference = reference or datetime.now()
+
+        for date_format in Dates.short_formats:
+
+            try:
+
+                date = datetime.strptime(f'{text} {reference.year}', f'{date_format} %Y')
+
+            except ValueError:
+
+                continue
+
+            # cards of the current year omit the year, so a future date belongs to the previous one
+            if date > reference:
+
+                date = date.replace(year=reference.year - 1)
+
+            return date
+
+        return None
+
+
 class Formatter:
 
     BLUE = '\033[94m'
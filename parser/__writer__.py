@@ -0,0 +1,118 @@
+import time
+import queue
+import atexit
+import threading
+
+from parser.utils import Logger
+
+__all__ = ['BackgroundWriter', 'snapshot_columns']
+
+
+def snapshot_columns(content: dict):
+
+    """
+    copy of the column lists of (content) - {column: [...]} or {topic: {column: [...]}},
+    so the scraping thread could keep appending while the copy is written
+    """
+
+    if content is None:
+
+        return None
+
+    return {key: snapshot_columns(value) if isinstance(value, dict) else list(value)
+            for key, value in content.items()}
+
+
+class BackgroundWriter:
+
+    def __init__(self, max_queue: int = 4, snapshot_interval: float = None):
+
+        """
+        Parameters
+        ----------
+        max_queue: int
+            maximum number of pending writes, submit(...) blocks above it
+
+        snapshot_interval: float
+            minimum number of seconds between two periodic snapshots, see due_snapshot(), None: no snapshots
+        """
+
+        self.snapshot_interval = snapshot_interval
+        self.last_snapshot = time.monotonic()
+
+        self.queue = queue.Queue(maxsize=max_queue)
+
+        self.errors = 0
+
+        self.thread = threading.Thread(target=self.__work__, name='background-writer', daemon=True)
+        self.thread.start()
+
+        # pending writes are flushed, even if quit() is never called
+        atexit.register(self.close)
+
+    def __work__(self):
+
+        while True:
+
+            task = self.queue.get()
+
+            try:
+
+                if task is None:
+
+                    return None
+
+                function, args, kwargs = task
+
+                function(*args, **kwargs)
+
+            except Exception as error:
+
+                self.errors += 1
+
+                Logger.error(error)
+
+            finally:
+
+                self.queue.task_done()
+
+    def submit(self, function, *args, **kwargs):
+
+        if not self.thread.is_alive():
+
+            # closed writer, write synchronously
+            return function(*args, **kwargs)
+
+        self.queue.put((function, args, kwargs))
+
+    def due_snapshot(self):
+
+        if self.snapshot_interval is None:
+
+            return False
+
+        if time.monotonic() - self.last_snapshot < self.snapshot_interval:
+
+            return False
+
+        self.last_snapshot = time.monotonic()
+
+        return True
+
+    def flush(self):
+
+        """
+        block until all submitted writes are done
+        """
+
+        if self.thread.is_alive():
+
+            self.queue.join()
+
+    def close(self):
+
+        if self.thread.is_alive():
+
+            self.queue.put(None)
+
+            self.thread.join()
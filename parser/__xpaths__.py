@@ -0,0 +1,15 @@
+__all__ = ['topic_xpath', 'article_xpath', 'subtitle_xpath', 'pub_xpath', 'datetime_xpath',
+           'text_xpath', 'figure_xpath']
+
+# topics page
+topic_xpath = '//section/div/div/div/a'
+
+# topic page, posts cards
+article_xpath = '//section/div/section/div/div/div/h3/a'
+subtitle_xpath = '//section/div/section' + '/div' * 4 + '/h3'
+pub_xpath = '//section/div/section' + '/div' * 5 + '[@class="n"]'
+datetime_xpath = '//section/div/section' + '/div' * 7
+
+# post page
+text_xpath = '//article/div/section/div/div/p'
+figure_xpath = '//article/div/section/div/div/figure'
@@ -0,0 +1 @@
+from .__budget__ import *
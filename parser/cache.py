@@ -0,0 +1 @@
+from .__cache__ import *
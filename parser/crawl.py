@@ -0,0 +1 @@
+from .__crawl__ import *
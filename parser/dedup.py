@@ -0,0 +1 @@
+from .__dedup__ import *
@@ -0,0 +1 @@
+from .__enrich__ import *
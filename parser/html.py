@@ -0,0 +1 @@
+from .__html__ import *
@@ -0,0 +1 @@
+from .__images__ import *
@@ -0,0 +1 @@
+from .__latency__ import *
@@ -0,0 +1 @@
+from .__lifecycle__ import *
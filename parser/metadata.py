@@ -0,0 +1 @@
+from .__metadata__ import *
@@ -0,0 +1 @@
+from .__network__ import *
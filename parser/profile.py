@@ -0,0 +1 @@
+from .__profile__ import *
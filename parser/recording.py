@@ -0,0 +1 @@
+from .__recording__ import *
@@ -0,0 +1 @@
+from .__search__ import *
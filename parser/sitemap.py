@@ -0,0 +1 @@
+from .__sitemap__ import *
@@ -0,0 +1 @@
+from .__spill__ import *
@@ -0,0 +1 @@
+from .__state__ import *
@@ -0,0 +1 @@
+from .__store__ import *
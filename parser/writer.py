@@ -0,0 +1 @@
+from .__writer__ import *
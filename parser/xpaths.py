@@ -0,0 +1 @@
+from .__xpaths__ import *
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from parser.dedup import MinHashLSH
+
+article = 'Reinforcement learning trains an agent by trial and error, rewards shape the policy over many episodes, ' \
+          'and the value function estimates the expected return of each state, so that the agent can plan ahead.'
+
+
+class TestMinHashLSH(unittest.TestCase):
+
+    def test_near_duplicate(self):
+
+        lsh = MinHashLSH()
+
+        self.assertIsNone(lsh.add('https://medium.com/@a/original', article))
+        self.assertEqual(lsh.add('https://medium.com/@b/copy', article.replace('many', 'a lot of')),
+                         'https://medium.com/@a/original')
+
+    def test_unrelated_texts(self):
+
+        lsh = MinHashLSH()
+
+        other = 'The city council approved the new budget for public transport, with more buses, longer ' \
+                'opening hours for the metro, and a plan to add protected bike lanes across the center.'
+
+        self.assertEqual(lsh.add_batch(['https://medium.com/p/1', 'https://medium.com/p/2'], [article, other]),
+                         [None, None])
+
+    def test_short_texts(self):
+
+        lsh = MinHashLSH()
+
+        texts = ['[Hello world]', '[Cats rule!!]', '[Zebra crossing]']
+        keys = [f'https://medium.com/p/{i}' for i in range(len(texts))]
+
+        self.assertEqual(lsh.add_batch(keys, texts), [None, None, None])
+        self.assertEqual(len(lsh.keys), 0)
+
+    def test_empty_bins(self):
+
+        # few shingles, most bins are empty in both signatures
+        lsh = MinHashLSH(min_shingles=1)
+
+        self.assertEqual(lsh.add_batch(['https://medium.com/p/1', 'https://medium.com/p/2'],
+                                       ['[Hello world]', '[Cats rule!!]']), [None, None])
+        self.assertEqual(lsh.add('https://medium.com/p/3', '[Hello world]'), 'https://medium.com/p/1')
+
+    def test_rescraped_key(self):
+
+        lsh = MinHashLSH()
+
+        for _ in range(3):
+
+            self.assertIsNone(lsh.add('https://medium.com/@a/original', article))
+
+        self.assertEqual(lsh.keys, ['https://medium.com/@a/original'])
+        self.assertTrue(all(len(bucket) == 1 for buckets in lsh.buckets for bucket in buckets.values()))
+
+    def test_save_load(self):
+
+        lsh = MinHashLSH()
+        lsh.add('https://medium.com/@a/original', article)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            filename = os.path.join(directory, 'near_duplicates.npz')
+
+            lsh.save(filename)
+
+            with np.load(filename) as content:
+
+                self.assertEqual(content['keys'].dtype.kind, 'U')
+
+            loaded = MinHashLSH()
+            loaded.load(filename)
+
+        self.assertEqual(loaded.add('https://medium.com/@b/copy', article), 'https://medium.com/@a/original')
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from lxml import html as lxml_html
+
+from parser.html import PostParser, visible_text
+
+page = '<html><head><title>Post</title><script>var limit = "You\'ve";</script></head><body><article>' \
+       '<p>Deep   <em>learning</em>\n is<br>fun&nbsp;!</p><div><div>  nested </div></div>' \
+       '<p style="display: none">hidden</p><pre>a  b\nc</pre></article></body></html>'
+
+
+class TestVisibleText(unittest.TestCase):
+
+    def test_rendering(self):
+
+        tree = lxml_html.fromstring(page)
+
+        self.assertEqual(visible_text(tree.find('.//article')), 'Deep learning is\nfun !\nnested\na  b\nc')
+
+    def test_limited_access(self):
+
+        parser = PostParser(post_image_indicator='Image for post', limited_access_indicator=["You've"])
+
+        limited = page.replace('</article>', '<p>You&#x27;ve read all your free stories</p></article>')
+
+        self.assertTrue(parser.parse('https://medium.com/p/1', limited)['limited_access'])
+        # the <head> is not a part of document.body.textContent
+        self.assertFalse(parser.parse('https://medium.com/p/1', page)['limited_access'])
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+import unittest
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from parser.images import ImageStore
+
+image = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 64
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+
+    # /missing is not found, every other path serves the same image
+    def do_GET(self):
+
+        if self.path == '/missing':
+
+            self.send_error(404)
+
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(image)))
+        self.end_headers()
+
+        self.wfile.write(image)
+
+    def log_message(self, *args):
+
+        pass
+
+
+class TestImageStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.server = HTTPServer(('127.0.0.1', 0), ImageHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+
+        self.root_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.root_dir, ignore_errors=True)
+
+    def test_store(self):
+
+        store = ImageStore(root_dir=self.root_dir, max_workers=4)
+
+        img_src = [[self.base_url + '/a.png', self.base_url + '/b.png'], None, [],
+                   [self.base_url + '/image', self.base_url + '/missing', None]]
+
+        paths = store.store(img_src)
+
+        digest = hashlib.sha256(image).hexdigest()
+        expected = os.path.join(self.root_dir, digest[:2], digest[2:4], digest + '.png')
+
+        self.assertEqual(paths, [[expected, expected], None, [], [expected, None, None]])
+
+        with open(expected, 'rb') as buffer:
+
+            self.assertEqual(buffer.read(), image)
+
+        # same content under several urls is written once
+        self.assertEqual([name for name in os.listdir(self.root_dir) if name != 'index.json'], [digest[:2]])
+
+    def test_index(self):
+
+        ImageStore(root_dir=self.root_dir).store([[self.base_url + '/a.png']])
+
+        store = ImageStore(root_dir=self.root_dir)
+
+        self.assertIn(self.base_url + '/a.png', store.index)
+        self.assertEqual(store.store([[self.base_url + '/a.png']]), [[store.index[self.base_url + '/a.png']]])
+
+
+if __name__ == '__main__':
+
+    unittest.main()
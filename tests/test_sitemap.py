@@ -0,0 +1,102 @@
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from parser.sitemap import SitemapReader, parse_lastmod
+
+fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sitemaps')
+
+index_template = '<?xml version="1.0" encoding="UTF-8"?>\n' \
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{}</sitemapindex>\n'
+
+sitemap_template = '<sitemap><loc>{}</loc><lastmod>{}</lastmod></sitemap>\n'
+
+
+class TestSitemapReader(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.mkdtemp()
+
+        # the december sitemap is served gzip compressed
+        self.december = os.path.join(self.temp_dir, 'posts-2020-12.xml.gz')
+
+        with open(os.path.join(fixtures_dir, 'posts-2020-12.xml'), 'rb') as buffer:
+
+            with gzip.open(self.december, 'wb') as buffer_writer:
+
+                buffer_writer.write(buffer.read())
+
+        self.january = os.path.join(fixtures_dir, 'posts-2021-01.xml')
+
+        self.index = os.path.join(self.temp_dir, 'sitemap.xml')
+
+        with open(self.index, 'w') as buffer_writer:
+
+            buffer_writer.write(index_template.format(sitemap_template.format(self.january, '2021-01-21') +
+                                                      sitemap_template.format(self.december, '2020-12-31')))
+
+    def tearDown(self):
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def urls(self, reader, source=None):
+
+        return [url for url, _ in reader.iter_urls(source or self.index)]
+
+    def test_parse_lastmod(self):
+
+        self.assertEqual(parse_lastmod('2021-01-20T18:30:00.000Z'), datetime(2021, 1, 20, 18, 30))
+        self.assertEqual(parse_lastmod('2021-01-20T20:30:00+02:00'), datetime(2021, 1, 20, 18, 30))
+        self.assertIsNone(parse_lastmod('not a date'))
+
+    def test_nested_and_gzip(self):
+
+        urls = self.urls(SitemapReader())
+
+        self.assertEqual(len(urls), 6)
+        self.assertIn('https://medium.com/@alice/old-post-9f8e7d', urls)
+
+    def test_inclusive_end_date(self):
+
+        reader = SitemapReader(start_date='2021-01-10', end_date='2021-01-20', keep_undated=False)
+
+        self.assertEqual(self.urls(reader, self.january), ['https://medium.com/@alice/first-post-1a2b3c',
+                                                           'https://medium.com/@bob/second-post-4d5e6f',
+                                                           'https://medium.com/towards-data-science/'
+                                                           'fourth-post-0d1e2f'])
+
+    def test_end_datetime(self):
+
+        reader = SitemapReader(end_date='2021-01-20T12:00:00', keep_undated=False)
+
+        self.assertNotIn('https://medium.com/@bob/second-post-4d5e6f', self.urls(reader, self.january))
+
+    def test_pruned_by_start_date(self):
+
+        reader = SitemapReader(start_date='2021-01-01')
+
+        self.assertNotIn('https://medium.com/@alice/old-post-9f8e7d', self.urls(reader))
+
+    def test_include_exclude(self):
+
+        reader = SitemapReader(include=['^/@'], exclude=['undated'])
+
+        self.assertEqual(self.urls(reader, self.january), ['https://medium.com/@alice/first-post-1a2b3c',
+                                                           'https://medium.com/@bob/second-post-4d5e6f',
+                                                           'https://medium.com/@carol/third-post-7a8b9c'])
+
+    def test_metadata(self):
+
+        columns = SitemapReader(keep_undated=False).metadata(self.january, limit=2)
+
+        self.assertEqual(columns['author'], ['alice', 'bob'])
+        self.assertEqual(columns['date'], ['2021-01-10', '2021-01-20'])
+
+
+if __name__ == '__main__':
+
+    unittest.main()